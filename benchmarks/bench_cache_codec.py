@@ -0,0 +1,86 @@
+"""Compare disk cache storage formats: pickle (default) vs codec-encoded JSON.
+
+Reports bytes on disk, write time and L2 hit latency for PyPI-shaped
+documents. Runs against temporary directories; the user cache is untouched.
+
+Usage:
+    python benchmarks/bench_cache_codec.py [--packages 50] [--releases 500] [--reads 5]
+"""
+
+import argparse
+import json
+import statistics
+import tempfile
+import time
+
+import diskcache
+from pypipackagestats.core.codecs import CodecDisk, RawJSON, get_codec
+
+
+def make_document(index: int, release_count: int) -> dict:
+    """PyPI-shaped metadata document with `release_count` releases."""
+    files = [
+        {
+            "filename": f"pkg{index}-{i}.whl",
+            "digests": {"md5": f"{index:032d}", "sha256": f"{index:064d}"},
+            "upload_time": "2024-01-01T00:00:00",
+            "url": f"https://files.pythonhosted.org/packages/{index}/pkg-{i}.whl",
+            "size": 123456 + i,
+        }
+        for i in range(3)
+    ]
+    return {
+        "info": {"name": f"pkg{index}", "version": f"0.{release_count - 1}", "summary": "benchmark"},
+        "releases": {f"0.{i}": files for i in range(release_count)},
+    }
+
+
+def run(label: str, cache: diskcache.Cache, bodies: list, reads: int) -> None:
+    start = time.perf_counter()
+    for i, body in enumerate(bodies):
+        value = RawJSON(body) if isinstance(cache.disk, CodecDisk) else json.loads(body)
+        cache.set(f"url:{i}", value)
+    write_ms = (time.perf_counter() - start) * 1000 / len(bodies)
+
+    latencies = []
+    for _ in range(reads):
+        for i in range(len(bodies)):
+            start = time.perf_counter()
+            cache.get(f"url:{i}")
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    print(
+        f"{label:<10} {cache.volume() / 1024 / 1024:>10.2f} MB "
+        f"{write_ms:>10.2f} ms {statistics.median(latencies):>10.2f} ms {max(latencies):>10.2f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--packages", type=int, default=50)
+    parser.add_argument("--releases", type=int, default=500)
+    parser.add_argument("--reads", type=int, default=5)
+    args = parser.parse_args()
+
+    bodies = [json.dumps(make_document(i, args.releases)).encode() for i in range(args.packages)]
+    print(f"{args.packages} documents, {sum(map(len, bodies)) / len(bodies) / 1024:.0f} KB JSON each")
+    print(f"{'format':<10} {'on disk':>13} {'write/doc':>13} {'hit p50':>13} {'hit max':>13}")
+
+    formats = [("pickle", None), ("identity", "identity"), ("zlib", "zlib")]
+    try:
+        formats.append(("lz4", get_codec("lz4").name))
+    except ValueError:
+        pass  # lz4 not installed
+
+    for label, codec in formats:
+        with tempfile.TemporaryDirectory() as directory:
+            if codec is None:
+                cache = diskcache.Cache(directory)
+            else:
+                cache = diskcache.Cache(directory, disk=CodecDisk, disk_codec=codec)
+            with cache:
+                run(label, cache, bodies, args.reads)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,33 @@
 """PyPI Package Stats - Production-ready library for PyPI package statistics."""
 
-from pypipackagestats.api import get_package_stats
-from pypipackagestats.core.models import PackageStats
+from pypipackagestats.api import (
+    get_package_stats,
+    get_many_package_stats,
+    iter_package_stats,
+    async_get_package_stats,
+    async_get_many,
+)
+from pypipackagestats.core.models import PackageStats, LazyPackageStats, WindowStats, BatchResult
 from pypipackagestats.core.exceptions import PyPIStatsError, PackageNotFoundError, APIError
 from pypipackagestats.core.cache import clear_cache, get_cache_info
+from pypipackagestats.core.ttl import TTLPolicy, FixedTTL, DailyRolloverTTL
 
 # Export main functionality
 __all__ = [
     "get_package_stats",
+    "get_many_package_stats",
+    "iter_package_stats",
+    "async_get_package_stats",
+    "async_get_many",
     "clear_cache", 
     "get_cache_info",
     "PackageStats",
+    "LazyPackageStats",
+    "WindowStats",
+    "BatchResult",
+    "TTLPolicy",
+    "FixedTTL",
+    "DailyRolloverTTL",
     "PyPIStatsError",
     "PackageNotFoundError", 
     "APIError",
@@ -1,103 +1,762 @@
 """Public API for PyPI Package Stats."""
 
+import asyncio
 import threading
-from typing import Optional
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, Literal, Mapping, Optional, Set, Tuple, Union, overload
 from requests.exceptions import HTTPError, RequestException
-from pypipackagestats.core.client import PyPIClient
-from pypipackagestats.core.models import PackageStats
-from pypipackagestats.core.processing import process_package_info, process_download_stats, process_category_breakdown
+from pypipackagestats.core.client import FetchCancelled, PyPIClient
+from pypipackagestats.core.models import PackageStats, LazyPackageStats, BatchResult
+from pypipackagestats.core.processing import canonicalize_name, process_package_info, process_download_stats, process_category_breakdown, process_window_stats
+from pypipackagestats.core.timeseries import AnalysisWindow, CategorySeries, WindowSpec, resolve_window
+from pypipackagestats.core.ttl import TTLPolicy, DEFAULT_TTL_POLICIES
 from pypipackagestats.core.exceptions import PackageNotFoundError, APIError, PyPIStatsError
-from pypipackagestats.core.constants import TOP_PYTHON_VERSIONS_COUNT, TOP_OS_COUNT
+from pypipackagestats.core.constants import STATS_SECTIONS, TOP_PYTHON_VERSIONS_COUNT, TOP_OS_COUNT, DEFAULT_MAX_WORKERS, DEFAULT_MAX_CONCURRENCY, ENDPOINT_FETCH_MAX_WORKERS
+
+if TYPE_CHECKING:
+    from pypipackagestats.core.async_client import AsyncPyPIClient
 
 # Thread-local storage for client reuse
 _thread_local = threading.local()
 
+# Shared pool for the pypi.org fetch of parallel endpoint fetches (long-lived so thread-local sessions are reused)
+_endpoint_executor: Optional[ThreadPoolExecutor] = None
+_endpoint_executor_lock = threading.Lock()
+
+# Raw endpoint responses each PackageStats section is built from
+_SECTION_ENDPOINTS = {
+    "package_info": ("package_data",),
+    "downloads": ("recent_stats", "overall_stats"),
+    "python_versions": ("python_stats",),
+    "operating_systems": ("system_stats",),
+}
+
+# Marks the end of the names consumed by iter_package_stats
+_END: Any = object()
+
+# Daily series analysis windows are computed from
+_WINDOW_ENDPOINTS = ("overall_stats", "python_stats", "system_stats")
+
+
+def _normalize_package_name(package_name: str) -> str:
+    """Validate and normalize a package name (PEP 503)."""
+    if not package_name or not package_name.strip():
+        raise ValueError("Package name cannot be empty")
+    return canonicalize_name(package_name.strip())
+
+
+def _resolve_sections(sections: Optional[Iterable[str]]) -> Tuple[str, ...]:
+    """Validate requested sections (None → all) and return them in canonical order."""
+    if sections is None:
+        return STATS_SECTIONS
+    requested = {sections} if isinstance(sections, str) else set(sections)
+    unknown = requested - set(STATS_SECTIONS)
+    if unknown:
+        raise ValueError(f"Unknown sections: {', '.join(sorted(unknown))}. Available: {', '.join(STATS_SECTIONS)}")
+    if not requested:
+        raise ValueError("At least one section must be requested")
+    return tuple(section for section in STATS_SECTIONS if section in requested)
+
+
+def _resolve_windows(windows: Optional[Iterable[WindowSpec]]) -> Tuple[AnalysisWindow, ...]:
+    """Resolve window specs against today's date (duplicates collapse to one window)."""
+    if windows is None:
+        return ()
+    if isinstance(windows, (int, tuple)):
+        raise ValueError("windows must be a list of window specs, e.g. [7, 30] or [(start, end)]")
+    resolved = {window.label: window for window in map(resolve_window, windows)}
+    return tuple(resolved.values())
+
+
+def _endpoint_fetchers(
+    client: Any, sections: Iterable[str] = STATS_SECTIONS, windows: bool = False
+) -> Dict[str, Callable[[str], Any]]:
+    """Client methods fetching the raw responses the sections (and windows) need (sync or async client)."""
+    # pypi.org first: it is not throttled, so it overlaps with the pypistats.org calls
+    fetchers = {
+        "package_data": client.get_package_info,
+        "recent_stats": client.get_recent_stats,
+        "overall_stats": client.get_overall_stats,
+        "python_stats": client.get_python_stats,
+        "system_stats": client.get_system_stats,
+    }
+    needed = {key for section in sections for key in _SECTION_ENDPOINTS[section]}
+    if windows:
+        needed.update(_WINDOW_ENDPOINTS)
+    return {key: fetch for key, fetch in fetchers.items() if key in needed}
+
+
+def _effective_cache_ttl(no_cache: bool, cache_ttl: Optional[int]) -> Optional[int]:
+    """Convert no_cache to cache_ttl=0 for backward compatibility."""
+    return 0 if no_cache else cache_ttl
+
+
+def _effective_ttl_policies(
+    cache_ttl: Optional[int], ttl_policies: Optional[Mapping[str, Union[int, TTLPolicy]]]
+) -> Optional[Mapping[str, Union[int, TTLPolicy]]]:
+    """Use the per-endpoint default policies unless a TTL was given explicitly."""
+    if ttl_policies is None and cache_ttl is None:
+        return DEFAULT_TTL_POLICIES
+    return ttl_policies
+
+
+def _get_client(
+    cache_ttl: Optional[int],
+    ttl_policies: Optional[Mapping[str, Union[int, TTLPolicy]]] = None,
+    stale_while_revalidate: float = 0,
+    stale_if_error: float = 0,
+) -> PyPIClient:
+    """Get the calling thread's client, recreated only if cache settings change."""
+    cache_key = (
+        cache_ttl,
+        dict(ttl_policies) if ttl_policies is not None else None,
+        stale_while_revalidate,
+        stale_if_error,
+    )
+
+    if (not hasattr(_thread_local, 'client') or
+        not hasattr(_thread_local, 'cache_key') or
+        _thread_local.cache_key != cache_key):
+
+        _thread_local.client = PyPIClient(
+            cache_ttl=cache_ttl,
+            project_package_info=True,
+            ttl_policies=ttl_policies,
+            stale_while_revalidate=stale_while_revalidate,
+            stale_if_error=stale_if_error,
+        )
+        _thread_local.cache_key = cache_key
+
+    return _thread_local.client
+
+
+def _get_endpoint_executor() -> ThreadPoolExecutor:
+    """Get the shared endpoint executor - thread-safe singleton with lazy initialization."""
+    global _endpoint_executor
+    if _endpoint_executor is None:
+        with _endpoint_executor_lock:
+            if _endpoint_executor is None:
+                _endpoint_executor = ThreadPoolExecutor(
+                    max_workers=ENDPOINT_FETCH_MAX_WORKERS,
+                    thread_name_prefix="pypipackagestats-fetch",
+                )
+    return _endpoint_executor
+
+
+def _fetch_endpoints(
+    client: PyPIClient,
+    package_name: str,
+    parallel: bool,
+    sections: Iterable[str] = STATS_SECTIONS,
+    windows: bool = False,
+) -> Dict[str, Any]:
+    """Fetch the raw responses of the endpoints the sections (and windows) need for a package."""
+    fetchers = _endpoint_fetchers(client, sections, windows)
+
+    if not parallel or "package_data" not in fetchers:
+        return {key: fetch(package_name) for key, fetch in fetchers.items()}
+
+    # Only the unthrottled pypi.org fetch goes to the shared pool; pypistats.org
+    # fetches would hold its workers while waiting for rate-limit slots, so
+    # they run in the calling thread while the pypi.org request is in flight,
+    # and are not sent once it has failed
+    cancel = threading.Event()
+
+    def cancel_on_error(future: "Future[Any]") -> None:
+        if not future.cancelled() and future.exception() is not None:
+            cancel.set()
+
+    package_data = _get_endpoint_executor().submit(fetchers.pop("package_data"), package_name)
+    package_data.add_done_callback(cancel_on_error)
+    try:
+        with client.cancel_on(cancel):
+            data = {key: fetch(package_name) for key, fetch in fetchers.items()}
+    except Exception:
+        # Raise what the sequential order would: a pypi.org error comes first
+        if not package_data.cancel() and package_data.exception() is not None:
+            package_data.result()
+        raise
+    except BaseException:
+        package_data.cancel()
+        raise
+    return {"package_data": package_data.result(), **data}
+
+
+def _build_package_stats(
+    data: Dict[str, Any], sections: Iterable[str] = STATS_SECTIONS, windows: Tuple[AnalysisWindow, ...] = ()
+) -> PackageStats:
+    """Process the raw endpoint responses into the requested sections and windows.
+
+    Each daily series is pivoted into a CategorySeries once and shared by
+    the sections and every window computed from it.
+    """
+    series = {key: CategorySeries.from_rows(data[key]) for key in _WINDOW_ENDPOINTS if key in data}
+    return PackageStats(
+        package_info=process_package_info(data["package_data"]) if "package_info" in sections else None,
+        downloads=(
+            process_download_stats(data["recent_stats"], series["overall_stats"])
+            if "downloads" in sections else None
+        ),
+        python_versions=(
+            process_category_breakdown(series["python_stats"], TOP_PYTHON_VERSIONS_COUNT)
+            if "python_versions" in sections else None
+        ),
+        operating_systems=(
+            process_category_breakdown(series["system_stats"], TOP_OS_COUNT)
+            if "operating_systems" in sections else None
+        ),
+        windows=(
+            process_window_stats(windows, series["overall_stats"], series["python_stats"], series["system_stats"])
+            if windows else None
+        ),
+    )
+
+
+def _http_status_error(package_name: str, status_code: Optional[int], headers: Any, error: Exception) -> PyPIStatsError:
+    """Map an HTTP error status to the public exception hierarchy."""
+    if status_code == 404:
+        return PackageNotFoundError(package_name)
+    elif status_code == 429:
+        retry_after = headers.get('Retry-After', '60')
+        return APIError(f"Rate limit exceeded. Retry after {retry_after} seconds", 429)
+    else:
+        return APIError(f"HTTP {status_code}: {str(error)}", status_code)
+
+
+def _fetch_package_stats(
+    client: PyPIClient,
+    package_name: str,
+    parallel: bool = False,
+    sections: Iterable[str] = STATS_SECTIONS,
+    windows: Tuple[AnalysisWindow, ...] = (),
+) -> PackageStats:
+    """Fetch and process stats for an already-normalized package name."""
+    try:
+        # Fetch the data the sections and windows need
+        data = _fetch_endpoints(client, package_name, parallel, sections, bool(windows))
+
+        # Process data
+        return _build_package_stats(data, sections, windows)
+
+    except HTTPError as e:
+        status_code = e.response.status_code if e.response is not None else None
+        headers = e.response.headers if e.response is not None else {}
+        raise _http_status_error(package_name, status_code, headers, e) from e
+
+    except RequestException as e:
+        raise APIError(f"Network error for {package_name}: {str(e)}") from e
+
+    except Exception as e:
+        raise PyPIStatsError(f"Unexpected error: {str(e)}") from e
+
+
+@overload
+def get_package_stats(
+    package_name: str,
+    *,
+    no_cache: bool = ...,
+    cache_ttl: Optional[int] = ...,
+    ttl_policies: Optional[Mapping[str, Union[int, TTLPolicy]]] = ...,
+    stale_while_revalidate: float = ...,
+    stale_if_error: float = ...,
+    parallel: bool = ...,
+    sections: Optional[Iterable[str]] = ...,
+    windows: Optional[Iterable[WindowSpec]] = ...,
+    lazy: Literal[False] = ...,
+) -> PackageStats: ...
+
+
+@overload
+def get_package_stats(
+    package_name: str,
+    *,
+    no_cache: bool = ...,
+    cache_ttl: Optional[int] = ...,
+    ttl_policies: Optional[Mapping[str, Union[int, TTLPolicy]]] = ...,
+    stale_while_revalidate: float = ...,
+    stale_if_error: float = ...,
+    parallel: bool = ...,
+    sections: Optional[Iterable[str]] = ...,
+    windows: Optional[Iterable[WindowSpec]] = ...,
+    lazy: Literal[True],
+) -> LazyPackageStats: ...
+
+
+@overload
+def get_package_stats(
+    package_name: str,
+    *,
+    no_cache: bool = ...,
+    cache_ttl: Optional[int] = ...,
+    ttl_policies: Optional[Mapping[str, Union[int, TTLPolicy]]] = ...,
+    stale_while_revalidate: float = ...,
+    stale_if_error: float = ...,
+    parallel: bool = ...,
+    sections: Optional[Iterable[str]] = ...,
+    windows: Optional[Iterable[WindowSpec]] = ...,
+    lazy: bool = ...,
+) -> Union[PackageStats, LazyPackageStats]: ...
+
+
 def get_package_stats(
     package_name: str,
     *,
     no_cache: bool = False,
     cache_ttl: Optional[int] = None,
-) -> PackageStats:
+    ttl_policies: Optional[Mapping[str, Union[int, TTLPolicy]]] = None,
+    stale_while_revalidate: float = 0,
+    stale_if_error: float = 0,
+    parallel: bool = True,
+    sections: Optional[Iterable[str]] = None,
+    windows: Optional[Iterable[WindowSpec]] = None,
+    lazy: bool = False,
+) -> Union[PackageStats, LazyPackageStats]:
     """
     Get PyPI package statistics (thread-safe).
-    
+
     Args:
         package_name: Package name
-        no_cache: Whether to disable caching (default: False). 
+        no_cache: Whether to disable caching (default: False).
                   If True, sets cache_ttl=0 to disable caching.
         cache_ttl: Time-to-live for cache entries in seconds.
                   - Positive integer → cache with that TTL (seconds)
                   - 0 → disable caching completely
-                  - None or omitted → use default (3600 seconds)
-        
+                  - None or omitted → per-endpoint defaults (DEFAULT_TTL_POLICIES):
+                    PyPI metadata for 1 hour, pypistats data until its next
+                    daily rollover, with jitter
+        ttl_policies: Per-endpoint TTLs ("package_info", "recent", "overall",
+                  "python_minor", "system" → seconds or a TTLPolicy such as
+                  DailyRolloverTTL). Endpoints not listed use cache_ttl.
+        stale_while_revalidate: Seconds past expiry during which cached data
+                  is returned immediately and refreshed in the background
+                  (default: 0, disabled)
+        stale_if_error: Seconds past expiry during which cached data is
+                  returned if the refresh fails because the API is down
+                  (network error, 5xx or 429; default: 0, disabled)
+        parallel: Whether to fetch the pypi.org metadata concurrently with
+                  the pypistats.org endpoints (default: True). The pypi.org
+                  request overlaps with the throttled pypistats.org requests.
+        sections: PackageStats sections to load ("package_info", "downloads",
+                  "python_versions", "operating_systems"; default: all).
+                  Only the endpoints those sections need are requested;
+                  the other sections are None.
+        windows: Analysis windows to compute download totals and Python/OS
+                  breakdowns for, in ``PackageStats.windows``: a number of
+                  days (e.g. ``[7, 30, 90]``, the N days before today) or a
+                  ``(start, end)`` pair of dates / ISO strings, inclusive.
+                  Every window is computed from the same daily series
+                  (``overall``, ``python_minor``, ``system``), so extra
+                  windows cost no extra requests.
+        lazy: Return a LazyPackageStats that fetches each section on first
+                  access instead (default: False). Sections listed in
+                  ``sections`` are still fetched up front.
+
     Returns:
-        PackageStats: Package statistics
-        
+        PackageStats: Package statistics (LazyPackageStats if lazy=True)
+
     Raises:
         PackageNotFoundError: If package not found
         APIError: If API/network error
-        ValueError: If invalid package name
-        
+        ValueError: If invalid package name, unknown section or invalid
+                  window (or windows combined with lazy=True)
+
     Example:
         >>> stats = get_package_stats("requests")
         >>> print(f"Downloads: {stats.downloads.last_month:,}")
-        
+        >>> stats = get_package_stats("requests", windows=[7, 90])
+        >>> print(f"Last 90 days: {stats.windows['90d'].downloads:,}")
+
     Thread Safety:
         This function is fully thread-safe and can be used safely
         in concurrent environments like ThreadPoolExecutor.
     """
-    if not package_name or not package_name.strip():
-        raise ValueError("Package name cannot be empty")
-    
-    package_name = package_name.strip().lower()
-    
-    # Convert no_cache to cache_ttl=0 for backward compatibility
-    if no_cache:
-        effective_cache_ttl = 0
-    else:
-        effective_cache_ttl = cache_ttl
-    
+    package_name = _normalize_package_name(package_name)
+    requested = _resolve_sections(sections)
+    analysis_windows = _resolve_windows(windows)
+    if lazy and analysis_windows:
+        raise ValueError("windows cannot be combined with lazy=True")
+
     # Thread-safe client reuse - each thread gets its own client
-    # Client is reused only if cache settings match
-    cache_key = f"{effective_cache_ttl}"
-    
-    if (not hasattr(_thread_local, 'client') or 
-        not hasattr(_thread_local, 'cache_key') or
-        _thread_local.cache_key != cache_key):
-        
-        _thread_local.client = PyPIClient(cache_ttl=effective_cache_ttl)
-        _thread_local.cache_key = cache_key
-    
-    client = _thread_local.client
-    
+    client = _get_client(
+        _effective_cache_ttl(no_cache, cache_ttl),
+        _effective_ttl_policies(cache_ttl, ttl_policies),
+        stale_while_revalidate,
+        stale_if_error,
+    )
+
+    if lazy:
+        # The client is thread-safe, so sections may be loaded from any thread
+        def load_sections(lazy_sections: Tuple[str, ...]) -> PackageStats:
+            return _fetch_package_stats(client, package_name, parallel, lazy_sections)
+
+        loaded = load_sections(requested) if sections is not None else None
+        return LazyPackageStats(package_name, load_sections, loaded)
+
+    return _fetch_package_stats(client, package_name, parallel, requested, analysis_windows)
+
+
+def get_many_package_stats(
+    package_names: Iterable[str],
+    *,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    no_cache: bool = False,
+    cache_ttl: Optional[int] = None,
+    ttl_policies: Optional[Mapping[str, Union[int, TTLPolicy]]] = None,
+    stale_while_revalidate: float = 0,
+    stale_if_error: float = 0,
+    sections: Optional[Iterable[str]] = None,
+    windows: Optional[Iterable[WindowSpec]] = None,
+) -> BatchResult:
+    """
+    Get statistics for many PyPI packages concurrently.
+
+    Packages are fetched on a bounded thread pool that shares a single
+    PyPIClient, so the pypistats.org throttle and per-thread sessions are
+    reused across the whole batch. Duplicate names are fetched once.
+    Endpoints of each package are fetched sequentially, since the pool
+    already overlaps requests across packages.
+
+    Args:
+        package_names: Package names to fetch
+        max_workers: Maximum number of packages fetched at the same time
+                     (default: 8)
+        no_cache: Whether to disable caching (default: False)
+        cache_ttl: Time-to-live for cache entries in seconds
+                   (same semantics as get_package_stats)
+        ttl_policies: Per-endpoint TTLs (same semantics as get_package_stats)
+        stale_while_revalidate: Same semantics as get_package_stats
+        stale_if_error: Same semantics as get_package_stats
+        sections: Sections to load (same semantics as get_package_stats)
+        windows: Analysis windows (same semantics as get_package_stats)
+
+    Returns:
+        BatchResult: ``results`` maps normalized package names to
+        PackageStats, ``errors`` maps names that failed to the exception
+        that would have been raised by get_package_stats.
+
+    Raises:
+        ValueError: If max_workers is less than 1, a section is unknown or
+                    a window is invalid
+
+    Example:
+        >>> batch = get_many_package_stats(["requests", "django"])
+        >>> for name, stats in batch.results.items():
+        ...     print(name, stats.downloads.last_month)
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    sections = _resolve_sections(sections)
+    analysis_windows = _resolve_windows(windows)
+
+    client = PyPIClient(
+        cache_ttl=_effective_cache_ttl(no_cache, cache_ttl),
+        project_package_info=True,
+        ttl_policies=_effective_ttl_policies(cache_ttl, ttl_policies),
+        stale_while_revalidate=stale_while_revalidate,
+        stale_if_error=stale_if_error,
+    )
+
+    errors: Dict[str, Exception] = {}
+    names: Dict[str, None] = {}  # ordered set
+    for raw_name in package_names:
+        try:
+            name = _normalize_package_name(raw_name)
+        except ValueError as e:
+            errors[raw_name] = e
+            continue
+        names[name] = None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            name: executor.submit(_fetch_package_stats, client, name, False, sections, analysis_windows)
+            for name in names
+        }
+
+    results: Dict[str, PackageStats] = {}
+    for name, future in futures.items():
+        try:
+            results[name] = future.result()
+        except PyPIStatsError as e:
+            errors[name] = e
+
+    return BatchResult(results=results, errors=errors)
+
+
+def iter_package_stats(
+    package_names: Iterable[str],
+    *,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    no_cache: bool = False,
+    cache_ttl: Optional[int] = None,
+    ttl_policies: Optional[Mapping[str, Union[int, TTLPolicy]]] = None,
+    stale_while_revalidate: float = 0,
+    stale_if_error: float = 0,
+    sections: Optional[Iterable[str]] = None,
+    windows: Optional[Iterable[WindowSpec]] = None,
+) -> Iterator[Tuple[str, Union[PackageStats, Exception]]]:
+    """
+    Stream statistics for many PyPI packages as each one completes.
+
+    Names are read from ``package_names`` lazily (it may be a generator,
+    a file or unbounded) and at most ``max_workers`` packages are in flight:
+    the next name is only read once a result has been yielded, so memory
+    stays flat however long the input is and a slow consumer pauses the
+    fetching. Packages share one PyPIClient like get_many_package_stats,
+    but names are not deduplicated.
+
+    Args:
+        package_names: Package names to fetch
+        max_workers: Maximum number of packages in flight (default: 8)
+        no_cache: Whether to disable caching (default: False)
+        cache_ttl: Time-to-live for cache entries in seconds
+                   (same semantics as get_package_stats)
+        ttl_policies: Per-endpoint TTLs (same semantics as get_package_stats)
+        stale_while_revalidate: Same semantics as get_package_stats
+        stale_if_error: Same semantics as get_package_stats
+        sections: Sections to load (same semantics as get_package_stats)
+        windows: Analysis windows (same semantics as get_package_stats)
+
+    Yields:
+        ``(name, result)`` in completion order: the normalized name and its
+        PackageStats, or the exception get_package_stats would have raised
+        (the name as given for invalid names, with a ValueError).
+
+    Raises:
+        ValueError: If max_workers is less than 1, a section is unknown or
+                    a window is invalid
+
+    Example:
+        >>> with open("watchlist.txt") as f:
+        ...     for name, result in iter_package_stats(line.strip() for line in f):
+        ...         print(name, result.downloads.last_month if isinstance(result, PackageStats) else result)
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    sections = _resolve_sections(sections)
+    analysis_windows = _resolve_windows(windows)
+    return _iter_package_stats(
+        package_names,
+        max_workers,
+        PyPIClient(
+            cache_ttl=_effective_cache_ttl(no_cache, cache_ttl),
+            project_package_info=True,
+            ttl_policies=_effective_ttl_policies(cache_ttl, ttl_policies),
+            stale_while_revalidate=stale_while_revalidate,
+            stale_if_error=stale_if_error,
+        ),
+        sections,
+        analysis_windows,
+    )
+
+
+def _iter_package_stats(
+    package_names: Iterable[str],
+    max_workers: int,
+    client: PyPIClient,
+    sections: Tuple[str, ...],
+    windows: Tuple[AnalysisWindow, ...],
+) -> Iterator[Tuple[str, Union[PackageStats, Exception]]]:
+    """Generator behind iter_package_stats (arguments are validated before the first next())."""
+    names = iter(package_names)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    in_flight: Dict["Future[PackageStats]", str] = {}
     try:
-        # Fetch all data
-        package_data = client.get_package_info(package_name)
-        recent_stats = client.get_recent_stats(package_name)
-        overall_stats = client.get_overall_stats(package_name)
-        python_stats = client.get_python_stats(package_name)
-        system_stats = client.get_system_stats(package_name)
-        
-        # Process data
-        return PackageStats(
-            package_info=process_package_info(package_data),
-            downloads=process_download_stats(recent_stats, overall_stats),
-            python_versions=process_category_breakdown(python_stats, TOP_PYTHON_VERSIONS_COUNT),
-            operating_systems=process_category_breakdown(system_stats, TOP_OS_COUNT),
-        )
-        
-    except HTTPError as e:
-        if e.response and e.response.status_code == 404:
-            raise PackageNotFoundError(package_name) from e
-        elif e.response and e.response.status_code == 429:
-            retry_after = e.response.headers.get('Retry-After', '60')
-            raise APIError(f"Rate limit exceeded. Retry after {retry_after} seconds", 429) from e
-        else:
-            status_code = e.response.status_code if e.response else None
-            raise APIError(f"HTTP {status_code}: {str(e)}", status_code) from e
-    
-    except RequestException as e:
+        exhausted = False
+        while True:
+            # Top up to max_workers packages; invalid names are yielded without a slot
+            while not exhausted and len(in_flight) < max_workers:
+                raw_name = next(names, _END)
+                if raw_name is _END:
+                    exhausted = True
+                    break
+                try:
+                    name = _normalize_package_name(raw_name)
+                except ValueError as e:
+                    yield raw_name, e
+                    continue
+                in_flight[executor.submit(_fetch_package_stats, client, name, False, sections, windows)] = name
+            if not in_flight:
+                return
+
+            done: Set["Future[PackageStats]"] = wait(in_flight, return_when=FIRST_COMPLETED)[0]
+            for future in done:
+                name = in_flight.pop(future)
+                try:
+                    result: Union[PackageStats, Exception] = future.result()
+                except PyPIStatsError as e:
+                    result = e
+                yield name, result
+    finally:
+        # Closed early (break/exception in the consumer): drop queued work, don't wait for running fetches
+        for future in in_flight:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+async def _async_fetch_package_stats(
+    client: "AsyncPyPIClient",
+    package_name: str,
+    sections: Iterable[str] = STATS_SECTIONS,
+    windows: Tuple[AnalysisWindow, ...] = (),
+) -> PackageStats:
+    """Fetch (concurrently) and process stats for an already-normalized package name."""
+    import httpx
+
+    tasks = {
+        key: asyncio.ensure_future(fetch(package_name))
+        for key, fetch in _endpoint_fetchers(client, sections, bool(windows)).items()
+    }
+    try:
+        data = {key: await task for key, task in tasks.items()}
+        return _build_package_stats(data, sections, windows)
+
+    except httpx.HTTPStatusError as e:
+        raise _http_status_error(package_name, e.response.status_code, e.response.headers, e) from e
+
+    except httpx.RequestError as e:
         raise APIError(f"Network error for {package_name}: {str(e)}") from e
-    
+
     except Exception as e:
         raise PyPIStatsError(f"Unexpected error: {str(e)}") from e
+
+    finally:
+        for task in tasks.values():
+            task.cancel()
+
+
+async def async_get_package_stats(
+    package_name: str,
+    *,
+    no_cache: bool = False,
+    cache_ttl: Optional[int] = None,
+    ttl_policies: Optional[Mapping[str, Union[int, TTLPolicy]]] = None,
+    stale_while_revalidate: float = 0,
+    stale_if_error: float = 0,
+    sections: Optional[Iterable[str]] = None,
+    windows: Optional[Iterable[WindowSpec]] = None,
+    client: Optional["AsyncPyPIClient"] = None,
+) -> PackageStats:
+    """
+    Get PyPI package statistics without blocking the event loop.
+
+    Requires the ``async`` extra (``pip install pypi-package-stats[async]``).
+
+    Args:
+        package_name: Package name
+        no_cache: Whether to disable caching (default: False)
+        cache_ttl: Time-to-live for cache entries in seconds
+                   (same semantics as get_package_stats)
+        ttl_policies: Per-endpoint TTLs (same semantics as get_package_stats)
+        stale_while_revalidate: Same semantics as get_package_stats; with
+                a per-call client, closing it waits for the refresh
+        stale_if_error: Same semantics as get_package_stats
+        sections: Sections to load (same semantics as get_package_stats)
+        windows: Analysis windows (same semantics as get_package_stats)
+        client: Optional AsyncPyPIClient to reuse across calls. When omitted,
+                a client is created for this call and closed afterwards;
+                the cache options are ignored when a client is given.
+
+    Returns:
+        PackageStats: Package statistics
+
+    Raises:
+        PackageNotFoundError: If package not found
+        APIError: If API/network error
+        ValueError: If invalid package name, unknown section or invalid window
+
+    Example:
+        >>> stats = await async_get_package_stats("requests")
+    """
+    from pypipackagestats.core.async_client import AsyncPyPIClient
+
+    package_name = _normalize_package_name(package_name)
+    sections = _resolve_sections(sections)
+    analysis_windows = _resolve_windows(windows)
+
+    if client is not None:
+        return await _async_fetch_package_stats(client, package_name, sections, analysis_windows)
+
+    async with AsyncPyPIClient(
+        cache_ttl=_effective_cache_ttl(no_cache, cache_ttl),
+        project_package_info=True,
+        ttl_policies=_effective_ttl_policies(cache_ttl, ttl_policies),
+        stale_while_revalidate=stale_while_revalidate,
+        stale_if_error=stale_if_error,
+    ) as own_client:
+        return await _async_fetch_package_stats(own_client, package_name, sections, analysis_windows)
+
+
+async def async_get_many(
+    package_names: Iterable[str],
+    *,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    no_cache: bool = False,
+    cache_ttl: Optional[int] = None,
+    ttl_policies: Optional[Mapping[str, Union[int, TTLPolicy]]] = None,
+    stale_while_revalidate: float = 0,
+    stale_if_error: float = 0,
+    sections: Optional[Iterable[str]] = None,
+    windows: Optional[Iterable[WindowSpec]] = None,
+) -> BatchResult:
+    """
+    Get statistics for many PyPI packages on a single event loop.
+
+    All packages share one AsyncPyPIClient, which bounds the number of
+    HTTP requests in flight and shares the disk cache and pypistats.org
+    throttle with the synchronous client.
+
+    Args:
+        package_names: Package names to fetch
+        max_concurrency: Maximum number of HTTP requests in flight (default: 20)
+        no_cache: Whether to disable caching (default: False)
+        cache_ttl: Time-to-live for cache entries in seconds
+                   (same semantics as get_package_stats)
+        ttl_policies: Per-endpoint TTLs (same semantics as get_package_stats)
+        stale_while_revalidate: Same semantics as get_package_stats
+        stale_if_error: Same semantics as get_package_stats
+        sections: Sections to load (same semantics as get_package_stats)
+        windows: Analysis windows (same semantics as get_package_stats)
+
+    Returns:
+        BatchResult: Same shape as get_many_package_stats
+
+    Example:
+        >>> batch = await async_get_many(["requests", "django"])
+    """
+    from pypipackagestats.core.async_client import AsyncPyPIClient
+
+    sections = _resolve_sections(sections)
+    analysis_windows = _resolve_windows(windows)
+    errors: Dict[str, Exception] = {}
+    names: Dict[str, None] = {}  # ordered set
+    for raw_name in package_names:
+        try:
+            name = _normalize_package_name(raw_name)
+        except ValueError as e:
+            errors[raw_name] = e
+            continue
+        names[name] = None
+
+    async with AsyncPyPIClient(
+        cache_ttl=_effective_cache_ttl(no_cache, cache_ttl),
+        max_concurrency=max_concurrency,
+        project_package_info=True,
+        ttl_policies=_effective_ttl_policies(cache_ttl, ttl_policies),
+        stale_while_revalidate=stale_while_revalidate,
+        stale_if_error=stale_if_error,
+    ) as client:
+        outcomes = await asyncio.gather(
+            *(_async_fetch_package_stats(client, name, sections, analysis_windows) for name in names),
+            return_exceptions=True,
+        )
+
+    results: Dict[str, PackageStats] = {}
+    for name, outcome in zip(names, outcomes):
+        if isinstance(outcome, PyPIStatsError):
+            errors[name] = outcome
+        elif isinstance(outcome, BaseException):
+            raise outcome
+        else:
+            results[name] = outcome
+
+    return BatchResult(results=results, errors=errors)
@@ -1,20 +1,35 @@
 import json
+import sys
+import time
+from typing import Iterator, Optional, TextIO
 import typer
 from rich.console import Console
-from pypipackagestats import get_package_stats, clear_cache, get_cache_info
+from pypipackagestats import get_package_stats, iter_package_stats, clear_cache, get_cache_info
+from pypipackagestats.core.constants import DEFAULT_MAX_WORKERS
 from pypipackagestats.core.exceptions import PackageNotFoundError, APIError, PyPIStatsError
 from pypipackagestats.cli.formatters import format_rich, print_project_banner
-from pypipackagestats.core.constants import DEFAULT_CACHE_TTL
 
 app = typer.Typer()
 console = Console()
+err_console = Console(stderr=True)
+
+# Commands whose stdout is machine-readable, so no banner precedes it
+_QUIET_COMMANDS = {"batch"}
+
+@app.callback()
+def main(ctx: typer.Context):
+    """PyPI package statistics."""
+    if ctx.invoked_subcommand not in _QUIET_COMMANDS:
+        print_project_banner()
 
 @app.command()
 def package(
     name: str = typer.Argument(..., help="Package name"),
     json_output: bool = typer.Option(False, "--json", "-j", help="JSON output"),
     no_cache: bool = typer.Option(False, "--no-cache", help="Disable cache"),
-    cache_ttl: int = typer.Option(DEFAULT_CACHE_TTL, "--cache-ttl", help="Cache TTL in seconds"),
+    cache_ttl: Optional[int] = typer.Option(
+        None, "--cache-ttl", help="Cache TTL in seconds (default: per endpoint, stats until the daily pypistats update)"
+    ),
 ):
     """Get package statistics."""
     try:
@@ -39,6 +54,54 @@ def package(
         console.print(f"[red]Error: {e}[/red]")
         raise typer.Exit(1)
 
+def _read_names(lines: TextIO) -> Iterator[str]:
+    """Package names from a file: one per line, blank lines and # comments skipped."""
+    for line in lines:
+        name = line.split("#", 1)[0].strip()
+        if name:
+            yield name
+
+@app.command()
+def batch(
+    file: typer.FileText = typer.Argument("-", help="File with one package name per line (default: stdin)"),
+    concurrency: int = typer.Option(
+        DEFAULT_MAX_WORKERS, "--concurrency", "-c", min=1, help="Packages fetched at the same time"
+    ),
+    fail_fast: bool = typer.Option(False, "--fail-fast", help="Stop at the first package that fails"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Disable cache"),
+    cache_ttl: Optional[int] = typer.Option(
+        None, "--cache-ttl", help="Cache TTL in seconds (default: per endpoint, stats until the daily pypistats update)"
+    ),
+):
+    """Get statistics for many packages, one JSON object per line (NDJSON) as each completes."""
+    started = time.monotonic()
+    succeeded = failed = 0
+    results = iter_package_stats(_read_names(file), max_workers=concurrency, no_cache=no_cache, cache_ttl=cache_ttl)
+    try:
+        for name, result in results:
+            if isinstance(result, Exception):
+                failed += 1
+                record = {"package": name, "error": str(result), "error_type": type(result).__name__}
+            else:
+                succeeded += 1
+                record = {"package": name, "stats": result.to_dict()}
+            sys.stdout.write(json.dumps(record) + "\n")
+            sys.stdout.flush()
+            if failed and fail_fast:
+                break
+    finally:
+        results.close()
+
+    elapsed = time.monotonic() - started
+    total = succeeded + failed
+    stopped = " (stopped early: --fail-fast)" if failed and fail_fast else ""
+    err_console.print(
+        f"[cyan]{total} package{'' if total == 1 else 's'} in {elapsed:.2f}s:[/cyan] "
+        f"[green]{succeeded} ok[/green], [red]{failed} failed[/red]{stopped}"
+    )
+    if failed:
+        raise typer.Exit(1)
+
 @app.command("cache-clear")
 def cache_clear_cmd():
     """Clear cache."""
@@ -53,5 +116,4 @@ def cache_info_cmd():
     console.print(f"[cyan]Directory:[/cyan] {info['cache_dir']}")
 
 def run_cli():
-    print_project_banner()
     app()
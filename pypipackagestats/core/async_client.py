@@ -0,0 +1,322 @@
+import asyncio
+from urllib.parse import urlparse
+from typing import Dict, Any, Optional, Callable, Mapping, Union
+
+try:
+    import httpx
+except ImportError as e:  # pragma: no cover - exercised only without the extra
+    raise ImportError(
+        "Async support requires httpx. "
+        "Install with: pip install pypi-package-stats[async]"
+    ) from e
+
+from nestedutils import get_at
+from pypipackagestats.core.cache import cache_get_entry, cache_set_entry, CacheEntry
+from pypipackagestats.core.rate_limit import RateLimiter, get_rate_limiter, parse_retry_after
+from pypipackagestats.core.processing import project_package_info, canonicalize_name
+from pypipackagestats.core.ttl import TTLPolicy, resolve_ttl_policies
+from pypipackagestats.core.constants import (
+    DEFAULT_CACHE_TTL,
+    DEFAULT_MAX_CONCURRENCY,
+    PYPI_API,
+    STATS_API,
+    REQUEST_RETRY_MAX_TRIES,
+    REQUEST_RETRY_BACKOFF_FACTOR,
+    REQUEST_RETRY_STATUS_FORCELIST,
+    REQUEST_TIMEOUT,
+    CACHE_STALE_RETENTION,
+    NEGATIVE_CACHE_TTL,
+)
+
+
+def _is_upstream_failure(error: httpx.HTTPError) -> bool:
+    """Whether an error means the upstream is unavailable (not that the resource is bad)."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500 or error.response.status_code == 429
+    return True
+
+
+class AsyncPyPIClient:
+    """Asyncio PyPI API client sharing the disk cache and rate limiter of PyPIClient."""
+
+    def __init__(
+        self,
+        cache_ttl: Optional[int] = DEFAULT_CACHE_TTL,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        project_package_info: bool = False,
+        ttl_policies: Optional[Mapping[str, Union[int, TTLPolicy]]] = None,
+        stale_while_revalidate: float = 0,
+        stale_if_error: float = 0,
+        negative_cache_ttl: int = NEGATIVE_CACHE_TTL,
+    ):
+        """
+        Initialize async PyPI client with persistent disk cache.
+
+        Args:
+            cache_ttl: Time-to-live for cache entries in seconds.
+                      - Positive integer → cache with that TTL (seconds)
+                      - 0 → disable caching completely
+                      - None or omitted → use default (3600 seconds)
+            max_concurrency: Maximum number of HTTP requests in flight.
+            transport: Optional httpx transport (e.g. for proxies or testing).
+            rate_limiter: Per-host rate limiter. Defaults to the process-wide
+                      limiter shared with PyPIClient.
+            project_package_info: Reduce PyPI metadata to the fields processing
+                      needs before caching it (False returns the raw document).
+            ttl_policies: Per-endpoint TTLs overriding cache_ttl, keyed by
+                      endpoint name ("package_info", "recent", "overall",
+                      "python_minor", "system"); values are seconds or a
+                      TTLPolicy such as DailyRolloverTTL. See DEFAULT_TTL_POLICIES.
+            stale_while_revalidate: Seconds past expiry during which a stale
+                      entry is returned immediately while it is refreshed in
+                      a background task (0 disables).
+            stale_if_error: Seconds past expiry during which a stale entry is
+                      returned if refreshing it fails with a network error,
+                      5xx or 429 (0 disables).
+            negative_cache_ttl: Seconds a 404 is cached, so repeated lookups of
+                      a missing package raise without a request (0 disables).
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.cache_ttl = (cache_ttl or DEFAULT_CACHE_TTL) if cache_ttl != 0 else 0
+        self.use_cache = cache_ttl != 0
+        self.ttl_policies = resolve_ttl_policies(self.cache_ttl, ttl_policies)
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.project_package_info = project_package_info
+        self.stale_while_revalidate = stale_while_revalidate
+        self.stale_if_error = stale_if_error
+        self.negative_cache_ttl = negative_cache_ttl
+        # Expired entries must stay on disk for as long as they may be served
+        self._retain = max(CACHE_STALE_RETENTION, stale_while_revalidate, stale_if_error)
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        # Created lazily so they bind to the running event loop
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        # One waiter per host books a rate-limit slot at a time, by hostname
+        self._throttle_gates: Dict[str, asyncio.Lock] = {}
+        # Cache misses currently being fetched, by cache key
+        self._in_flight: Dict[str, "asyncio.Future[Dict[str, Any]]"] = {}
+
+    async def __aenter__(self) -> "AsyncPyPIClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Wait for background refreshes, then close the underlying HTTP connection pool."""
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight.values(), return_exceptions=True)
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared httpx client."""
+        if self._client is None:
+            connect_timeout, read_timeout = REQUEST_TIMEOUT
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+                limits=httpx.Limits(max_connections=self.max_concurrency),
+                transport=self._transport,
+            )
+        return self._client
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Get the semaphore bounding in-flight requests."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def _ttl(self, endpoint: Optional[str]) -> float:
+        """Cache TTL in seconds for a response of the endpoint fetched now."""
+        return self.ttl_policies[endpoint].ttl() if endpoint else self.cache_ttl
+
+    async def _throttle(self, url: str, queue: bool = True) -> None:
+        """Wait for a rate-limit slot without blocking the event loop.
+
+        Requests queue at a per-host gate and only the one at its head books
+        a slot, so the schedule never runs ahead of the requests actually
+        waiting: rate changes and Retry-After pauses apply to everyone still
+        queued, and a cancelled request gives up at most one slot. Retries
+        (``queue=False``) book directly so they are not sent to the back.
+        """
+        if not queue:
+            delay = self.rate_limiter.reserve(url)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            return
+        host = urlparse(url).hostname or ""
+        gate = self._throttle_gates.get(host)
+        if gate is None:
+            gate = self._throttle_gates[host] = asyncio.Lock()
+        async with gate:
+            delay = self.rate_limiter.reserve(url)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+    @staticmethod
+    def _retry_delay(response: Optional[httpx.Response], attempt: int) -> float:
+        """Seconds to wait before retrying, honouring Retry-After (no response: transport error)."""
+        retry_after = parse_retry_after(response.headers.get("Retry-After")) if response is not None else None
+        if retry_after is not None:
+            return retry_after
+        return REQUEST_RETRY_BACKOFF_FACTOR * (2 ** attempt)
+
+    async def _http_get(self, url: str, headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        """Fetch URL with throttling, bounded concurrency and retries (304 is returned as-is).
+
+        Retryable statuses and transport errors (connect/read failures,
+        timeouts) share one retry budget with backoff, like the sync client's
+        urllib3 Retry. The concurrency slot is held only for the request
+        itself, so throttle and backoff waits never block other hosts.
+        """
+        for attempt in range(REQUEST_RETRY_MAX_TRIES + 1):
+            await self._throttle(url, queue=attempt == 0)
+            try:
+                async with self._get_semaphore():
+                    response = await self._get_client().get(url, headers=headers)
+            except httpx.TransportError:
+                if attempt == REQUEST_RETRY_MAX_TRIES:
+                    raise
+                await asyncio.sleep(self._retry_delay(None, attempt))
+                continue
+            self.rate_limiter.feedback(url, response.status_code, response.headers.get("Retry-After"))
+            if (response.status_code not in REQUEST_RETRY_STATUS_FORCELIST
+                    or attempt == REQUEST_RETRY_MAX_TRIES):
+                break
+            await asyncio.sleep(self._retry_delay(response, attempt))
+        if response.status_code != 304:
+            response.raise_for_status()
+        return response
+
+    async def _cached_get(
+        self, url: str, project: Optional[Callable[[Any], Any]] = None, endpoint: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Get URL with caching - disk access runs in the default executor.
+
+        Expired entries may be served stale per stale_while_revalidate and
+        stale_if_error.
+        """
+        if not self.use_cache:
+            data = (await self._http_get(url)).json()
+            return project(data) if project else data
+
+        cache_key = f"url:{url}" + (f"|{project.__name__}" if project else "")
+
+        # L1 hits are served inline; only disk reads go to the executor
+        entry = cache_get_entry(cache_key, read_disk=False)
+        if entry is None:
+            entry = await asyncio.get_running_loop().run_in_executor(None, cache_get_entry, cache_key)
+        elif not entry.fresh:
+            # L1 keeps expired entries; another process may have written a fresh one to disk
+            disk_entry = await asyncio.get_running_loop().run_in_executor(
+                None, lambda: cache_get_entry(cache_key, read_memory=False)
+            )
+            entry = disk_entry or entry
+        if entry is not None and entry.fresh:
+            return self._entry_data(url, entry)
+        if entry is not None and entry.not_found:
+            entry = None  # Expired 404s are never served stale
+
+        # Concurrent misses for the same key wait for a single fetch
+        flight = self._in_flight.get(cache_key)
+        if flight is None:
+            flight = asyncio.ensure_future(self._fetch_and_store(url, cache_key, project, endpoint, entry))
+            self._in_flight[cache_key] = flight
+            flight.add_done_callback(lambda f: self._flight_done(cache_key, f))
+
+        if entry is not None and self.stale_while_revalidate and entry.staleness <= self.stale_while_revalidate:
+            return entry.data  # The flight refreshes the entry in the background
+
+        try:
+            # Shielded so one cancelled waiter does not cancel the fetch for the others
+            return await asyncio.shield(flight)
+        except httpx.HTTPError as e:
+            stale_ok = entry is not None and self.stale_if_error and entry.staleness <= self.stale_if_error
+            if stale_ok and _is_upstream_failure(e):
+                return entry.data
+            raise
+
+    @staticmethod
+    def _entry_data(url: str, entry: CacheEntry) -> Any:
+        """Data of a fresh entry; a negative entry raises its 404 again."""
+        if entry.not_found:
+            request = httpx.Request("GET", url)
+            response = httpx.Response(404, request=request)
+            raise httpx.HTTPStatusError(
+                f"Client error '404 Not Found (cached)' for url '{url}'", request=request, response=response
+            )
+        return entry.data
+
+    def _flight_done(self, cache_key: str, flight: "asyncio.Future[Dict[str, Any]]") -> None:
+        """Forget a finished fetch (and mark its exception retrieved if nobody awaited it)."""
+        self._in_flight.pop(cache_key, None)
+        if not flight.cancelled():
+            flight.exception()
+
+    async def _fetch_and_store(
+        self, url: str, cache_key: str, project: Optional[Callable[[Any], Any]] = None,
+        endpoint: Optional[str] = None, entry: Optional[CacheEntry] = None,
+    ) -> Dict[str, Any]:
+        """Fetch URL and cache the result (runs once per coalesced key).
+
+        An expired ``entry`` with validators is revalidated with a conditional request.
+        """
+        # Fetch from API
+        loop = asyncio.get_running_loop()
+        try:
+            response = await self._http_get(url, entry.conditional_headers() if entry is not None else None)
+        except httpx.HTTPStatusError as e:
+            if self.negative_cache_ttl and e.response.status_code == 404:
+                # Remember the miss briefly; expired 404s are not kept around
+                negative = CacheEntry.negative(self.negative_cache_ttl)
+                await loop.run_in_executor(None, lambda: cache_set_entry(cache_key, negative, retain=0))
+            raise
+
+        if response.status_code == 304 and entry is not None:
+            # Unchanged upstream: keep the cached body, restart its TTL
+            revalidated = entry.revalidated(self._ttl(endpoint), response.headers)
+            await loop.run_in_executor(None, cache_set_entry, cache_key, revalidated, self._retain)
+            return entry.data
+
+        data = response.json()
+        raw: Optional[bytes] = response.content
+        if project:
+            data, raw = project(data), None
+
+        # Store in cache
+        if 200 <= response.status_code < 300:
+            fetched = CacheEntry.from_response(data, self._ttl(endpoint), response.headers)
+            await loop.run_in_executor(None, lambda: cache_set_entry(cache_key, fetched, self._retain, raw=raw))
+
+        return data
+
+    async def get_package_info(self, package: str) -> dict:
+        """Fetch package metadata from PyPI"""
+        url = PYPI_API.format(pkg=canonicalize_name(package))
+        project = project_package_info if self.project_package_info else None
+        return await self._cached_get(url, project, endpoint="package_info")
+
+    async def get_recent_stats(self, package: str) -> dict:
+        """Get recent download stats"""
+        url = STATS_API.format(pkg=canonicalize_name(package)) + "recent"
+        return get_at(await self._cached_get(url, endpoint="recent"), "data", default={})
+
+    async def get_overall_stats(self, package: str) -> list:
+        """Get overall stats (180 days)"""
+        url = STATS_API.format(pkg=canonicalize_name(package)) + "overall?mirrors=false"
+        return get_at(await self._cached_get(url, endpoint="overall"), "data", default=[])
+
+    async def get_python_stats(self, package: str) -> list:
+        """Get Python version breakdown"""
+        url = STATS_API.format(pkg=canonicalize_name(package)) + "python_minor"
+        return get_at(await self._cached_get(url, endpoint="python_minor"), "data", default=[])
+
+    async def get_system_stats(self, package: str) -> list:
+        """Get OS breakdown"""
+        url = STATS_API.format(pkg=canonicalize_name(package)) + "system"
+        return get_at(await self._cached_get(url, endpoint="system"), "data", default=[])
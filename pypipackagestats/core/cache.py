@@ -1,11 +1,23 @@
+import json
+import pickle
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable, Mapping, NamedTuple, Tuple, TypeVar, Union
 import platformdirs
 import diskcache
 import threading
+from pypipackagestats.core.codecs import Codec, CodecDisk, RawJSON, get_codec
+from pypipackagestats.core.constants import MEMORY_CACHE_MAX_BYTES, CACHE_STALE_RETENTION
+
+T = TypeVar("T")
 
 _cache_instance: Optional[diskcache.Cache] = None
 _cache_lock = threading.Lock()
+_cache_codec: Optional[str] = None  # None → pickled values (diskcache default)
+_memory_cache_instance: Optional["MemoryCache"] = None
+_stats_lock = threading.Lock()
+_stats = {"l1_hits": 0, "l2_hits": 0, "misses": 0}
 
 def get_cache_dir() -> Path:
     """Get cache directory."""
@@ -13,24 +25,323 @@ def get_cache_dir() -> Path:
     cache_dir.mkdir(parents=True, exist_ok=True)
     return cache_dir
 
+def _api_cache_dir() -> Path:
+    """Directory of the API cache; each codec gets its own so formats never mix."""
+    return get_cache_dir() / ("api_cache" if _cache_codec is None else f"api_cache_{_cache_codec}")
+
 def get_cache() -> diskcache.Cache:
     """Get cache instance - thread-safe singleton with lazy initialization."""
     global _cache_instance
     if _cache_instance is None:
         with _cache_lock:
             if _cache_instance is None:
-                cache_dir = get_cache_dir() / "api_cache"
-                _cache_instance = diskcache.Cache(cache_dir)
+                if _cache_codec is None:
+                    _cache_instance = diskcache.Cache(_api_cache_dir())
+                else:
+                    _cache_instance = diskcache.Cache(_api_cache_dir(), disk=CodecDisk, disk_codec=_cache_codec)
     return _cache_instance
 
+def configure_cache(codec: Optional[Union[str, Codec]] = None) -> None:
+    """Choose how the disk cache stores values.
+
+    Args:
+        codec: None (default) pickles decoded values. A codec name
+               ("identity", "zlib", "lz4") or a Codec instance stores
+               JSON bytes through that codec instead, decoding only on read;
+               response bodies are stored without re-serialization.
+
+    Must be called before the cache is shared between threads (e.g. at
+    startup); the in-process L1 cache is cleared.
+    """
+    global _cache_instance, _cache_codec
+    name = get_codec(codec).name if codec is not None else None
+    with _cache_lock:
+        if _cache_instance is not None:
+            _cache_instance.close()
+        _cache_instance = None
+        _cache_codec = name
+    get_memory_cache().clear()
+
+def get_memory_cache() -> "MemoryCache":
+    """Get the in-process L1 cache - thread-safe singleton with lazy initialization."""
+    global _memory_cache_instance
+    if _memory_cache_instance is None:
+        with _cache_lock:
+            if _memory_cache_instance is None:
+                _memory_cache_instance = MemoryCache(MEMORY_CACHE_MAX_BYTES)
+    return _memory_cache_instance
+
+def _count(stat: str) -> None:
+    with _stats_lock:
+        _stats[stat] += 1
+
+def cache_get(key: str, default: Any = None, *, read_disk: bool = True, read_memory: bool = True) -> Any:
+    """Look a key up in the L1 memory cache, then the L2 disk cache.
+
+    L2 hits are promoted to L1 with the same expiry time. With
+    ``read_disk=False`` only L1 is consulted (and a miss is not counted);
+    with ``read_memory=False`` only L2 is, to see entries other processes
+    wrote. Values returned from L1 are shared between callers and must not
+    be mutated.
+    """
+    memory = get_memory_cache()
+    if read_memory:
+        value = memory.get(key)
+        if value is not None:
+            _count("l1_hits")
+            return value
+    if not read_disk:
+        return default
+
+    value, expire_time = get_cache().get(key, default=None, expire_time=True)
+    if value is None:
+        _count("misses")
+        return default
+    _count("l2_hits")
+    memory.set(key, value, expire_time)
+    return value
+
+def cache_set(key: str, value: Any, expire: Optional[float] = None, raw: Optional[bytes] = None) -> None:
+    """Store a value in both cache tiers; expire is a TTL in seconds.
+
+    ``raw`` may carry the undecoded JSON body of ``value``; with a codec
+    configured it is stored instead of serializing ``value`` again.
+    """
+    expire_time = time.time() + expire if expire else None
+    stored = RawJSON(raw) if raw is not None and _cache_codec is not None else value
+    get_cache().set(key, stored, expire=expire)
+    get_memory_cache().set(key, value, expire_time, size=len(raw) if raw is not None else None)
+
+class CacheEntry(NamedTuple):
+    """A cached API response with its logical expiry and HTTP validators.
+
+    Entries outlive ``expires_at`` on disk (see ``cache_set_entry``) so an
+    expired entry can still be revalidated with a conditional request.
+    A ``status`` of 404 marks a negative entry: the URL was not found.
+    """
+
+    data: Any
+    expires_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    status: int = 200
+
+    @property
+    def not_found(self) -> bool:
+        """Whether this is a negative entry for a 404."""
+        return self.status == 404
+
+    @property
+    def fresh(self) -> bool:
+        """Whether the entry is still within its TTL."""
+        return time.time() < self.expires_at
+
+    @property
+    def staleness(self) -> float:
+        """Seconds since the entry expired (0 while fresh)."""
+        return max(0.0, time.time() - self.expires_at)
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers for revalidating the entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    @classmethod
+    def from_response(cls, data: Any, ttl: float, headers: Mapping[str, str]) -> "CacheEntry":
+        """Entry for a response fetched now, keeping its ETag / Last-Modified."""
+        return cls(data, time.time() + ttl, headers.get("ETag"), headers.get("Last-Modified"))
+
+    @classmethod
+    def negative(cls, ttl: float) -> "CacheEntry":
+        """Negative entry recording a 404 for ``ttl`` seconds."""
+        return cls(None, time.time() + ttl, status=404)
+
+    def revalidated(self, ttl: float, headers: Mapping[str, str]) -> "CacheEntry":
+        """Same data with a new TTL after a 304 (validators updated if the 304 sent new ones)."""
+        return CacheEntry(
+            self.data,
+            time.time() + ttl,
+            headers.get("ETag", self.etag),
+            headers.get("Last-Modified", self.last_modified),
+        )
+
+def cache_get_entry(key: str, *, read_disk: bool = True, read_memory: bool = True) -> Optional[CacheEntry]:
+    """Look up a response entry (fresh or not) stored with ``cache_set_entry``.
+
+    Values stored with plain ``cache_set`` are returned as entries that never
+    go stale, since the cache already expires them. See ``cache_get`` for
+    ``read_disk`` / ``read_memory``.
+    """
+    value = cache_get(key, read_disk=read_disk, read_memory=read_memory)
+    if value is None:
+        return None
+    if isinstance(value, dict) and "expires_at" in value and "data" in value:
+        return CacheEntry(
+            value["data"], value["expires_at"], value.get("etag"), value.get("last_modified"), value.get("status", 200)
+        )
+    return CacheEntry(value, float("inf"))
+
+def cache_set_entry(
+    key: str, entry: CacheEntry, retain: float = CACHE_STALE_RETENTION, raw: Optional[bytes] = None
+) -> None:
+    """Store a response entry, kept ``retain`` seconds past its logical expiry.
+
+    ``raw`` may carry the undecoded JSON body of ``entry.data`` (see cache_set).
+    """
+    envelope = entry._asdict()
+    expire = max(0.0, entry.expires_at - time.time()) + retain
+    if raw is not None:
+        # Splice the body into the envelope instead of re-serializing it
+        meta = json.dumps({k: v for k, v in envelope.items() if k != "data"}, separators=(",", ":")).encode()
+        raw = b'{"data":' + raw + b"," + meta[1:]
+    cache_set(key, envelope, expire=expire, raw=raw)
+
 def clear_cache() -> None:
     """Clear all cached data."""
     get_cache().clear()
+    get_memory_cache().clear()
+    with _stats_lock:
+        for stat in _stats:
+            _stats[stat] = 0
 
 def get_cache_info() -> Dict[str, Any]:
     """Get cache information."""
     cache = get_cache()
+    memory = get_memory_cache()
+    with _stats_lock:
+        stats = dict(_stats)
     return {
         "size": len(cache),
-        "cache_dir": str(get_cache_dir() / "api_cache"),
+        "cache_dir": str(_api_cache_dir()),
+        "codec": _cache_codec,
+        "volume_bytes": cache.volume(),
+        "memory_entries": len(memory),
+        "memory_bytes": memory.current_bytes,
+        "memory_max_bytes": memory.max_bytes,
+        **stats,
     }
+
+
+class _Flight:
+    """One in-progress call and its outcome."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into a single call.
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight wait for it and get the same result (or exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """Run fn for key, or wait for the in-flight call with the same key."""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def in_flight(self) -> int:
+        """Number of keys currently being fetched."""
+        with self._lock:
+            return len(self._flights)
+
+
+class MemoryCache:
+    """Thread-safe in-process LRU cache bounded by total size in bytes.
+
+    Entries carry an absolute expiry time (``time.time()`` based, like
+    diskcache), so an entry promoted from disk expires when the disk entry does.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._lock = threading.Lock()
+        # key -> (value, size, expire_time)
+        self._entries: "OrderedDict[str, Tuple[Any, int, Optional[float]]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def size_of(value: Any) -> int:
+        """Approximate size of a value: its pickled length."""
+        if isinstance(value, (bytes, bytearray)):
+            return len(value)
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def get(self, key: str) -> Any:
+        """Return the value for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, size, expire_time = entry
+            if expire_time is not None and expire_time <= time.time():
+                del self._entries[key]
+                self.current_bytes -= size
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, expire_time: Optional[float] = None, size: Optional[int] = None) -> None:
+        """Store value until expire_time, evicting least recently used entries."""
+        if self.max_bytes <= 0:
+            return
+        size = self.size_of(value) if size is None else size
+        with self._lock:
+            self._discard(key)
+            if size > self.max_bytes:
+                return  # Never worth evicting everything for one entry
+            self._entries[key] = (value, size, expire_time)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+
+    def delete(self, key: str) -> None:
+        """Remove key if present."""
+        with self._lock:
+            self._discard(key)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry[1]
@@ -1,33 +1,107 @@
 import time
-from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
 
+import diskcache
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 import threading
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable, Iterator, Mapping, Set, Union, Tuple
 from nestedutils import get_at
-from pypipackagestats.core.cache import get_cache
+from pypipackagestats.core.cache import get_cache, cache_get_entry, cache_set_entry, CacheEntry, SingleFlight
+from pypipackagestats.core.rate_limit import RateLimiter, get_rate_limiter
+from pypipackagestats.core.processing import project_package_info, canonicalize_name
+from pypipackagestats.core.ttl import TTLPolicy, resolve_ttl_policies
+from pypipackagestats.core.streaming import stream_package_info, streaming_available
 from pypipackagestats.core.constants import (
     DEFAULT_CACHE_TTL,
     PYPI_API,
     STATS_API,
-    RATE_LIMIT_MIN_INTERVAL,
-    RATE_LIMIT_HOSTS,
     REQUEST_RETRY_MAX_TRIES,
     REQUEST_RETRY_BACKOFF_FACTOR,
     REQUEST_RETRY_STATUS_FORCELIST,
     REQUEST_RETRY_ALLOWED_METHODS,
     REQUEST_TIMEOUT,
+    PROCESS_LOCK_EXPIRE,
+    CACHE_STALE_RETENTION,
+    NEGATIVE_CACHE_TTL,
+    STALE_REFRESH_MAX_WORKERS,
 )
 
+# Background refreshes of stale entries (stale-while-revalidate)
+_refresh_executor: Optional[ThreadPoolExecutor] = None
+_refresh_executor_lock = threading.Lock()
+
+
+def _get_refresh_executor() -> ThreadPoolExecutor:
+    """Get the background refresh executor - thread-safe singleton with lazy initialization."""
+    global _refresh_executor
+    if _refresh_executor is None:
+        with _refresh_executor_lock:
+            if _refresh_executor is None:
+                _refresh_executor = ThreadPoolExecutor(
+                    max_workers=STALE_REFRESH_MAX_WORKERS,
+                    thread_name_prefix="pypipackagestats-refresh",
+                )
+    return _refresh_executor
+
+
+def _is_upstream_failure(error: requests.RequestException) -> bool:
+    """Whether an error means the upstream is unavailable (not that the resource is bad)."""
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code >= 500 or error.response.status_code == 429
+    return True
+
+
+class _FeedbackRetry(Retry):
+    """urllib3 Retry that reports every retried response to a callback.
+
+    Retries happen inside the adapter, so this is the only place the client
+    can observe intermediate 429s and their Retry-After headers.
+    """
+
+    on_response: Optional[Callable[[str, int, Optional[str]], None]] = None
+
+    def new(self, **kw: Any) -> "_FeedbackRetry":
+        retry = super().new(**kw)
+        retry.on_response = self.on_response
+        return retry
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        if self.on_response is not None and response is not None and _pool is not None:
+            self.on_response(
+                f"{_pool.scheme}://{_pool.host}",
+                response.status,
+                response.headers.get("Retry-After"),
+            )
+        return super().increment(method, url, response, error, _pool, _stacktrace)
+
+
+class FetchCancelled(requests.RequestException):
+    """A request was not sent because its result is no longer needed (see PyPIClient.cancel_on)."""
+
+
 class PyPIClient:
     """Thread-safe PyPI API client."""
 
-    _rate_limit_lock = threading.Lock()
-    _host_last_request_time: Dict[str, float] = {}
+    # Shared by all clients so identical concurrent cache misses are fetched once
+    _single_flight = SingleFlight()
+    # Cache keys with a background refresh queued or running
+    _refreshing: Set[str] = set()
+    _refreshing_lock = threading.Lock()
 
-    def __init__(self, cache_ttl: Optional[int] = DEFAULT_CACHE_TTL):
+    def __init__(
+        self,
+        cache_ttl: Optional[int] = DEFAULT_CACHE_TTL,
+        rate_limiter: Optional[RateLimiter] = None,
+        process_lock: bool = False,
+        project_package_info: bool = False,
+        ttl_policies: Optional[Mapping[str, Union[int, TTLPolicy]]] = None,
+        stale_while_revalidate: float = 0,
+        stale_if_error: float = 0,
+        negative_cache_ttl: int = NEGATIVE_CACHE_TTL,
+    ):
         """
         Initialize PyPI client with persistent disk cache.
         
@@ -36,22 +110,50 @@ class PyPIClient:
                       - Positive integer → cache with that TTL (seconds)
                       - 0 → disable caching completely
                       - None or omitted → use default (3600 seconds)
+            rate_limiter: Per-host rate limiter. Defaults to the process-wide
+                      limiter shared by all clients.
+            process_lock: Also coalesce cache misses across processes with a
+                      diskcache lock, so only one process fetches a given URL.
+            project_package_info: Reduce PyPI metadata to the fields processing
+                      needs before caching it (False returns the raw document).
+            ttl_policies: Per-endpoint TTLs overriding cache_ttl, keyed by
+                      endpoint name ("package_info", "recent", "overall",
+                      "python_minor", "system"); values are seconds or a
+                      TTLPolicy such as DailyRolloverTTL. See DEFAULT_TTL_POLICIES.
+            stale_while_revalidate: Seconds past expiry during which a stale
+                      entry is returned immediately while it is refreshed in
+                      the background (0 disables).
+            stale_if_error: Seconds past expiry during which a stale entry is
+                      returned if refreshing it fails with a network error,
+                      5xx or 429 (0 disables).
+            negative_cache_ttl: Seconds a 404 is cached, so repeated lookups of
+                      a missing package raise without a request (0 disables).
         """
         self.cache_ttl = (cache_ttl or DEFAULT_CACHE_TTL) if cache_ttl != 0 else 0
         self.use_cache = cache_ttl != 0
+        self.ttl_policies = resolve_ttl_policies(self.cache_ttl, ttl_policies)
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.process_lock = process_lock
+        self.project_package_info = project_package_info
+        self.stale_while_revalidate = stale_while_revalidate
+        self.stale_if_error = stale_if_error
+        self.negative_cache_ttl = negative_cache_ttl
+        # Expired entries must stay on disk for as long as they may be served
+        self._retain = max(CACHE_STALE_RETENTION, stale_while_revalidate, stale_if_error)
         self._local = threading.local()
     
     def _get_session(self) -> requests.Session:
         """Get thread-local session."""
         if not hasattr(self._local, 'session'):
             session = requests.Session()
-            retry = Retry(
+            retry = _FeedbackRetry(
                 total=REQUEST_RETRY_MAX_TRIES,  # Total retries (covers connection and read errors)
                 status_forcelist=REQUEST_RETRY_STATUS_FORCELIST,
                 backoff_factor=REQUEST_RETRY_BACKOFF_FACTOR,
                 respect_retry_after_header=True,
                 allowed_methods=REQUEST_RETRY_ALLOWED_METHODS,  # Only retry GET requests
             )
+            retry.on_response = self.rate_limiter.feedback  # Adaptive limiter sees retried 429s
             adapter = HTTPAdapter(max_retries=retry)
             session.mount("https://", adapter)
             session.mount("http://", adapter)
@@ -66,72 +168,205 @@ class PyPIClient:
             except Exception:
                 pass  # Ignore errors during cleanup
     
+    def _ttl(self, endpoint: Optional[str]) -> float:
+        """Cache TTL in seconds for a response of the endpoint fetched now."""
+        return self.ttl_policies[endpoint].ttl() if endpoint else self.cache_ttl
+
     def _throttle(self, url: str) -> None:
-        """Enforce minimum interval between requests to rate-limited hosts."""
-        host = urlparse(url).hostname
-        if host not in RATE_LIMIT_HOSTS:
-            return
-        with PyPIClient._rate_limit_lock:
-            now = time.monotonic()
-            last = PyPIClient._host_last_request_time.get(host, 0.0)
-            elapsed = now - last
-            if elapsed < RATE_LIMIT_MIN_INTERVAL:
-                time.sleep(RATE_LIMIT_MIN_INTERVAL - elapsed)
-            PyPIClient._host_last_request_time[host] = time.monotonic()
-
-    def _http_get(self, url: str) -> requests.Response:
+        """Wait for a rate-limit slot (no lock is held while sleeping)."""
+        delay = self.rate_limiter.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+
+    @contextmanager
+    def cancel_on(self, event: threading.Event) -> Iterator[None]:
+        """Stop sending the calling thread's requests once ``event`` is set.
+
+        The event is checked after each throttle wait, so a request that
+        waited for a rate-limit slot is not sent if it is no longer needed;
+        FetchCancelled is raised instead.
+        """
+        self._local.cancel_event = event
+        try:
+            yield
+        finally:
+            self._local.cancel_event = None
+
+    def _http_get(
+        self, url: str, stream: bool = False, headers: Optional[Dict[str, str]] = None
+    ) -> requests.Response:
         """Fetch JSON from URL with throttling."""
         self._throttle(url)
-        response = self._get_session().get(url, timeout=REQUEST_TIMEOUT)
+        cancel_event = getattr(self._local, "cancel_event", None)
+        if cancel_event is not None and cancel_event.is_set():
+            raise FetchCancelled(f"Request cancelled: {url}")
+        response = self._get_session().get(url, timeout=REQUEST_TIMEOUT, stream=stream, headers=headers)
+        self.rate_limiter.feedback(url, response.status_code, response.headers.get("Retry-After"))
         response.raise_for_status()
         return response
 
-    def _cached_get(self, url: str) -> Dict[str, Any]:
-        """Get URL with caching - let diskcache handle thread safety."""
+    def _fetch_json(
+        self, url: str, project: Optional[Callable[[Any], Any]] = None, headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[requests.Response, Any, Optional[bytes]]:
+        """Fetch and decode URL, applying the projection.
+
+        Projected PyPI metadata is parsed incrementally from the response body
+        when ijson is installed, so large documents are never fully loaded.
+
+        Returns:
+            (response, data, raw body) - the raw body is None when data
+            is projected, since it no longer matches it. Data and body are
+            None for a 304 Not Modified.
+        """
+        if project is project_package_info and streaming_available():
+            response = self._http_get(url, stream=True, headers=headers)
+            try:
+                if response.status_code == 304:
+                    return response, None, None
+                response.raw.decode_content = True
+                data = stream_package_info(response.raw)
+            finally:
+                response.close()
+        else:
+            response = self._http_get(url, headers=headers)
+            if response.status_code == 304:
+                return response, None, None
+            data = response.json()
+        if project:
+            return response, project(data), None
+        return response, data, response.content
+
+    def _cached_get(
+        self, url: str, project: Optional[Callable[[Any], Any]] = None, endpoint: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Get URL with caching - let diskcache handle thread safety.
+
+        If ``project`` is given it is applied before caching, and the result
+        is cached under its own key so raw and projected entries never mix.
+        Expired entries may be served stale per stale_while_revalidate and
+        stale_if_error.
+        """
         if not self.use_cache:
-            response = self._http_get(url)
-            return response.json()
+            return self._fetch_json(url, project)[1]
+
+        cache_key = f"url:{url}" + (f"|{project.__name__}" if project else "")
 
-        cache = get_cache()
-        cache_key = f"url:{url}"
+        # L1 memory cache, then diskcache (which handles thread safety internally)
+        entry = cache_get_entry(cache_key)
+        if entry is not None and entry.fresh:
+            return self._entry_data(url, entry)
+        if entry is not None and entry.not_found:
+            entry = None  # Expired 404s are never served stale
+
+        def fetch() -> Dict[str, Any]:
+            # Concurrent misses for the same key wait for a single fetch
+            return PyPIClient._single_flight.do(
+                cache_key, lambda: self._fetch_and_store(url, cache_key, project, endpoint)
+            )
 
-        # diskcache handles thread safety internally
-        cached_data = cache.get(cache_key, default=None)
-        if cached_data is not None:
-            return cached_data
+        if entry is not None and self.stale_while_revalidate and entry.staleness <= self.stale_while_revalidate:
+            self._refresh_in_background(cache_key, fetch)
+            return entry.data
 
-        # Fetch from API
-        response = self._http_get(url)
-        data = response.json()
+        try:
+            return fetch()
+        except requests.RequestException as e:
+            stale_ok = entry is not None and self.stale_if_error and entry.staleness <= self.stale_if_error
+            if stale_ok and _is_upstream_failure(e):
+                return entry.data
+            raise
+
+    @staticmethod
+    def _entry_data(url: str, entry: CacheEntry) -> Any:
+        """Data of a fresh entry; a negative entry raises its 404 again."""
+        if entry.not_found:
+            response = requests.Response()
+            response.status_code = 404
+            response.reason = "Not Found (cached)"
+            response.url = url
+            raise requests.HTTPError(f"404 Client Error: Not Found (cached) for url: {url}", response=response)
+        return entry.data
+
+    def _refresh_in_background(self, cache_key: str, fetch: Callable[[], Any]) -> None:
+        """Refresh a stale entry on the refresh executor, once per key at a time."""
+        with PyPIClient._refreshing_lock:
+            if cache_key in PyPIClient._refreshing:
+                return
+            PyPIClient._refreshing.add(cache_key)
+
+        def refresh() -> None:
+            try:
+                fetch()
+            except Exception:
+                pass  # The stale entry stays; the next request tries again
+            finally:
+                with PyPIClient._refreshing_lock:
+                    PyPIClient._refreshing.discard(cache_key)
+
+        _get_refresh_executor().submit(refresh)
+
+    def _fetch_and_store(
+        self, url: str, cache_key: str, project: Optional[Callable[[Any], Any]] = None, endpoint: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Fetch URL and cache the result (runs once per coalesced key)."""
+        lock = (
+            diskcache.Lock(get_cache(), f"lock:{cache_key}", expire=PROCESS_LOCK_EXPIRE)
+            if self.process_lock else nullcontext()
+        )
+        with lock:
+            # Another thread or process may have stored it since our miss. L1 keeps
+            # expired entries for revalidation, so a stale L1 copy is re-checked
+            # on disk, where another process may have written a fresh one.
+            entry = cache_get_entry(cache_key)
+            if entry is not None and not entry.fresh:
+                entry = cache_get_entry(cache_key, read_memory=False) or entry
+            if entry is not None and entry.fresh:
+                return self._entry_data(url, entry)
+
+            # Fetch from API, revalidating an expired entry if it has validators
+            headers = entry.conditional_headers() if entry is not None else None
+            try:
+                response, data, raw = self._fetch_json(url, project, headers)
+            except requests.HTTPError as e:
+                if self.negative_cache_ttl and e.response is not None and e.response.status_code == 404:
+                    # Remember the miss briefly; expired 404s are not kept around
+                    cache_set_entry(cache_key, CacheEntry.negative(self.negative_cache_ttl), retain=0)
+                raise
 
-        # Store in cache - diskcache handles locking
-        if 200 <= response.status_code < 300:
-            cache.set(cache_key, data, expire=self.cache_ttl)
+            # Store in cache - diskcache handles locking
+            if response.status_code == 304 and entry is not None:
+                # Unchanged upstream: keep the cached body, restart its TTL
+                cache_set_entry(cache_key, entry.revalidated(self._ttl(endpoint), response.headers), self._retain)
+                return entry.data
+            if 200 <= response.status_code < 300:
+                entry = CacheEntry.from_response(data, self._ttl(endpoint), response.headers)
+                cache_set_entry(cache_key, entry, self._retain, raw=raw)
 
         return data
     
     def get_package_info(self, package: str) -> dict:
         """Fetch package metadata from PyPI"""
-        url = PYPI_API.format(pkg=package.lower())
-        return self._cached_get(url)
+        url = PYPI_API.format(pkg=canonicalize_name(package))
+        project = project_package_info if self.project_package_info else None
+        return self._cached_get(url, project, endpoint="package_info")
     
     def get_recent_stats(self, package: str) -> dict:
         """Get recent download stats"""
-        url = STATS_API.format(pkg=package.lower()) + "recent"
-        return get_at(self._cached_get(url), "data", default={})
+        url = STATS_API.format(pkg=canonicalize_name(package)) + "recent"
+        return get_at(self._cached_get(url, endpoint="recent"), "data", default={})
     
     def get_overall_stats(self, package: str) -> list:
         """Get overall stats (180 days)"""
-        url = STATS_API.format(pkg=package.lower()) + "overall?mirrors=false"
-        return get_at(self._cached_get(url), "data", default=[])
+        url = STATS_API.format(pkg=canonicalize_name(package)) + "overall?mirrors=false"
+        return get_at(self._cached_get(url, endpoint="overall"), "data", default=[])
     
     def get_python_stats(self, package: str) -> list:
         """Get Python version breakdown"""
-        url = STATS_API.format(pkg=package.lower()) + "python_minor"
-        return get_at(self._cached_get(url), "data", default=[])
+        url = STATS_API.format(pkg=canonicalize_name(package)) + "python_minor"
+        return get_at(self._cached_get(url, endpoint="python_minor"), "data", default=[])
     
     def get_system_stats(self, package: str) -> list:
         """Get OS breakdown"""
-        url = STATS_API.format(pkg=package.lower()) + "system"
-        return get_at(self._cached_get(url), "data", default=[])
+        url = STATS_API.format(pkg=canonicalize_name(package)) + "system"
+        return get_at(self._cached_get(url, endpoint="system"), "data", default=[])
 
@@ -0,0 +1,111 @@
+"""Compression codecs and the diskcache Disk that stores JSON through them."""
+
+import json
+import zlib
+from typing import Dict, Any, Union
+
+import diskcache
+from diskcache.core import UNKNOWN
+from pypipackagestats.core.constants import CACHE_ZLIB_LEVEL
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # Optional codec
+    lz4_frame = None
+
+
+class Codec:
+    """Byte-level codec used for cache values.
+
+    Subclass and override ``encode``/``decode`` (and give it a unique
+    ``name``), then pass an instance to ``register_codec``.
+    """
+
+    name = "identity"
+
+    def encode(self, data: bytes) -> bytes:
+        return data
+
+    def decode(self, data: bytes) -> bytes:
+        return data
+
+
+class ZlibCodec(Codec):
+    """zlib compression (standard library)."""
+
+    name = "zlib"
+
+    def __init__(self, level: int = CACHE_ZLIB_LEVEL):
+        self.level = level
+
+    def encode(self, data: bytes) -> bytes:
+        return zlib.compress(data, self.level)
+
+    def decode(self, data: bytes) -> bytes:
+        return zlib.decompress(data)
+
+
+class LZ4Codec(Codec):
+    """LZ4 frame compression (requires the ``lz4`` package)."""
+
+    name = "lz4"
+
+    def __init__(self):
+        if lz4_frame is None:
+            raise RuntimeError("The lz4 codec requires lz4. Install with: pip install lz4")
+
+    def encode(self, data: bytes) -> bytes:
+        return lz4_frame.compress(data)
+
+    def decode(self, data: bytes) -> bytes:
+        return lz4_frame.decompress(data)
+
+
+_codecs: Dict[str, Codec] = {"identity": Codec(), "zlib": ZlibCodec()}
+if lz4_frame is not None:
+    _codecs["lz4"] = LZ4Codec()
+
+
+def register_codec(codec: Codec) -> None:
+    """Make a codec available by name to ``configure_cache``."""
+    _codecs[codec.name] = codec
+
+
+def get_codec(codec: Union[str, Codec]) -> Codec:
+    """Resolve a codec name (or instance, which is registered) to a codec."""
+    if isinstance(codec, Codec):
+        register_codec(codec)
+        return codec
+    try:
+        return _codecs[codec]
+    except KeyError:
+        raise ValueError(f"Unknown cache codec '{codec}'. Available: {', '.join(sorted(_codecs))}") from None
+
+
+class RawJSON(bytes):
+    """Undecoded JSON response body; stored as-is by CodecDisk (no re-serialization)."""
+
+
+class CodecDisk(diskcache.Disk):
+    """diskcache Disk storing values as codec-encoded JSON bytes instead of pickles.
+
+    Values are decoded only when read. ``RawJSON`` values (response bodies)
+    skip serialization entirely. Keys use the default Disk handling.
+    """
+
+    def __init__(self, directory: str, codec: str = "zlib", **kwargs: Any):
+        # Not "self.codec": diskcache re-assigns disk_* settings as Disk attributes
+        self._codec = get_codec(codec)
+        super().__init__(directory, **kwargs)
+
+    def store(self, value: Any, read: bool, key: Any = UNKNOWN):
+        if not read:
+            data = bytes(value) if isinstance(value, RawJSON) else json.dumps(value, separators=(",", ":")).encode()
+            value = self._codec.encode(data)
+        return super().store(value, read, key=key)
+
+    def fetch(self, mode: int, filename: str, value: Any, read: bool) -> Any:
+        data = super().fetch(mode, filename, value, read)
+        if not read:
+            data = json.loads(self._codec.decode(data))
+        return data
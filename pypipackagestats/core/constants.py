@@ -1,16 +1,54 @@
 # Constants
+from datetime import date
+
 DEFAULT_CACHE_TTL = 3600  # Default cache TTL in seconds (1 hour)
+MEMORY_CACHE_MAX_BYTES = 64 * 1024 * 1024  # Size bound of the in-process L1 cache (0 disables it)
+CACHE_STALE_RETENTION = 24 * 60 * 60  # Min seconds expired entries are kept (revalidation, stale serving)
+STALE_REFRESH_MAX_WORKERS = 4  # Threads refreshing stale entries in the background
+NEGATIVE_CACHE_TTL = 300  # Seconds a 404 is remembered (kept short: new packages appear)
+CACHE_TTL_JITTER = 300  # Max random seconds added to policy TTLs so expiries spread out
+CACHE_ZLIB_LEVEL = 1  # zlib level for the "zlib" cache codec (1 = fastest)
+STATS_SECTIONS = ("package_info", "downloads", "python_versions", "operating_systems")  # PackageStats sections
 TOP_PYTHON_VERSIONS_COUNT = 5  # Number of top Python versions to display
 TOP_OS_COUNT = 4  # Number of top operating systems to display
 DATE_ISO_FORMAT_LENGTH = 10  # Length of ISO date format string (YYYY-MM-DD)
 
+# Batch processing
+DEFAULT_MAX_WORKERS = 8  # Default worker threads for get_many_package_stats
+DEFAULT_MAX_CONCURRENCY = 20  # Default in-flight HTTP requests for the async client
+ENDPOINT_FETCH_MAX_WORKERS = 10  # Shared threads for the pypi.org fetch of parallel per-package fetches
+
 # API URLs
 PYPI_API = "https://pypi.org/pypi/{pkg}/json"
 STATS_API = "https://pypistats.org/api/packages/{pkg}/"
 
+# Cacheable endpoints (names used by TTL policies)
+CACHE_ENDPOINTS = ("package_info", "recent", "overall", "python_minor", "system")
+PYPISTATS_ROLLOVER_HOUR_UTC = 1  # pypistats.org has loaded the previous day's downloads by then
+
+# Local download history (daily series kept beyond pypistats.org's 180 days)
+HISTORY_ENDPOINTS = ("overall", "python_minor", "system")
+MATRIX_EPOCH = date(2018, 1, 1)  # First day of the memory-mapped matrix (pypistats.org started in 2018)
+MATRIX_DAYS = 8192  # Days per matrix row (64 KiB of int64, through 2040)
+
+# Package metadata projection (fields read by process_package_info/get_upload_time)
+PACKAGE_INFO_FIELDS = (
+    "name", "version", "summary", "author", "author_email", "license",
+    "home_page", "project_url", "project_urls", "package_url",
+)
+RELEASE_FILE_FIELDS = ("upload_time", "upload_time_iso_8601")
+
 # Rate limiting
-RATE_LIMIT_MIN_INTERVAL = 0.25  # Min seconds between requests to same host
+RATE_LIMIT_MIN_INTERVAL = 0.25  # Min seconds between requests to same host (sustained rate)
+RATE_LIMIT_BURST = 1  # Requests allowed back-to-back before throttling kicks in
 RATE_LIMIT_HOSTS = ["pypistats.org"]  # Hosts requiring throttling
+ADAPTIVE_RATE_MIN = 0.2  # Floor for the adaptive rate (requests/sec)
+ADAPTIVE_RATE_DECREASE_FACTOR = 0.5  # Rate multiplier applied on HTTP 429
+ADAPTIVE_RATE_INCREASE_STEP = 0.25  # Requests/sec added after a run of successes
+ADAPTIVE_RATE_SUCCESS_THRESHOLD = 20  # Consecutive successes before probing a higher rate
+
+# Request coalescing
+PROCESS_LOCK_EXPIRE = 60  # Seconds before a cross-process fetch lock is considered abandoned
 
 # Request configuration
 REQUEST_RETRY_MAX_TRIES = 4
@@ -0,0 +1,154 @@
+"""Local download history that outlives pypistats.org's 180-day window."""
+
+from itertools import chain
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+import diskcache
+import platformdirs
+from pypipackagestats.core.client import PyPIClient
+from pypipackagestats.core.constants import DATE_ISO_FORMAT_LENGTH, HISTORY_ENDPOINTS
+from pypipackagestats.core.processing import canonicalize_name
+from pypipackagestats.core.timeseries import CategorySeries, RollupIndex
+from pypipackagestats.core.ttl import DEFAULT_TTL_POLICIES
+
+
+def get_data_dir() -> Path:
+    """Directory of the persistent stores (user data, not cache: they must survive clear_cache)."""
+    return Path(platformdirs.user_data_dir("pypipackagestats"))
+
+
+def get_history_dir() -> Path:
+    """Default HistoryStore directory."""
+    return get_data_dir() / "history"
+
+
+class HistoryStore:
+    """Append-only store of per-package daily download series.
+
+    Each package keeps the rows of the ``overall``, ``python_minor`` and
+    ``system`` responses. A sync appends only the days newer than the last
+    day already stored, as a new chunk, so stored days are never rewritten
+    and rows already seen are not processed again; history keeps growing
+    past the 180 days pypistats.org serves.
+
+    State lives in a diskcache store updated inside transactions, so several
+    processes may sync into the same directory.
+    """
+
+    def __init__(self, directory: Optional[Union[str, Path]] = None, client: Optional[PyPIClient] = None):
+        """
+        Args:
+            directory: Store directory (default: ``history`` in the user data directory)
+            client: Client used by sync (default: one using DEFAULT_TTL_POLICIES)
+        """
+        self.directory = Path(directory) if directory else get_history_dir()
+        self._store = diskcache.Cache(str(self.directory))
+        self._client = client
+
+    @property
+    def client(self) -> PyPIClient:
+        if self._client is None:
+            self._client = PyPIClient(cache_ttl=None, ttl_policies=DEFAULT_TTL_POLICIES)
+        return self._client
+
+    def _fetchers(self) -> Dict[str, Callable[[str], List[Dict[str, Any]]]]:
+        return {
+            "overall": self.client.get_overall_stats,
+            "python_minor": self.client.get_python_stats,
+            "system": self.client.get_system_stats,
+        }
+
+    def sync(self, package: str) -> Dict[str, int]:
+        """Fetch the package's daily series and append the days not stored yet.
+
+        Returns:
+            Number of rows appended per endpoint
+
+        Raises:
+            requests.HTTPError: If an endpoint fails (404 for unknown packages)
+        """
+        package = canonicalize_name(package)
+        return {endpoint: self.merge(package, endpoint, fetch(package)) for endpoint, fetch in self._fetchers().items()}
+
+    def merge(self, package: str, endpoint: str, rows: Iterable[Dict[str, Any]]) -> int:
+        """Append the rows dated after the last stored day of a series.
+
+        Dates are compared as ISO strings, so older rows cost one comparison
+        and are otherwise skipped. Rows without a valid date are dropped.
+
+        Returns:
+            Number of rows appended
+
+        Raises:
+            ValueError: If endpoint is not one of HISTORY_ENDPOINTS
+        """
+        self._check_endpoint(endpoint)
+        package = canonicalize_name(package)
+        with self._store.transact():
+            meta = self._store.get((package, endpoint), {"last_date": "", "chunks": 0})
+            new_rows = [row for row in rows if _iso_date(row) > meta["last_date"]]
+            if not new_rows:
+                return 0
+            self._store.set((package, endpoint, meta["chunks"]), new_rows)
+            self._store.set(
+                (package, endpoint),
+                {"last_date": max(map(_iso_date, new_rows)), "chunks": meta["chunks"] + 1},
+            )
+            return len(new_rows)
+
+    def rows(self, package: str, endpoint: str = "overall") -> List[Dict[str, Any]]:
+        """Every stored row of a series, oldest chunk first."""
+        self._check_endpoint(endpoint)
+        package = canonicalize_name(package)
+        meta = self._store.get((package, endpoint))
+        if meta is None:
+            return []
+        return list(chain.from_iterable(self._store.get((package, endpoint, i), []) for i in range(meta["chunks"])))
+
+    def series(self, package: str, endpoint: str = "overall") -> CategorySeries:
+        """Stored history of a series as a CategorySeries (totals and windows over all stored days)."""
+        return CategorySeries.from_rows(self.rows(package, endpoint))
+
+    def rollup(self, package: str) -> RollupIndex:
+        """O(1) range-sum index (with weekly/monthly rollups) over the package's stored daily downloads."""
+        return RollupIndex.from_series(self.series(package, "overall"))
+
+    def last_synced(self, package: str, endpoint: str = "overall") -> Optional[date]:
+        """Latest day stored for a series, None if it was never synced."""
+        self._check_endpoint(endpoint)
+        meta = self._store.get((canonicalize_name(package), endpoint))
+        return date.fromisoformat(meta["last_date"]) if meta else None
+
+    def packages(self) -> List[str]:
+        """Names of the packages with stored history."""
+        return sorted({key[0] for key in self._store.iterkeys() if len(key) == 2})
+
+    def clear(self) -> None:
+        """Delete all stored history."""
+        self._store.clear()
+
+    def close(self) -> None:
+        self._store.close()
+
+    def __enter__(self) -> "HistoryStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @staticmethod
+    def _check_endpoint(endpoint: str) -> None:
+        if endpoint not in HISTORY_ENDPOINTS:
+            raise ValueError(f"Unknown endpoint '{endpoint}'. Available: {', '.join(HISTORY_ENDPOINTS)}")
+
+
+def _iso_date(row: Dict[str, Any]) -> str:
+    """The row's YYYY-MM-DD date, or "" (sorts before every date) if it has none."""
+    value = row.get("date") or ""
+    value = value[:DATE_ISO_FORMAT_LENGTH] if isinstance(value, str) else ""
+    return value if _is_iso_date(value) else ""
+
+
+def _is_iso_date(value: str) -> bool:
+    return len(value) == DATE_ISO_FORMAT_LENGTH and value[4] == "-" and value[7] == "-" and value.replace("-", "").isdigit()
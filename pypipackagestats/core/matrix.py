@@ -0,0 +1,226 @@
+"""Memory-mapped package × day download matrix."""
+
+import mmap
+import os
+import threading
+from array import array
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+import diskcache
+from pypipackagestats.core.client import PyPIClient
+from pypipackagestats.core.constants import MATRIX_EPOCH, MATRIX_DAYS
+from pypipackagestats.core.history import get_data_dir
+from pypipackagestats.core.processing import canonicalize_name
+from pypipackagestats.core.timeseries import CategorySeries, DateLike, to_ordinal
+from pypipackagestats.core.ttl import DEFAULT_TTL_POLICIES
+
+_ITEM = array("q").itemsize
+
+
+class DownloadMatrix:
+    """Daily downloads of many packages as fixed-width memory-mapped columns.
+
+    ``downloads.i64`` holds one row per package with one native-endian int64
+    per day from ``epoch`` (``days`` columns, so row ``r`` day ``d`` is at a
+    fixed offset); unwritten days read as 0 and cost no disk space on
+    filesystems with sparse files. The package → row index lives in a
+    diskcache store in the same directory.
+
+    Queries read straight from the mapping (the OS page cache) without
+    decoding anything, and any number of processes may open the same
+    directory: rows are added inside a diskcache transaction, and other
+    processes remap when they see a row beyond their mapping.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Union[str, Path]] = None,
+        *,
+        epoch: date = MATRIX_EPOCH,
+        days: int = MATRIX_DAYS,
+        readonly: bool = False,
+        client: Optional[PyPIClient] = None,
+    ):
+        """
+        Args:
+            directory: Store directory (default: ``matrix`` in the user data directory)
+            epoch: First day of the day axis (only used when the store is created)
+            days: Number of days per row (only used when the store is created)
+            readonly: Map the matrix read-only (updates raise)
+            client: Client used by sync (default: one using DEFAULT_TTL_POLICIES)
+        """
+        self.directory = Path(directory) if directory else get_data_dir() / "matrix"
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.readonly = readonly
+        self._index = diskcache.Cache(str(self.directory / "index"))
+        with self._index.transact():
+            layout = self._index.get("__layout__")
+            if layout is None:
+                layout = (epoch.toordinal(), days)
+                self._index.set("__layout__", layout)
+        self._epoch, self.days = layout
+        self._row_bytes = self.days * _ITEM
+        self._path = self.directory / "downloads.i64"
+        self._path.touch(exist_ok=True)
+        self._lock = threading.RLock()
+        self._mmap: Optional[mmap.mmap] = None
+        self._view: Optional[memoryview] = None
+        self._mapped_rows = 0
+        self._client = client
+
+    @property
+    def epoch(self) -> date:
+        return date.fromordinal(self._epoch)
+
+    @property
+    def client(self) -> PyPIClient:
+        if self._client is None:
+            self._client = PyPIClient(cache_ttl=None, ttl_policies=DEFAULT_TTL_POLICIES)
+        return self._client
+
+    def packages(self) -> List[str]:
+        """Packages with a row, in row order."""
+        return [name for name, _ in sorted(self._rows().items(), key=lambda item: item[1])]
+
+    def _rows(self) -> Dict[str, int]:
+        """Package → row index (canonical names never start with "_", unlike the layout keys)."""
+        return {key: self._index[key] for key in self._index.iterkeys() if not key.startswith("_")}
+
+    def _row(self, package: str, create: bool = False) -> Optional[int]:
+        """Row index of a package, adding a row (and growing the file) if create."""
+        package = canonicalize_name(package)
+        row = self._index.get(package)
+        if row is None and create:
+            with self._index.transact():
+                row = self._index.get(package)
+                if row is None:
+                    row = self._index.incr("__rows__") - 1
+                    self._index.set(package, row)
+                    with open(self._path, "r+b") as f:
+                        if os.fstat(f.fileno()).st_size < (row + 1) * self._row_bytes:
+                            f.truncate((row + 1) * self._row_bytes)
+        return row
+
+    def _mapped(self, row: int) -> memoryview:
+        """int64 view of the matrix, remapped if ``row`` lies past the current mapping."""
+        with self._lock:
+            if row >= self._mapped_rows:
+                self._unmap()
+                size = os.path.getsize(self._path)
+                access = mmap.ACCESS_READ if self.readonly else mmap.ACCESS_WRITE
+                with open(self._path, "rb" if self.readonly else "r+b") as f:
+                    self._mmap = mmap.mmap(f.fileno(), size, access=access)
+                self._view = memoryview(self._mmap).cast("q")
+                self._mapped_rows = size // self._row_bytes
+            return self._view
+
+    def _unmap(self) -> None:
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._mapped_rows = 0
+
+    def _columns(self, start: Optional[DateLike], end: Optional[DateLike]) -> Tuple[int, int]:
+        """Column range ``lo:hi`` of an inclusive date range (None = whole axis)."""
+        lo = 0 if start is None else min(max(to_ordinal(start) - self._epoch, 0), self.days)
+        hi = self.days if end is None else min(max(to_ordinal(end) - self._epoch + 1, lo), self.days)
+        return lo, hi
+
+    def update(self, package: str, rows: Iterable[Dict[str, Any]]) -> int:
+        """Write a package's daily downloads from ``get_overall_stats`` rows.
+
+        Days are overwritten (categories of a day are summed), so feeding the
+        same response twice is harmless. Days outside the axis are skipped.
+
+        Returns:
+            Number of days written
+        """
+        if self.readonly:
+            raise PermissionError("DownloadMatrix was opened read-only")
+        series = rows if isinstance(rows, CategorySeries) else CategorySeries.from_rows(rows)
+        row = self._row(package, create=True)
+        with self._lock:
+            view = self._mapped(row)
+            base = row * self.days
+            written = 0
+            for i, ordinal in enumerate(series.days):
+                column = ordinal - self._epoch
+                if 0 <= column < self.days:
+                    view[base + column] = sum(values[i] for values in series.columns)
+                    written += 1
+            return written
+
+    def sync(self, package: str) -> int:
+        """Fetch the package's ``overall`` series and write it (see update)."""
+        package = canonicalize_name(package)
+        return self.update(package, self.client.get_overall_stats(package))
+
+    def series(self, package: str, start: Optional[DateLike] = None, end: Optional[DateLike] = None) -> array:
+        """Copy of a package's daily downloads for the inclusive date range (zeros if unknown)."""
+        lo, hi = self._columns(start, end)
+        row = self._row(package)
+        if row is None:
+            return array("q", [0]) * (hi - lo)
+        with self._lock:
+            view = self._mapped(row)
+            return array("q", view[row * self.days + lo:row * self.days + hi])
+
+    def range_sum(self, package: str, start: Optional[DateLike] = None, end: Optional[DateLike] = None) -> int:
+        """Downloads of a package over the inclusive date range."""
+        lo, hi = self._columns(start, end)
+        row = self._row(package)
+        if row is None:
+            return 0
+        with self._lock:
+            view = self._mapped(row)
+            return sum(view[row * self.days + lo:row * self.days + hi])
+
+    def totals(self, start: Optional[DateLike] = None, end: Optional[DateLike] = None) -> Dict[str, int]:
+        """Downloads of every package over the inclusive date range."""
+        lo, hi = self._columns(start, end)
+        rows = self._rows()
+        if not rows:
+            return {}
+        with self._lock:
+            view = self._mapped(max(rows.values()))
+            return {name: sum(view[row * self.days + lo:row * self.days + hi]) for name, row in rows.items()}
+
+    def daily_totals(self, start: Optional[DateLike] = None, end: Optional[DateLike] = None) -> array:
+        """Downloads of all packages together, per day of the inclusive date range."""
+        lo, hi = self._columns(start, end)
+        result = array("q", [0]) * (hi - lo)
+        rows = self._rows()
+        if not rows:
+            return result
+        with self._lock:
+            view = self._mapped(max(rows.values()))
+            for row in rows.values():
+                base = row * self.days
+                result = array("q", map(int.__add__, result, view[base + lo:base + hi]))
+        return result
+
+    def top(self, limit: int = 10, start: Optional[DateLike] = None, end: Optional[DateLike] = None) -> List[Tuple[str, int]]:
+        """Packages ranked by downloads over the inclusive date range."""
+        return sorted(self.totals(start, end).items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+    def flush(self) -> None:
+        """Write dirty pages of the mapping to disk."""
+        with self._lock:
+            if self._mmap is not None and not self.readonly:
+                self._mmap.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self.flush()
+            self._unmap()
+        self._index.close()
+
+    def __enter__(self) -> "DownloadMatrix":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
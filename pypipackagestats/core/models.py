@@ -1,6 +1,8 @@
+import threading
+from datetime import date
 from dataclasses import dataclass
-from typing import List, Dict, Any, Optional
-from pypipackagestats.core.constants import DATE_ISO_FORMAT_LENGTH
+from typing import List, Dict, Any, Callable, Optional, Tuple
+from pypipackagestats.core.constants import DATE_ISO_FORMAT_LENGTH, STATS_SECTIONS
 
 @dataclass(frozen=True)
 class ProjectMetadata:
@@ -35,16 +37,52 @@ class CategoryBreakdown:
     percentage: float
 
 @dataclass(frozen=True)
-class PackageStats:
-    package_info: PackageInfo
-    downloads: DownloadStats
+class WindowStats:
+    """Downloads and breakdowns over one analysis window (dates inclusive)."""
+
+    label: str
+    start: date
+    end: date
+    downloads: int
     python_versions: List[CategoryBreakdown]
     operating_systems: List[CategoryBreakdown]
-    
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dict for JSON."""
         return {
-            "package": {
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+            "downloads": self.downloads,
+            "python_versions": [
+                {"version": pv.category, "downloads": pv.downloads, "percentage": pv.percentage}
+                for pv in self.python_versions
+            ],
+            "operating_systems": [
+                {"os": os_stat.category, "downloads": os_stat.downloads, "percentage": os_stat.percentage}
+                for os_stat in self.operating_systems
+            ],
+        }
+
+@dataclass(frozen=True)
+class PackageStats:
+    """Statistics for a package; sections that were not requested are None."""
+
+    package_info: Optional[PackageInfo] = None
+    downloads: Optional[DownloadStats] = None
+    python_versions: Optional[List[CategoryBreakdown]] = None
+    operating_systems: Optional[List[CategoryBreakdown]] = None
+    windows: Optional[Dict[str, WindowStats]] = None  # Window label → stats, if windows were requested
+
+    @property
+    def loaded_sections(self) -> Tuple[str, ...]:
+        """Names of the sections that were loaded."""
+        return tuple(section for section in STATS_SECTIONS if getattr(self, section) is not None)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dict for JSON (sections that were not loaded are omitted)."""
+        result: Dict[str, Any] = {}
+        if self.package_info is not None:
+            result["package"] = {
                 "name": self.package_info.name,
                 "version": self.package_info.version,
                 "upload_time": self.package_info.upload_time[:DATE_ISO_FORMAT_LENGTH] if self.package_info.upload_time else None,
@@ -53,19 +91,122 @@ class PackageStats:
                 "license": self.package_info.license,
                 "home_page": self.package_info.home_page,
                 "pypi_url": self.package_info.pypi_url,
-            },
-            "downloads": {
+            }
+        if self.downloads is not None:
+            result["downloads"] = {
                 "last_day": self.downloads.last_day,
                 "last_week": self.downloads.last_week,
                 "last_month": self.downloads.last_month,
                 "last_180d": self.downloads.last_180d,
-            },
-            "python_versions": [
+            }
+        if self.python_versions is not None:
+            result["python_versions"] = [
                 {"version": pv.category, "downloads": pv.downloads, "percentage": pv.percentage}
                 for pv in self.python_versions
-            ],
-            "operating_systems": [
+            ]
+        if self.operating_systems is not None:
+            result["operating_systems"] = [
                 {"os": os_stat.category, "downloads": os_stat.downloads, "percentage": os_stat.percentage}
                 for os_stat in self.operating_systems
-            ],
-        }
+            ]
+        if self.windows is not None:
+            result["windows"] = {label: window.to_dict() for label, window in self.windows.items()}
+        return result
+
+class _LazySection:
+    """Read-only attribute of LazyPackageStats that loads its section on first access."""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: Optional["LazyPackageStats"], owner: type) -> Any:
+        if instance is None:
+            return self
+        return instance._load(self.name)
+
+    def __set__(self, instance: "LazyPackageStats", value: Any) -> None:
+        raise AttributeError(f"can't set attribute '{self.name}'")
+
+
+class LazyPackageStats:
+    """PackageStats whose sections are fetched and processed on first access.
+
+    Each section is loaded at most once, even when several threads access it
+    at the same time, and then memoized. A section that fails to load raises
+    the same exceptions as get_package_stats and is retried on next access.
+    """
+
+    package_info = _LazySection()
+    downloads = _LazySection()
+    python_versions = _LazySection()
+    operating_systems = _LazySection()
+
+    def __init__(
+        self,
+        package_name: str,
+        loader: Callable[[Tuple[str, ...]], PackageStats],
+        loaded: Optional[PackageStats] = None,
+    ):
+        """
+        Args:
+            package_name: Normalized package name
+            loader: Called with section names; returns a PackageStats with those sections
+            loaded: Sections already loaded (sections that are None are loaded lazily)
+        """
+        self.package_name = package_name
+        self._loader = loader
+        self._locks = {section: threading.Lock() for section in STATS_SECTIONS}
+        self._values: Dict[str, Any] = {}
+        if loaded is not None:
+            for section in loaded.loaded_sections:
+                self._values[section] = getattr(loaded, section)
+
+    def _load_sections(self, sections: Tuple[str, ...]) -> None:
+        """Load the given sections not loaded yet with one loader call, under their locks."""
+        missing = [section for section in STATS_SECTIONS if section in sections and section not in self._values]
+        if not missing:
+            return
+        # Locks are always taken in STATS_SECTIONS order, so overlapping loads cannot deadlock
+        locks = [self._locks[section] for section in missing]
+        for lock in locks:
+            lock.acquire()
+        try:
+            missing = [section for section in missing if section not in self._values]
+            if missing:
+                stats = self._loader(tuple(missing))
+                for section in missing:
+                    self._values[section] = getattr(stats, section)
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+    def _load(self, section: str) -> Any:
+        """Return a section, loading it under its lock the first time."""
+        if section not in self._values:
+            self._load_sections((section,))
+        return self._values[section]
+
+    @property
+    def loaded_sections(self) -> Tuple[str, ...]:
+        """Names of the sections loaded so far."""
+        return tuple(section for section in STATS_SECTIONS if section in self._values)
+
+    def load(self) -> PackageStats:
+        """Load every remaining section (in one fetch round) and return them as a PackageStats."""
+        self._load_sections(STATS_SECTIONS)
+        return PackageStats(**{section: self._values[section] for section in STATS_SECTIONS})
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dict for JSON (loads every section)."""
+        return self.load().to_dict()
+
+    def __repr__(self) -> str:
+        return f"LazyPackageStats({self.package_name!r}, loaded={list(self.loaded_sections)})"
+
+@dataclass(frozen=True)
+class BatchResult:
+    results: Dict[str, PackageStats]
+    errors: Dict[str, Exception]
+
+    def __len__(self) -> int:
+        return len(self.results) + len(self.errors)
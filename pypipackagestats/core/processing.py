@@ -1,8 +1,16 @@
-from typing import List, Dict, Any, Optional
-from datetime import date, datetime, timedelta
+import re
+from typing import List, Dict, Any, Iterable, Union
+from datetime import date, timedelta
 from nestedutils import get_at
-from pypipackagestats.core.models import PackageInfo, DownloadStats, CategoryBreakdown
-from pypipackagestats.core.constants import TOP_PYTHON_VERSIONS_COUNT
+from pypipackagestats.core.models import PackageInfo, DownloadStats, CategoryBreakdown, WindowStats
+from pypipackagestats.core.timeseries import CategorySeries, AnalysisWindow
+from pypipackagestats.core.constants import TOP_PYTHON_VERSIONS_COUNT, TOP_OS_COUNT, PACKAGE_INFO_FIELDS, RELEASE_FILE_FIELDS
+
+_NAME_SEPARATOR_RUNS = re.compile(r"[-_.]+")
+
+def canonicalize_name(name: str) -> str:
+    """Normalize a package name per PEP 503 (``Django_Rest.Framework`` → ``django-rest-framework``)."""
+    return _NAME_SEPARATOR_RUNS.sub("-", name).lower()
 
 def get_upload_time(pkg_data: dict) -> str:
     """Extract upload_time from package data"""
@@ -20,14 +28,25 @@ def get_upload_time(pkg_data: dict) -> str:
     return ""
 
 
-def _parse_date_safe(date_str: str) -> Optional[date]:
-    """Parse ISO date string safely, returning None if invalid."""
-    if not date_str:
-        return None
-    try:
-        return datetime.strptime(date_str[:10], "%Y-%m-%d").date()
-    except (ValueError, TypeError):
-        return None
+def project_package_info(pkg_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a PyPI JSON document to the fields processing reads.
+
+    Keeps the used ``info`` fields and the first file of the current
+    release, dropping every other release (often megabytes for large packages).
+    """
+    info = get_at(pkg_data, "info", default={}) or {}
+    projected: Dict[str, Any] = {"info": {k: info[k] for k in PACKAGE_INFO_FIELDS if k in info}}
+
+    version = info.get("version")
+    if version:
+        first_file = get_at(pkg_data, ["releases", version, 0])
+        if isinstance(first_file, dict):
+            projected["releases"] = {
+                version: [{k: first_file[k] for k in RELEASE_FILE_FIELDS if k in first_file}]
+            }
+
+    return projected
+
 
 def process_package_info(data: Dict[str, Any]) -> PackageInfo:
     """Process package metadata."""
@@ -49,28 +68,20 @@ def process_package_info(data: Dict[str, Any]) -> PackageInfo:
         upload_time=get_upload_time(data),
     )
 
-def process_download_stats(recent: Dict[str, Any], overall: List[Dict[str, Any]]) -> DownloadStats:
+def _as_series(data: Union[List[Dict[str, Any]], CategorySeries]) -> CategorySeries:
+    return data if isinstance(data, CategorySeries) else CategorySeries.from_rows(data)
+
+def process_download_stats(recent: Dict[str, Any], overall: Union[List[Dict[str, Any]], CategorySeries]) -> DownloadStats:
     """Process download stats."""
     return DownloadStats(
         last_day=get_at(recent, "last_day", default=0),
         last_week=get_at(recent, "last_week", default=0),
         last_month=get_at(recent, "last_month", default=0),
-        last_180d=sum(get_at(d, "downloads", default=0) for d in overall),
+        last_180d=_as_series(overall).total(include_undated=True),
     )
 
-def process_category_breakdown(data: List[Dict[str, Any]], limit: int = TOP_PYTHON_VERSIONS_COUNT) -> List[CategoryBreakdown]:
-    """Process category breakdown."""
-    # Last 30 days only
-    cutoff = date.today() - timedelta(days=30)
-    recent = [d for d in data if (parsed_date := _parse_date_safe(d.get("date", ""))) is not None and parsed_date >= cutoff]
-    
-    # Aggregate by category
-    totals = {}
-    for row in recent:
-        cat = row.get("category", "unknown")
-        downloads = row.get("downloads", 0)
-        totals[cat] = totals.get(cat, 0) + downloads
-    
+def _top_categories(totals: Dict[str, int], limit: int) -> List[CategoryBreakdown]:
+    """Top categories by downloads, with their share of all downloads."""
     total = sum(totals.values())
     top = sorted(totals.items(), key=lambda x: -x[1])[:limit]
     
@@ -82,3 +93,28 @@ def process_category_breakdown(data: List[Dict[str, Any]], limit: int = TOP_PYTH
         )
         for cat, downloads in top
     ]
+
+def process_category_breakdown(data: Union[List[Dict[str, Any]], CategorySeries], limit: int = TOP_PYTHON_VERSIONS_COUNT) -> List[CategoryBreakdown]:
+    """Process category breakdown."""
+    # Last 30 days only
+    cutoff = date.today() - timedelta(days=30)
+    return _top_categories(_as_series(data).category_totals(start=cutoff), limit)
+
+def process_window_stats(
+    windows: Iterable[AnalysisWindow],
+    overall: CategorySeries,
+    python: CategorySeries,
+    system: CategorySeries,
+) -> Dict[str, WindowStats]:
+    """Totals and Python/OS breakdowns of each window, all from the same series."""
+    return {
+        window.label: WindowStats(
+            label=window.label,
+            start=window.start,
+            end=window.end,
+            downloads=overall.total(window.start, window.end),
+            python_versions=_top_categories(python.category_totals(window.start, window.end), TOP_PYTHON_VERSIONS_COUNT),
+            operating_systems=_top_categories(system.category_totals(window.start, window.end), TOP_OS_COUNT),
+        )
+        for window in windows
+    }
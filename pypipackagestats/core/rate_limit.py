@@ -0,0 +1,304 @@
+"""Per-host token-bucket rate limiting."""
+
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Any, Optional, Iterable, Iterator, Union
+from urllib.parse import urlparse
+import diskcache
+from pypipackagestats.core.cache import get_cache_dir
+from pypipackagestats.core.constants import (
+    RATE_LIMIT_MIN_INTERVAL,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_HOSTS,
+    ADAPTIVE_RATE_MIN,
+    ADAPTIVE_RATE_DECREASE_FACTOR,
+    ADAPTIVE_RATE_INCREASE_STEP,
+    ADAPTIVE_RATE_SUCCESS_THRESHOLD,
+)
+
+_rate_limiter_instance: Optional["RateLimiter"] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    """Token bucket implemented as a reservation schedule (GCRA).
+
+    ``reserve()`` books the next free slot and returns how long the caller
+    must wait for it. The bucket is never locked while the caller waits.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.rate = rate
+        self.burst = burst
+        self._tat = 0.0  # Theoretical arrival time of the next request
+
+    @property
+    def interval(self) -> float:
+        """Seconds between requests at the sustained rate."""
+        return 1.0 / self.rate
+
+    def reserve(self, now: float) -> float:
+        """Reserve one token; return seconds to wait before using it."""
+        tat = max(self._tat, now) + self.interval
+        self._tat = tat
+        return max(0.0, tat - self.burst * self.interval - now)
+
+
+class RateLimiter:
+    """Thread-safe per-host token-bucket limiter with wait-time metrics.
+
+    Hosts without a configured bucket are never delayed and never touch
+    the lock.
+    """
+
+    def __init__(
+        self,
+        rate: float = 1.0 / RATE_LIMIT_MIN_INTERVAL,
+        burst: int = RATE_LIMIT_BURST,
+        hosts: Iterable[str] = RATE_LIMIT_HOSTS,
+    ):
+        """
+        Args:
+            rate: Sustained requests per second for each limited host
+            burst: Requests allowed back-to-back before throttling starts
+            hosts: Hosts to rate limit
+        """
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, TokenBucket] = {host: TokenBucket(rate, burst) for host in hosts}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    def _clock(self) -> float:
+        """Time source for bucket schedules."""
+        return time.monotonic()
+
+    @contextmanager
+    def _locked_bucket(self, host: str) -> Iterator[TokenBucket]:
+        """Hold the lock and yield the host's bucket for reading/updating."""
+        with self._lock:
+            yield self._buckets[host]
+
+    def configure(self, host: str, rate: float, burst: int = RATE_LIMIT_BURST) -> None:
+        """Set (or add) the rate and burst for a host."""
+        bucket = TokenBucket(rate, burst)
+        with self._lock:
+            old = self._buckets.get(host)
+            if old is not None:
+                bucket._tat = old._tat
+            self._buckets[host] = bucket
+
+    def reserve(self, url: str) -> float:
+        """Reserve a request slot for the URL's host; return seconds to wait."""
+        host = urlparse(url).hostname
+        if host not in self._buckets:
+            return 0.0
+        with self._locked_bucket(host) as bucket:
+            delay = bucket.reserve(self._clock())
+            stats = self._host_stats(host)
+            stats["requests"] += 1
+            if delay > 0:
+                stats["delayed"] += 1
+                stats["total_wait"] += delay
+                stats["max_wait"] = max(stats["max_wait"], delay)
+        return delay
+
+    def feedback(self, url: str, status_code: int, retry_after: Optional[str] = None) -> None:
+        """Report the status of a response from the URL's host (no-op for fixed limits)."""
+
+    def _host_stats(self, host: str) -> Dict[str, Any]:
+        """Metrics dict for a host; caller must hold the lock."""
+        return self._stats.setdefault(
+            host, {"requests": 0, "delayed": 0, "total_wait": 0.0, "max_wait": 0.0, "rate_limited": 0}
+        )
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-host request counts, wait times (seconds) and current rate."""
+        with self._lock:
+            return {
+                host: dict(
+                    stats,
+                    avg_wait=stats["total_wait"] / stats["requests"] if stats["requests"] else 0.0,
+                    rate=self._buckets[host].rate,
+                )
+                for host, stats in self._stats.items()
+            }
+
+    def reset(self) -> None:
+        """Forget reservations and metrics."""
+        with self._lock:
+            for bucket in self._buckets.values():
+                bucket._tat = 0.0
+            self._stats.clear()
+
+
+class AdaptiveRateLimiter(RateLimiter):
+    """RateLimiter that adapts each host's rate to 429 feedback (AIMD).
+
+    A 429 multiplies the host's rate by ``decrease_factor`` (at most once per
+    current interval, so a burst of 429s counts once) and pauses the host
+    for ``Retry-After`` seconds. Every ``success_threshold`` consecutive
+    successes add ``increase_step`` requests/second, up to the configured rate.
+    """
+
+    def __init__(
+        self,
+        rate: float = 1.0 / RATE_LIMIT_MIN_INTERVAL,
+        burst: int = RATE_LIMIT_BURST,
+        hosts: Iterable[str] = RATE_LIMIT_HOSTS,
+        min_rate: float = ADAPTIVE_RATE_MIN,
+        decrease_factor: float = ADAPTIVE_RATE_DECREASE_FACTOR,
+        increase_step: float = ADAPTIVE_RATE_INCREASE_STEP,
+        success_threshold: int = ADAPTIVE_RATE_SUCCESS_THRESHOLD,
+    ):
+        """
+        Args:
+            rate: Maximum (and starting) requests per second for each limited host
+            burst: Requests allowed back-to-back before throttling starts
+            hosts: Hosts to rate limit
+            min_rate: Floor the rate never drops below
+            decrease_factor: Multiplier applied to the rate on a 429
+            increase_step: Requests/second added after a run of successes
+            success_threshold: Consecutive successes needed before increasing
+        """
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be between 0 and 1")
+        super().__init__(rate, burst, hosts)
+        self.min_rate = min_rate
+        self.decrease_factor = decrease_factor
+        self.increase_step = increase_step
+        self.success_threshold = success_threshold
+        self._max_rates: Dict[str, float] = {host: rate for host in self._buckets}
+        self._successes: Dict[str, int] = {}
+        self._last_decrease: Dict[str, float] = {}
+
+    def configure(self, host: str, rate: float, burst: int = RATE_LIMIT_BURST) -> None:
+        """Set (or add) the maximum rate and burst for a host."""
+        super().configure(host, rate, burst)
+        with self._lock:
+            self._max_rates[host] = rate
+
+    def feedback(self, url: str, status_code: int, retry_after: Optional[str] = None) -> None:
+        """Lower the host's rate on 429, raise it after a run of successes."""
+        host = urlparse(url).hostname
+        if host not in self._buckets:
+            return
+        if status_code == 429:
+            with self._locked_bucket(host) as bucket:
+                now = self._clock()
+                self._successes[host] = 0
+                self._host_stats(host)["rate_limited"] += 1
+                if now - self._last_decrease.get(host, float("-inf")) >= bucket.interval:
+                    bucket.rate = max(self.min_rate, bucket.rate * self.decrease_factor)
+                    self._last_decrease[host] = now
+                pause = parse_retry_after(retry_after)
+                if pause:
+                    # Nobody gets a slot before the server's Retry-After has passed
+                    bucket._tat = max(bucket._tat, now + pause + (bucket.burst - 1) * bucket.interval)
+        elif status_code < 500:
+            with self._lock:
+                successes = self._successes.get(host, 0) + 1
+                probe = successes >= self.success_threshold
+                self._successes[host] = 0 if probe else successes
+            if probe:
+                with self._locked_bucket(host) as bucket:
+                    bucket.rate = min(self._max_rates[host], bucket.rate + self.increase_step)
+
+    def reset(self) -> None:
+        """Forget reservations, metrics and learned rates."""
+        super().reset()
+        with self._lock:
+            for host, bucket in self._buckets.items():
+                bucket.rate = self._max_rates[host]
+            self._successes.clear()
+            self._last_decrease.clear()
+
+
+class SharedRateLimiter(AdaptiveRateLimiter):
+    """AdaptiveRateLimiter whose per-host budget is shared between processes.
+
+    Each host's schedule and learned rate live in a diskcache store next to
+    the API cache and are updated inside a diskcache transaction (an SQLite
+    write lock), so every process using the same directory - gunicorn
+    workers, cron jobs - draws from one budget. Schedules use wall-clock time
+    since monotonic clocks are not comparable across processes.
+    """
+
+    def __init__(self, directory: Optional[Union[str, Path]] = None, **kwargs: Any):
+        """
+        Args:
+            directory: Directory for the shared state (default: ``rate_limit``
+                       inside the cache directory)
+            **kwargs: Passed to AdaptiveRateLimiter
+        """
+        super().__init__(**kwargs)
+        self.directory = Path(directory) if directory else get_cache_dir() / "rate_limit"
+        self._store = diskcache.Cache(str(self.directory))
+
+    def _clock(self) -> float:
+        return time.time()
+
+    @contextmanager
+    def _locked_bucket(self, host: str) -> Iterator[TokenBucket]:
+        with self._lock, self._store.transact():
+            bucket = self._buckets[host]
+            state = self._store.get(host)
+            if state is not None:
+                bucket._tat, bucket.rate = state
+            yield bucket
+            self._store.set(host, (bucket._tat, bucket.rate))
+
+    def configure(self, host: str, rate: float, burst: int = RATE_LIMIT_BURST) -> None:
+        """Set (or add) the maximum rate and burst for a host, for all processes."""
+        super().configure(host, rate, burst)
+        with self._locked_bucket(host) as bucket:
+            bucket.rate = rate
+
+    def reset(self) -> None:
+        """Forget reservations, metrics and learned rates in all processes."""
+        super().reset()
+        self._store.clear()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get the process-wide rate limiter - thread-safe singleton with lazy initialization."""
+    global _rate_limiter_instance
+    if _rate_limiter_instance is None:
+        with _rate_limiter_lock:
+            if _rate_limiter_instance is None:
+                _rate_limiter_instance = AdaptiveRateLimiter()
+    return _rate_limiter_instance
+
+
+def set_rate_limiter(limiter: RateLimiter) -> None:
+    """Replace the process-wide rate limiter used by clients created afterwards.
+
+    Example:
+        >>> set_rate_limiter(SharedRateLimiter())  # share the budget across workers
+    """
+    global _rate_limiter_instance
+    with _rate_limiter_lock:
+        _rate_limiter_instance = limiter
@@ -0,0 +1,70 @@
+"""Incremental parsing of PyPI JSON documents."""
+
+from typing import Dict, Any, BinaryIO, Optional
+
+try:
+    import ijson
+except ImportError:  # Optional: fall back to response.json()
+    ijson = None
+
+
+def streaming_available() -> bool:
+    """Whether the optional ijson dependency is installed."""
+    return ijson is not None
+
+
+def stream_package_info(fp: BinaryIO) -> Dict[str, Any]:
+    """Parse a PyPI JSON document from a binary stream, keeping only what processing needs.
+
+    Builds ``info`` and the ``releases`` entry of ``info.version`` while the
+    body is read, skipping everything else without materializing it, and
+    stops reading once both are found. PyPI emits ``info`` first; if it does
+    not, all releases are kept so the current one can still be found.
+
+    Returns:
+        Dict with ``info`` and (if present) ``releases`` for the current version,
+        suitable for process_package_info / project_package_info.
+    """
+    if ijson is None:
+        raise RuntimeError("Streaming parse requires ijson. Install with: pip install pypi-package-stats[stream]")
+
+    result: Dict[str, Any] = {}
+    releases: Dict[str, Any] = {}
+    version: Optional[str] = None
+    release_key: Optional[str] = None  # Last key seen directly under "releases"
+    builder = None
+    target = None
+
+    for prefix, event, value in ijson.parse(fp):
+        if builder is not None:
+            builder.event(event, value)
+            if prefix == target and event in ("end_map", "end_array"):
+                if target == "info":
+                    result["info"] = builder.value
+                    version = (builder.value or {}).get("version")
+                else:
+                    releases[release_key] = builder.value
+                builder = target = None
+                if "info" in result and version in releases:
+                    break  # Nothing else is needed; leave the rest of the body unread
+            continue
+
+        if prefix == "releases" and event == "map_key":
+            release_key = value
+        elif prefix == "info" and event == "start_map":
+            builder, target = ijson.ObjectBuilder(), prefix
+            builder.event(event, value)
+        elif (
+            event == "start_array"
+            and release_key is not None
+            and prefix == f"releases.{release_key}"
+            and (version is None or release_key == version)
+        ):
+            builder, target = ijson.ObjectBuilder(), prefix
+            builder.event(event, value)
+
+    if version in releases:
+        result["releases"] = {version: releases[version]}
+    elif releases and "info" not in result:
+        result["releases"] = releases
+    return result
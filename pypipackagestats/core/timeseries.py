@@ -0,0 +1,269 @@
+"""Columnar representation of pypistats daily series."""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+DateLike = Union[date, int]  # date or proleptic Gregorian ordinal
+
+
+def _parse_ordinal(date_str: Any) -> Optional[int]:
+    """Parse an ISO date string into a day ordinal, None if invalid."""
+    if not date_str:
+        return None
+    try:
+        return datetime.strptime(date_str[:10], "%Y-%m-%d").toordinal()
+    except (ValueError, TypeError):
+        return None
+
+
+def to_ordinal(day: DateLike) -> int:
+    """Day ordinal of a date (ordinals are returned unchanged)."""
+    return day if isinstance(day, int) else day.toordinal()
+
+
+def _prefix_sums(column: array) -> array:
+    """Cumulative sums with a leading 0 (``len(column) + 1`` entries)."""
+    return array("q", accumulate(column, initial=0))
+
+
+class AnalysisWindow(NamedTuple):
+    """Inclusive date range that totals and breakdowns are computed over."""
+
+    label: str
+    start: date
+    end: date
+
+
+WindowSpec = Union[int, Tuple[Union[date, str], Union[date, str]]]
+
+
+def _as_date(value: Union[date, str]) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    ordinal = _parse_ordinal(value)
+    if ordinal is None:
+        raise ValueError(f"Invalid date '{value}', expected YYYY-MM-DD")
+    return date.fromordinal(ordinal)
+
+
+def resolve_window(spec: WindowSpec, today: Optional[date] = None) -> AnalysisWindow:
+    """Turn a window spec into an AnalysisWindow.
+
+    ``N`` (days) covers the N days before ``today`` (the same cutoff as the
+    default 30-day breakdowns); a ``(start, end)`` pair of dates or ISO
+    strings is used as given.
+
+    Raises:
+        ValueError: If the number of days is not positive or the range is invalid
+    """
+    if isinstance(spec, bool) or not isinstance(spec, (int, tuple, list)):
+        raise ValueError(f"Invalid window {spec!r}: expected a number of days or a (start, end) pair")
+    if isinstance(spec, int):
+        if spec < 1:
+            raise ValueError(f"Window must be at least 1 day, got {spec}")
+        today = today or date.today()
+        return AnalysisWindow(f"{spec}d", today - timedelta(days=spec), today)
+    if len(spec) != 2:
+        raise ValueError(f"Invalid window {spec!r}: expected a (start, end) pair")
+    start, end = _as_date(spec[0]), _as_date(spec[1])
+    if start > end:
+        raise ValueError(f"Window start {start} is after its end {end}")
+    return AnalysisWindow(f"{start.isoformat()}..{end.isoformat()}", start, end)
+
+
+class CategorySeries:
+    """Daily downloads per category of one pypistats response, stored by column.
+
+    Rows are pivoted onto a sorted day axis once: ``days`` holds date
+    ordinals, ``categories`` the interned category names (a category's code
+    is its index), and ``columns[code]`` the downloads of that category per
+    day. Each date string is parsed once, however many categories share it.
+
+    Prefix sums over the columns are built at the same time, so the total of
+    any date range costs two lookups once its bounds are found by bisection.
+
+    Rows whose date does not parse are kept off the day axis; their
+    downloads are counted in ``undated[code]``.
+    """
+
+    __slots__ = ("days", "categories", "columns", "undated", "_cumulative", "_cumulative_total", "_cumulative_rows")
+
+    def __init__(self, days: array, categories: List[str], columns: List[array], undated: array, row_counts: List[array]):
+        self.days = days
+        self.categories = categories
+        self.columns = columns
+        self.undated = undated
+        # Prefix sums: entry i covers days[:i], so a window lo:hi is cumulative[hi] - cumulative[lo]
+        self._cumulative = [_prefix_sums(column) for column in columns]
+        self._cumulative_total = _prefix_sums(array("q", map(sum, zip(*columns))) if columns else array("q", [0]) * len(days))
+        # Rows per day and category, to tell "no rows in window" apart from "0 downloads"
+        self._cumulative_rows = [_prefix_sums(counts) for counts in row_counts]
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]]) -> "CategorySeries":
+        """Build the columns from pypistats ``data`` rows (date, category, downloads)."""
+        ordinals: Dict[Any, Optional[int]] = {}
+        codes: Dict[str, int] = {}
+        dated = []
+        undated_rows = []
+        for row in rows:
+            date_str = row.get("date", "")
+            ordinal = ordinals.get(date_str, -1)
+            if ordinal == -1:
+                ordinal = ordinals[date_str] = _parse_ordinal(date_str)
+            code = codes.setdefault(row.get("category", "unknown"), len(codes))
+            downloads = row.get("downloads") or 0
+            if ordinal is None:
+                undated_rows.append((code, downloads))
+            else:
+                dated.append((ordinal, code, downloads))
+
+        days = array("l", sorted({ordinal for ordinal, _, _ in dated}))
+        day_index = {ordinal: i for i, ordinal in enumerate(days)}
+        columns = [array("q", [0]) * len(days) for _ in codes]
+        row_counts = [array("l", [0]) * len(days) for _ in codes]
+        for ordinal, code, downloads in dated:
+            i = day_index[ordinal]
+            columns[code][i] += downloads
+            row_counts[code][i] += 1
+        undated = array("q", [0]) * len(codes)
+        for code, downloads in undated_rows:
+            undated[code] += downloads
+
+        return cls(days, list(codes), columns, undated, row_counts)
+
+    def _bounds(self, start: Optional[DateLike], end: Optional[DateLike]) -> Tuple[int, int]:
+        """Day-axis index range ``lo:hi`` of an inclusive date range (None = unbounded)."""
+        lo = bisect_left(self.days, to_ordinal(start)) if start is not None else 0
+        hi = bisect_right(self.days, to_ordinal(end)) if end is not None else len(self.days)
+        return lo, max(lo, hi)
+
+    def category_totals(self, start: Optional[DateLike] = None, end: Optional[DateLike] = None) -> Dict[str, int]:
+        """Downloads per category in the inclusive date range, for categories with rows in it."""
+        lo, hi = self._bounds(start, end)
+        return {
+            category: self._cumulative[code][hi] - self._cumulative[code][lo]
+            for code, category in enumerate(self.categories)
+            if self._cumulative_rows[code][hi] > self._cumulative_rows[code][lo]
+        }
+
+    def total(
+        self, start: Optional[DateLike] = None, end: Optional[DateLike] = None, include_undated: bool = False
+    ) -> int:
+        """Downloads of all categories in the inclusive date range."""
+        lo, hi = self._bounds(start, end)
+        total = self._cumulative_total[hi] - self._cumulative_total[lo]
+        return total + sum(self.undated) if include_undated else total
+
+    def day_totals(self) -> array:
+        """Downloads of all categories per day of the axis."""
+        cumulative = self._cumulative_total
+        return array("q", (cumulative[i + 1] - cumulative[i] for i in range(len(self.days))))
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+
+class RollupIndex:
+    """Precomputed cumulative index of one daily download series.
+
+    Days are laid out densely from the first to the last day of the series
+    (missing days count as 0), so the cumulative sum of any day is found by
+    offset: downloads between any two dates cost two lookups, and rolling
+    sums/averages for every day are a single pass. Weekly (Monday-based) and
+    calendar-month rollups are computed from the same cumulative array when
+    the index is built.
+    """
+
+    __slots__ = ("_start", "_cumulative", "weekly", "monthly")
+
+    def __init__(self, start: DateLike, daily: Iterable[int]):
+        """
+        Args:
+            start: Date of the first value in ``daily``
+            daily: Downloads per consecutive day from ``start``
+        """
+        self._start = to_ordinal(start)
+        self._cumulative = _prefix_sums(array("q", daily))
+        # (first day of period, downloads) for each Monday-based week and calendar month
+        start = self.start
+        self.weekly = self._rollup(start - timedelta(days=start.weekday()), lambda week: week + timedelta(days=7))
+        self.monthly = self._rollup(start.replace(day=1), lambda month: (month + timedelta(days=32)).replace(day=1))
+
+    @classmethod
+    def from_series(cls, series: CategorySeries) -> "RollupIndex":
+        """Index the all-category daily totals of a CategorySeries."""
+        if not len(series):
+            return cls(date.today(), [])
+        first = series.days[0]
+        daily = array("q", [0]) * (series.days[-1] - first + 1)
+        for ordinal, downloads in zip(series.days, series.day_totals()):
+            daily[ordinal - first] = downloads
+        return cls(first, daily)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]]) -> "RollupIndex":
+        """Index pypistats ``data`` rows, e.g. the output of ``PyPIClient.get_overall_stats``."""
+        return cls.from_series(CategorySeries.from_rows(rows))
+
+    def __len__(self) -> int:
+        return len(self._cumulative) - 1
+
+    @property
+    def start(self) -> date:
+        """First indexed day."""
+        return date.fromordinal(self._start)
+
+    @property
+    def end(self) -> date:
+        """Last indexed day (the day before ``start`` if the index is empty)."""
+        return date.fromordinal(self._start + len(self) - 1)
+
+    def _offset(self, day: DateLike) -> int:
+        """Cumulative-array offset of the start of ``day``, clamped to the index."""
+        return min(max(to_ordinal(day) - self._start, 0), len(self))
+
+    def range_sum(self, start: Optional[DateLike] = None, end: Optional[DateLike] = None) -> int:
+        """Downloads between two dates, inclusive (None = unbounded), in O(1)."""
+        lo = self._offset(start) if start is not None else 0
+        hi = self._offset(to_ordinal(end) + 1) if end is not None else len(self)
+        return self._cumulative[hi] - self._cumulative[lo] if hi > lo else 0
+
+    def day(self, day: DateLike) -> int:
+        """Downloads on one day."""
+        return self.range_sum(day, day)
+
+    def rolling_sum(self, days: int = 7) -> List[Tuple[date, int]]:
+        """Downloads in the ``days`` days ending on each indexed day."""
+        if days < 1:
+            raise ValueError(f"Rolling window must be at least 1 day, got {days}")
+        cumulative = self._cumulative
+        return [
+            (date.fromordinal(self._start + i), cumulative[i + 1] - cumulative[max(i + 1 - days, 0)])
+            for i in range(len(self))
+        ]
+
+    def rolling_mean(self, days: int = 7) -> List[Tuple[date, float]]:
+        """Average daily downloads over the ``days`` days ending on each indexed day.
+
+        The first days of the index average over the days indexed so far.
+        """
+        return [
+            (day, total / min(days, i + 1))
+            for i, (day, total) in enumerate(self.rolling_sum(days))
+        ]
+
+    def _rollup(self, first: date, advance: Callable[[date], date]) -> List[Tuple[date, int]]:
+        """Downloads per period from ``first``, keyed by each period's first day (edges are partial)."""
+        rollup = []
+        period = first
+        while len(self) and period <= self.end:
+            following = advance(period)
+            rollup.append((period, self.range_sum(period, following.toordinal() - 1)))
+            period = following
+        return rollup
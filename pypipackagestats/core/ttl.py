@@ -0,0 +1,90 @@
+"""Cache TTL policies per API endpoint."""
+
+import random
+from abc import ABC, abstractmethod
+import time
+from dataclasses import dataclass
+from typing import Dict, Mapping, Optional, Union
+from pypipackagestats.core.constants import (
+    DEFAULT_CACHE_TTL,
+    CACHE_TTL_JITTER,
+    CACHE_ENDPOINTS,
+    PYPISTATS_ROLLOVER_HOUR_UTC,
+)
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+class TTLPolicy(ABC):
+    """How long a freshly fetched response stays cached.
+
+    Subclasses implement ``base_ttl``. Their ``jitter`` field adds up to that
+    many seconds at random to every TTL, so keys fetched together do not all
+    expire (and get refetched) together.
+    """
+
+    jitter: float = 0.0
+
+    @abstractmethod
+    def base_ttl(self, now: float) -> float:
+        """TTL in seconds before jitter for a response fetched at ``now``."""
+
+    def ttl(self, now: Optional[float] = None) -> float:
+        """TTL in seconds (with jitter) for a response fetched at ``now`` (default: current time)."""
+        now = time.time() if now is None else now
+        return self.base_ttl(now) + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+
+
+@dataclass(frozen=True)
+class FixedTTL(TTLPolicy):
+    """Cache for a fixed number of seconds."""
+
+    seconds: float = DEFAULT_CACHE_TTL
+    jitter: float = 0.0
+
+    def base_ttl(self, now: float) -> float:
+        return self.seconds
+
+
+@dataclass(frozen=True)
+class DailyRolloverTTL(TTLPolicy):
+    """Cache until the next daily data rollover (pypistats.org loads each day once).
+
+    The entry expires at ``hour`` UTC, plus jitter, so it is refetched right
+    after new data is available instead of once per fixed TTL.
+    """
+
+    hour: float = PYPISTATS_ROLLOVER_HOUR_UTC
+    jitter: float = 0.0
+
+    def base_ttl(self, now: float) -> float:
+        until = (self.hour * 3600 - now) % SECONDS_PER_DAY
+        return until or SECONDS_PER_DAY
+
+
+# Endpoint name → policy used by get_package_stats when no cache_ttl is given.
+# PyPI metadata changes when a release is published; pypistats data once a day.
+DEFAULT_TTL_POLICIES: Dict[str, TTLPolicy] = {
+    "package_info": FixedTTL(DEFAULT_CACHE_TTL, jitter=CACHE_TTL_JITTER),
+    "recent": DailyRolloverTTL(jitter=CACHE_TTL_JITTER),
+    "overall": DailyRolloverTTL(jitter=CACHE_TTL_JITTER),
+    "python_minor": DailyRolloverTTL(jitter=CACHE_TTL_JITTER),
+    "system": DailyRolloverTTL(jitter=CACHE_TTL_JITTER),
+}
+
+
+def resolve_ttl_policies(
+    cache_ttl: float,
+    ttl_policies: Optional[Mapping[str, Union[int, float, TTLPolicy]]] = None,
+) -> Dict[str, TTLPolicy]:
+    """Policy for every endpoint: ``ttl_policies`` entries (seconds or a policy), else ``cache_ttl``.
+
+    Raises:
+        ValueError: If ttl_policies names an unknown endpoint
+    """
+    policies: Dict[str, TTLPolicy] = {endpoint: FixedTTL(cache_ttl) for endpoint in CACHE_ENDPOINTS}
+    for endpoint, policy in (ttl_policies or {}).items():
+        if endpoint not in policies:
+            raise ValueError(f"Unknown endpoint '{endpoint}'. Available: {', '.join(CACHE_ENDPOINTS)}")
+        policies[endpoint] = policy if isinstance(policy, TTLPolicy) else FixedTTL(policy)
+    return policies
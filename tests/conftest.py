@@ -5,7 +5,7 @@ import pytest
 from unittest.mock import Mock, MagicMock
 import responses
 from pypipackagestats.core.cache import clear_cache, get_cache
-from pypipackagestats.core.client import PyPIClient
+from pypipackagestats.core.rate_limit import get_rate_limiter
 
 
 @pytest.fixture(autouse=True)
@@ -18,10 +18,10 @@ def clear_cache_before_test():
 
 @pytest.fixture(autouse=True)
 def reset_rate_limit_state():
-    """Reset class-level rate limit state between tests."""
-    PyPIClient._host_last_request_time = {}
+    """Reset shared rate limiter state between tests."""
+    get_rate_limiter().reset()
     yield
-    PyPIClient._host_last_request_time = {}
+    get_rate_limiter().reset()
 
 
 @pytest.fixture
@@ -81,3 +81,25 @@ def mock_session(mock_response):
     session = MagicMock()
     session.get.return_value = mock_response
     return session
+
+
+@pytest.fixture
+def register_package(
+    package_info_data,
+    recent_stats_data,
+    overall_stats_data,
+    python_stats_data,
+    system_stats_data,
+):
+    """Return a helper that registers all five endpoints of a package with `responses`."""
+    from pypipackagestats.core.constants import PYPI_API, STATS_API
+
+    def _register(package: str) -> None:
+        stats_url = STATS_API.format(pkg=package)
+        responses.add(responses.GET, PYPI_API.format(pkg=package), json=package_info_data, status=200)
+        responses.add(responses.GET, stats_url + "recent", json=recent_stats_data, status=200)
+        responses.add(responses.GET, stats_url + "overall?mirrors=false", json=overall_stats_data, status=200)
+        responses.add(responses.GET, stats_url + "python_minor", json=python_stats_data, status=200)
+        responses.add(responses.GET, stats_url + "system", json=system_stats_data, status=200)
+
+    return _register
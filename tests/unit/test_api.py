@@ -0,0 +1,407 @@
+"""Tests for the public API."""
+import threading
+import time
+from datetime import date
+import pytest
+import responses
+from pypipackagestats import api
+from pypipackagestats.api import get_package_stats, get_many_package_stats, iter_package_stats
+from pypipackagestats.core.models import PackageStats, LazyPackageStats, BatchResult, DownloadStats
+from pypipackagestats.core.exceptions import PackageNotFoundError, APIError
+from pypipackagestats.core.constants import PYPI_API
+
+
+class TestGetPackageStats:
+    """Test get_package_stats function."""
+
+    @responses.activate
+    def test_returns_package_stats(self, register_package):
+        """Test a successful lookup returns PackageStats."""
+        register_package("test-package")
+        stats = get_package_stats("test-package", no_cache=True)
+        assert isinstance(stats, PackageStats)
+        assert stats.downloads.last_month > 0
+
+    @responses.activate
+    def test_parallel_and_sequential_fetch_match(self, register_package):
+        """Test parallel endpoint fetching gives the same result as sequential."""
+        register_package("test-package")
+        parallel = get_package_stats("test-package", no_cache=True, parallel=True)
+        sequential = get_package_stats("test-package", no_cache=True, parallel=False)
+        assert parallel == sequential
+        assert len(responses.calls) == 10
+
+    @responses.activate
+    def test_parallel_fetch_keeps_error_mapping(self, register_package):
+        """Test errors raised in worker threads are still mapped."""
+        responses.add(responses.GET, PYPI_API.format(pkg="missing-pkg"), status=404)
+        with pytest.raises(PackageNotFoundError):
+            get_package_stats("missing-pkg", no_cache=True, parallel=True)
+
+    @responses.activate
+    def test_pypi_fetch_not_queued_behind_throttled_fetches(self, register_package, mocker):
+        """Test concurrent callers' pypi.org requests start at once while pypistats.org is throttled."""
+        from pypipackagestats.core.rate_limit import RateLimiter
+
+        mocker.patch("pypipackagestats.core.client.get_rate_limiter", return_value=RateLimiter(rate=20))
+        names = [f"pkg{i}" for i in range(12)]
+        for name in names:
+            register_package(name)
+        started = []
+        original_get = api.PyPIClient.get_package_info
+
+        def get_package_info(self, package):
+            started.append(time.monotonic())
+            return original_get(self, package)
+
+        mocker.patch.object(api.PyPIClient, "get_package_info", get_package_info)
+        start = time.monotonic()
+        threads = [
+            threading.Thread(target=get_package_stats, args=(name,), kwargs={"no_cache": True}) for name in names
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(started) == len(names)
+        assert max(started) - start < 0.5  # 48 throttled requests take 2.4 s
+
+    @responses.activate
+    def test_parallel_fetch_stops_after_pypi_error(self, register_package):
+        """Test no throttled pypistats.org requests are sent once the pypi.org fetch has failed."""
+        responses.add(responses.GET, PYPI_API.format(pkg="removed-pkg"), status=404)
+        register_package("removed-pkg")  # pypistats.org still has data for removed packages
+        with pytest.raises(PackageNotFoundError):
+            get_package_stats("removed-pkg", no_cache=True, parallel=True)
+        calls = len(responses.calls)
+        time.sleep(0.5)
+        assert len(responses.calls) == calls
+        # At most the first, unthrottled pypistats.org request overlaps with the pypi.org one
+        assert calls <= 2
+
+    def test_empty_name_raises_value_error(self):
+        """Test empty package name raises ValueError."""
+        with pytest.raises(ValueError):
+            get_package_stats("   ")
+
+    @responses.activate
+    def test_404_raises_package_not_found(self):
+        """Test 404 from PyPI maps to PackageNotFoundError."""
+        responses.add(responses.GET, PYPI_API.format(pkg="missing-pkg"), status=404)
+        with pytest.raises(PackageNotFoundError):
+            get_package_stats("missing-pkg", no_cache=True)
+
+
+class TestSections:
+    """Test loading only some PackageStats sections."""
+
+    @responses.activate
+    def test_downloads_only_fetches_two_endpoints(self, register_package):
+        """Test only the pypistats recent/overall endpoints are requested."""
+        register_package("test-package")
+        stats = get_package_stats("test-package", no_cache=True, sections=["downloads"])
+
+        assert stats.downloads.last_month > 0
+        assert stats.package_info is None
+        assert stats.python_versions is None
+        assert stats.loaded_sections == ("downloads",)
+        assert list(stats.to_dict()) == ["downloads"]
+        urls = [call.request.url for call in responses.calls if "test-package" in call.request.url]
+        assert sorted(url.rsplit("/", 1)[-1] for url in urls) == [
+            "overall?mirrors=false", "recent",
+        ]
+
+    @responses.activate
+    def test_single_section_as_string(self, register_package):
+        """Test a single section name may be passed as a string."""
+        register_package("test-package")
+        stats = get_package_stats("test-package", no_cache=True, sections="package_info")
+        assert stats.loaded_sections == ("package_info",)
+        assert [call.request.url for call in responses.calls if "test-package" in call.request.url] == [
+            PYPI_API.format(pkg="test-package")
+        ]
+
+    @responses.activate
+    def test_all_sections_by_default(self, register_package):
+        """Test every section is loaded when sections is omitted."""
+        register_package("test-package")
+        stats = get_package_stats("test-package", no_cache=True)
+        assert stats.loaded_sections == ("package_info", "downloads", "python_versions", "operating_systems")
+
+    def test_unknown_section(self):
+        """Test unknown section names raise ValueError."""
+        with pytest.raises(ValueError, match="Unknown sections"):
+            get_package_stats("test-package", sections=["downloads", "stars"])
+
+    @responses.activate
+    def test_batch_sections(self, register_package):
+        """Test sections apply to every package of a batch."""
+        register_package("pkg-a")
+        register_package("pkg-b")
+        batch = get_many_package_stats(["pkg-a", "pkg-b"], no_cache=True, sections=["python_versions"])
+        assert all(stats.loaded_sections == ("python_versions",) for stats in batch.results.values())
+        assert len([call for call in responses.calls if "/pkg-" in call.request.url]) == 2
+
+
+class TestAnalysisWindows:
+    """Test download totals and breakdowns over configurable windows."""
+
+    def package_calls(self):
+        return [call.request.url for call in responses.calls if "test-package" in call.request.url]
+
+    @responses.activate
+    def test_windows_computed_without_extra_requests(self, register_package):
+        """Test several windows reuse the five endpoint responses."""
+        register_package("test-package")
+        stats = get_package_stats(
+            "test-package",
+            no_cache=True,
+            windows=[7, 30, ("2024-01-02", "2024-01-03"), (date(2024, 1, 1), date(2024, 1, 31))],
+        )
+
+        assert len(self.package_calls()) == 5
+        assert list(stats.windows) == ["7d", "30d", "2024-01-02..2024-01-03", "2024-01-01..2024-01-31"]
+        early = stats.windows["2024-01-02..2024-01-03"]
+        assert early.downloads == 1300
+        assert early.python_versions == []
+        january = stats.windows["2024-01-01..2024-01-31"]
+        assert january.downloads == 1800
+        assert [pv.category for pv in january.python_versions][:2] == ["3.11", "3.10"]
+        assert january.operating_systems[0].category == "linux"
+        assert stats.windows["7d"].downloads == 0
+        assert stats.to_dict()["windows"]["2024-01-01..2024-01-31"]["start"] == "2024-01-01"
+
+    @responses.activate
+    def test_windows_fetch_series_with_sections(self, register_package):
+        """Test windows fetch the series they need even when sections omit them."""
+        register_package("test-package")
+        stats = get_package_stats("test-package", no_cache=True, sections=["package_info"], windows=[30])
+
+        assert stats.loaded_sections == ("package_info",)
+        assert "30d" in stats.windows
+        assert sorted(url.rsplit("/", 1)[-1] for url in self.package_calls()) == [
+            "json", "overall?mirrors=false", "python_minor", "system",
+        ]
+
+    @responses.activate
+    def test_no_windows_by_default(self, register_package):
+        """Test windows stay None unless requested."""
+        register_package("test-package")
+        stats = get_package_stats("test-package", no_cache=True)
+        assert stats.windows is None
+        assert "windows" not in stats.to_dict()
+
+    @pytest.mark.parametrize("windows", [[0], [-7], [("2024-02-01", "2024-01-01")], [("bad", "2024-01-01")], 30])
+    def test_invalid_windows(self, windows):
+        """Test invalid window specs raise ValueError before any request."""
+        with pytest.raises(ValueError):
+            get_package_stats("test-package", windows=windows)
+
+    def test_windows_not_lazy(self):
+        """Test windows cannot be combined with lazy loading."""
+        with pytest.raises(ValueError, match="lazy"):
+            get_package_stats("test-package", windows=[7], lazy=True)
+
+
+class TestLazyPackageStats:
+    """Test lazily loaded package stats."""
+
+    def package_calls(self):
+        return [call.request.url for call in responses.calls if "test-package" in call.request.url]
+
+    @responses.activate
+    def test_sections_fetched_on_first_access(self, register_package):
+        """Test nothing is fetched until a section is accessed, then only its endpoints."""
+        register_package("test-package")
+        stats = get_package_stats("test-package", lazy=True)
+        assert isinstance(stats, LazyPackageStats)
+        assert self.package_calls() == []
+
+        assert stats.downloads.last_month > 0
+        assert stats.downloads is stats.downloads  # memoized
+        assert len(self.package_calls()) == 2
+        assert stats.loaded_sections == ("downloads",)
+
+    @responses.activate
+    def test_to_dict_loads_every_section(self, register_package):
+        """Test to_dict matches the eager result."""
+        register_package("test-package")
+        eager = get_package_stats("test-package", no_cache=True)
+        lazy = get_package_stats("test-package", no_cache=True, lazy=True)
+        assert lazy.to_dict() == eager.to_dict()
+        assert lazy.load() == eager
+        assert len(self.package_calls()) == 10
+
+    @responses.activate
+    def test_load_fetches_missing_sections_together(self, register_package, mocker):
+        """Test load() fetches every section not loaded yet in one round."""
+        register_package("test-package")
+        fetch = mocker.spy(api, "_fetch_package_stats")
+        stats = get_package_stats("test-package", lazy=True)
+        stats.downloads
+        stats.load()
+        assert [call.args[3] for call in fetch.call_args_list] == [
+            ("downloads",),
+            ("package_info", "python_versions", "operating_systems"),
+        ]
+        stats.to_dict()
+        assert fetch.call_count == 2
+
+    @responses.activate
+    def test_requested_sections_preloaded(self, register_package):
+        """Test sections passed with lazy=True are fetched up front."""
+        register_package("test-package")
+        stats = get_package_stats("test-package", lazy=True, sections=["package_info"])
+        assert stats.loaded_sections == ("package_info",)
+        assert len(self.package_calls()) == 1
+
+    def test_concurrent_access_loads_once(self):
+        """Test threads racing on a section share one load."""
+        calls = []
+
+        def loader(sections):
+            calls.append(sections)
+            time.sleep(0.05)
+            return PackageStats(downloads=DownloadStats(last_month=1))
+
+        stats = LazyPackageStats("pkg", loader)
+        threads = [threading.Thread(target=lambda: stats.downloads) for _ in range(10)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert calls == [("downloads",)]
+
+    def test_failed_load_is_retried(self):
+        """Test a section that failed to load is loaded again on next access."""
+        outcomes = iter([APIError("down"), PackageStats(downloads=DownloadStats(last_month=1))])
+
+        def loader(sections):
+            outcome = next(outcomes)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        stats = LazyPackageStats("pkg", loader)
+        with pytest.raises(APIError):
+            stats.downloads
+        assert stats.downloads.last_month == 1
+
+    def test_sections_read_only(self):
+        """Test sections cannot be assigned."""
+        stats = LazyPackageStats("pkg", lambda sections: PackageStats())
+        with pytest.raises(AttributeError):
+            stats.downloads = DownloadStats()
+
+
+class TestGetManyPackageStats:
+    """Test get_many_package_stats function."""
+
+    @responses.activate
+    def test_collects_results_and_errors(self, register_package):
+        """Test successes and failures are reported per package."""
+        register_package("pkg-a")
+        register_package("pkg-b")
+        responses.add(responses.GET, PYPI_API.format(pkg="missing-pkg"), status=404)
+
+        batch = get_many_package_stats(["pkg-a", "pkg-b", "missing-pkg", ""], no_cache=True)
+
+        assert isinstance(batch, BatchResult)
+        assert set(batch.results) == {"pkg-a", "pkg-b"}
+        assert isinstance(batch.errors["missing-pkg"], PackageNotFoundError)
+        assert isinstance(batch.errors[""], ValueError)
+        assert len(batch) == 4
+
+    @responses.activate
+    def test_duplicate_names_fetched_once(self, register_package):
+        """Test names that normalize to the same package are fetched once."""
+        register_package("pkg-a")
+        batch = get_many_package_stats(["pkg-a", " PKG-A "], max_workers=2, no_cache=True)
+        assert list(batch.results) == ["pkg-a"]
+        assert len(responses.calls) == 5
+
+    @responses.activate
+    def test_pep503_name_variants_fetched_once(self, register_package):
+        """Test spellings of the same project share one fetch and one cache entry."""
+        register_package("django-rest-framework")
+        names = ["Django_Rest_Framework", "django-rest-framework", "django.rest.framework"]
+        batch = get_many_package_stats(names, max_workers=3)
+        assert list(batch.results) == ["django-rest-framework"]
+        assert len(responses.calls) == 5
+
+        get_package_stats("DJANGO__REST--FRAMEWORK")
+        assert len(responses.calls) == 5
+
+    def test_invalid_max_workers(self):
+        """Test max_workers below 1 raises ValueError."""
+        with pytest.raises(ValueError):
+            get_many_package_stats(["pkg-a"], max_workers=0)
+
+
+class TestIterPackageStats:
+    """Test the streaming iter_package_stats generator."""
+
+    @responses.activate
+    def test_yields_results_and_errors(self, register_package):
+        """Test every name yields one result or error."""
+        register_package("pkg-a")
+        register_package("pkg-b")
+        responses.add(responses.GET, PYPI_API.format(pkg="missing-pkg"), status=404)
+
+        results = dict(iter_package_stats(iter(["PKG_A", "pkg-b", "missing-pkg", ""]), no_cache=True))
+
+        assert isinstance(results["pkg-a"], PackageStats)
+        assert isinstance(results["pkg-b"], PackageStats)
+        assert isinstance(results["missing-pkg"], PackageNotFoundError)
+        assert isinstance(results[""], ValueError)
+
+    def test_bounded_in_flight(self, mocker):
+        """Test names are read only as slots free up."""
+        consumed = []
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def names():
+            for i in range(20):
+                consumed.append(i)
+                yield f"pkg-{i}"
+
+        def fake_fetch(client, name, *args):
+            with lock:
+                active.append(name)
+                peak.append(len(active))
+            time.sleep(0.01)
+            with lock:
+                active.remove(name)
+            return PackageStats()
+
+        mocker.patch("pypipackagestats.api._fetch_package_stats", side_effect=fake_fetch)
+        stream = iter_package_stats(names(), max_workers=3)
+
+        assert consumed == []  # nothing is read before iteration starts
+        next(stream)
+        assert len(consumed) <= 4
+        assert len(list(stream)) == 19
+        assert max(peak) <= 3
+
+    def test_close_stops_reading(self, mocker):
+        """Test closing the generator early stops consuming the input."""
+        mocker.patch("pypipackagestats.api._fetch_package_stats", return_value=PackageStats())
+        consumed = []
+
+        def names():
+            for i in range(1000):
+                consumed.append(i)
+                yield f"pkg-{i}"
+
+        stream = iter_package_stats(names(), max_workers=2)
+        next(stream)
+        stream.close()
+        assert len(consumed) <= 3
+
+    def test_invalid_max_workers(self):
+        """Test max_workers is validated when the generator is created."""
+        with pytest.raises(ValueError):
+            iter_package_stats(["pkg-a"], max_workers=0)
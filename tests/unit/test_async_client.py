@@ -0,0 +1,331 @@
+"""Tests for AsyncPyPIClient and the async API."""
+import asyncio
+import time
+import pytest
+from unittest.mock import AsyncMock, patch
+
+httpx = pytest.importorskip("httpx")
+
+from pypipackagestats.api import async_get_package_stats, async_get_many
+from pypipackagestats.core.async_client import AsyncPyPIClient
+from pypipackagestats.core.models import PackageStats
+from pypipackagestats.core.exceptions import PackageNotFoundError
+from pypipackagestats.core.constants import PYPI_API, STATS_API, REQUEST_RETRY_MAX_TRIES
+
+
+def make_transport(routes, calls=None):
+    """Build an httpx.MockTransport serving {url: (status, json_body)}."""
+    def handler(request):
+        url = str(request.url)
+        if calls is not None:
+            calls.append(url)
+        status, body = routes.get(url, (404, {}))
+        return httpx.Response(status, json=body)
+    return httpx.MockTransport(handler)
+
+
+@pytest.fixture
+def package_routes(package_info_data, recent_stats_data, overall_stats_data, python_stats_data, system_stats_data):
+    """Routes for all five endpoints of test-package."""
+    stats_url = STATS_API.format(pkg="test-package")
+    return {
+        PYPI_API.format(pkg="test-package"): (200, package_info_data),
+        stats_url + "recent": (200, recent_stats_data),
+        stats_url + "overall?mirrors=false": (200, overall_stats_data),
+        stats_url + "python_minor": (200, python_stats_data),
+        stats_url + "system": (200, system_stats_data),
+    }
+
+
+class TestAsyncPyPIClient:
+    """Test AsyncPyPIClient."""
+
+    def test_invalid_max_concurrency(self):
+        """Test max_concurrency below 1 raises ValueError."""
+        with pytest.raises(ValueError):
+            AsyncPyPIClient(max_concurrency=0)
+
+    def test_expired_entry_revalidated(self):
+        """Test a 304 to a conditional request reuses the cached body."""
+        from pypipackagestats.core.cache import cache_get_entry, cache_set_entry
+
+        url = "https://pypi.org/pypi/test/json"
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            if len(requests) == 1:
+                return httpx.Response(200, json={"a": 1}, headers={"ETag": '"v1"'})
+            return httpx.Response(304)
+
+        async def run():
+            async with AsyncPyPIClient(transport=httpx.MockTransport(handler)) as client:
+                await client._cached_get(url)
+                key = f"url:{url}"
+                cache_set_entry(key, cache_get_entry(key)._replace(expires_at=0))
+                return await client._cached_get(url)
+
+        assert asyncio.run(run()) == {"a": 1}
+        assert requests[1].headers["If-None-Match"] == '"v1"'
+        assert cache_get_entry(f"url:{url}").fresh
+
+    def test_fresh_disk_entry_behind_stale_l1(self):
+        """Test a stale L1 entry does not hide a fresh entry another process wrote to disk."""
+        from pypipackagestats.core.cache import CacheEntry, cache_get_entry, cache_set_entry, get_cache
+
+        url = "https://pypi.org/pypi/test/json"
+        key = f"url:{url}"
+        calls = []
+
+        async def run():
+            async with AsyncPyPIClient(transport=make_transport({url: (200, {"v": 1})}, calls)) as client:
+                await client._cached_get(url)
+                cache_set_entry(key, cache_get_entry(key)._replace(expires_at=time.time() - 1))
+                get_cache().set(key, CacheEntry({"v": 2}, time.time() + 3600)._asdict())
+                return await client._cached_get(url)
+
+        assert asyncio.run(run()) == {"v": 2}
+        assert len(calls) == 1
+
+    def test_stale_if_error(self):
+        """Test a stale entry is served when the refresh fails with a 5xx."""
+        from pypipackagestats.core.cache import cache_get_entry, cache_set_entry
+
+        url = "https://pypi.org/pypi/test/json"
+        statuses = iter([200, 503, 503, 503, 503, 503])
+
+        def handler(request):
+            return httpx.Response(next(statuses), json={"a": 1})
+
+        async def run():
+            transport = httpx.MockTransport(handler)
+            async with AsyncPyPIClient(transport=transport, stale_if_error=600) as client:
+                await client._cached_get(url)
+                key = f"url:{url}"
+                cache_set_entry(key, cache_get_entry(key)._replace(expires_at=time.time() - 10))
+                return await client._cached_get(url)
+
+        with patch("pypipackagestats.core.async_client.asyncio.sleep", new=AsyncMock()):
+            assert asyncio.run(run()) == {"a": 1}
+
+    def test_stale_while_revalidate(self):
+        """Test a stale entry is returned at once and refreshed before the client closes."""
+        from pypipackagestats.core.cache import cache_get_entry, cache_set_entry
+
+        url = "https://pypi.org/pypi/test/json"
+        versions = iter([1, 2])
+
+        def handler(request):
+            return httpx.Response(200, json={"v": next(versions)})
+
+        async def run():
+            transport = httpx.MockTransport(handler)
+            async with AsyncPyPIClient(transport=transport, stale_while_revalidate=60) as client:
+                await client._cached_get(url)
+                key = f"url:{url}"
+                cache_set_entry(key, cache_get_entry(key)._replace(expires_at=time.time() - 10))
+                return await client._cached_get(url)
+
+        assert asyncio.run(run()) == {"v": 1}
+        assert cache_get_entry(f"url:{url}").data == {"v": 2}
+
+    def test_404_cached(self):
+        """Test a repeated lookup of a missing URL raises without a request."""
+        url = "https://pypi.org/pypi/missing/json"
+        calls = []
+
+        async def run():
+            async with AsyncPyPIClient(transport=make_transport({}, calls)) as client:
+                for _ in range(2):
+                    with pytest.raises(httpx.HTTPStatusError) as exc_info:
+                        await client._cached_get(url)
+                    assert exc_info.value.response.status_code == 404
+
+        asyncio.run(run())
+        assert len(calls) == 1
+
+    def test_cached_get_uses_disk_cache(self):
+        """Test a second lookup is served from the shared disk cache."""
+        url = "https://pypi.org/pypi/test/json"
+        calls = []
+
+        async def run():
+            async with AsyncPyPIClient(transport=make_transport({url: (200, {"a": 1})}, calls)) as client:
+                first = await client._cached_get(url)
+                second = await client._cached_get(url)
+            return first, second
+
+        assert asyncio.run(run()) == ({"a": 1}, {"a": 1})
+        assert len(calls) == 1
+
+    def test_concurrent_misses_coalesced(self):
+        """Test concurrent lookups of one cold URL issue a single request."""
+        url = "https://pypi.org/pypi/test/json"
+        calls = []
+
+        async def run():
+            async with AsyncPyPIClient(transport=make_transport({url: (200, {"a": 1})}, calls)) as client:
+                return await asyncio.gather(*(client._cached_get(url) for _ in range(5)))
+
+        assert asyncio.run(run()) == [{"a": 1}] * 5
+        assert len(calls) == 1
+
+    def test_retries_retryable_status(self):
+        """Test 503 responses are retried before succeeding."""
+        url = "https://pypi.org/pypi/test/json"
+        attempts = []
+
+        def handler(request):
+            attempts.append(request)
+            if len(attempts) < 3:
+                return httpx.Response(503)
+            return httpx.Response(200, json={"ok": True})
+
+        async def run():
+            async with AsyncPyPIClient(cache_ttl=0, transport=httpx.MockTransport(handler)) as client:
+                with patch("pypipackagestats.core.async_client.asyncio.sleep", new=AsyncMock()):
+                    return await client._cached_get(url)
+
+        assert asyncio.run(run()) == {"ok": True}
+        assert len(attempts) == 3
+
+    def test_transport_errors_retried(self):
+        """Test connect/read errors are retried with the status retry budget."""
+        url = "https://pypi.org/pypi/test/json"
+        attempts = []
+
+        def handler(request):
+            attempts.append(request)
+            if len(attempts) == 1:
+                raise httpx.ConnectError("connection refused", request=request)
+            if len(attempts) == 2:
+                raise httpx.ReadTimeout("timed out", request=request)
+            return httpx.Response(200, json={"ok": True})
+
+        async def run():
+            async with AsyncPyPIClient(cache_ttl=0, transport=httpx.MockTransport(handler)) as client:
+                return await client._cached_get(url)
+
+        with patch("pypipackagestats.core.async_client.asyncio.sleep", new=AsyncMock()) as sleep:
+            assert asyncio.run(run()) == {"ok": True}
+        assert len(attempts) == 3
+        assert [c.args[0] for c in sleep.await_args_list] == [1, 2]
+
+    def test_transport_errors_exhaust_retries(self):
+        """Test a persistent transport error is raised after the last retry."""
+        url = "https://pypi.org/pypi/test/json"
+        attempts = []
+
+        def handler(request):
+            attempts.append(request)
+            raise httpx.ConnectError("connection refused", request=request)
+
+        async def run():
+            async with AsyncPyPIClient(cache_ttl=0, transport=httpx.MockTransport(handler)) as client:
+                await client._cached_get(url)
+
+        with patch("pypipackagestats.core.async_client.asyncio.sleep", new=AsyncMock()):
+            with pytest.raises(httpx.ConnectError):
+                asyncio.run(run())
+        assert len(attempts) == REQUEST_RETRY_MAX_TRIES + 1
+
+    def test_throttle_wait_does_not_hold_concurrency_slot(self):
+        """Test a pypistats.org request waiting for its throttle slot does not block pypi.org."""
+        pypi_url = "https://pypi.org/pypi/test/json"
+        stats_url = STATS_API.format(pkg="test") + "recent"
+        routes = {pypi_url: (200, {"a": 1}), stats_url: (200, {"data": {}})}
+
+        async def run():
+            release = asyncio.Event()
+            client = AsyncPyPIClient(max_concurrency=1, cache_ttl=0, transport=make_transport(routes))
+
+            async def throttle(url, queue=True):
+                if "pypistats" in url:
+                    await release.wait()
+
+            client._throttle = throttle
+            async with client:
+                stats = asyncio.ensure_future(client._cached_get(stats_url))
+                await asyncio.sleep(0)
+                # Would deadlock if the throttled request held the only slot
+                assert await asyncio.wait_for(client._cached_get(pypi_url), timeout=2) == {"a": 1}
+                release.set()
+                await stats
+
+        asyncio.run(run())
+
+    def test_cancelled_batch_releases_rate_limit_schedule(self):
+        """Test queued requests do not book slots ahead, so cancelling them frees the host."""
+        from pypipackagestats.core.rate_limit import RateLimiter
+
+        limiter = RateLimiter(rate=4, burst=1)
+        urls = [STATS_API.format(pkg=f"pkg{i}") + "recent" for i in range(40)]
+        routes = {url: (200, {"data": {}}) for url in urls}
+
+        async def run():
+            async with AsyncPyPIClient(cache_ttl=0, rate_limiter=limiter, transport=make_transport(routes)) as client:
+                tasks = [asyncio.ensure_future(client._cached_get(url)) for url in urls]
+                await asyncio.sleep(0.1)
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+        asyncio.run(run())
+        # Without the per-host gate all 40 slots (10 s) would already be booked
+        assert limiter.reserve(urls[0]) <= 0.5
+        assert limiter.get_stats()["pypistats.org"]["requests"] <= 3
+
+    def test_throttle_spaces_pypistats_requests(self):
+        """Test the async throttle reserves spaced slots for pypistats.org."""
+        client = AsyncPyPIClient()
+        url = "https://pypistats.org/api/packages/test/recent"
+        sleeps = []
+
+        async def fake_sleep(delay):
+            sleeps.append(delay)
+
+        async def run():
+            with patch("pypipackagestats.core.async_client.asyncio.sleep", new=fake_sleep):
+                await asyncio.gather(*(client._throttle(url) for _ in range(3)))
+
+        asyncio.run(run())
+        assert len(sleeps) == 2
+        assert sleeps[1] > sleeps[0]
+
+
+class TestAsyncAPI:
+    """Test async_get_package_stats and async_get_many."""
+
+    def test_async_get_package_stats(self, package_routes):
+        """Test a successful async lookup returns PackageStats."""
+        async def run():
+            async with AsyncPyPIClient(cache_ttl=0, transport=make_transport(package_routes)) as client:
+                return await async_get_package_stats("test-package", client=client)
+
+        stats = asyncio.run(run())
+        assert isinstance(stats, PackageStats)
+        assert stats.downloads.last_month > 0
+
+    def test_async_get_package_stats_not_found(self):
+        """Test 404 maps to PackageNotFoundError."""
+        async def run():
+            async with AsyncPyPIClient(cache_ttl=0, transport=make_transport({})) as client:
+                return await async_get_package_stats("missing-pkg", client=client)
+
+        with pytest.raises(PackageNotFoundError):
+            asyncio.run(run())
+
+    def test_async_get_many(self, package_routes):
+        """Test batch results and errors on one event loop."""
+        transport = make_transport(package_routes)
+        original_init = AsyncPyPIClient.__init__
+
+        def init_with_transport(self, *args, **kwargs):
+            kwargs["transport"] = transport
+            original_init(self, *args, **kwargs)
+
+        with patch.object(AsyncPyPIClient, "__init__", init_with_transport):
+            batch = asyncio.run(async_get_many(["test-package", "missing-pkg"], no_cache=True))
+
+        assert set(batch.results) == {"test-package"}
+        assert isinstance(batch.errors["missing-pkg"], PackageNotFoundError)
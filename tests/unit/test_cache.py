@@ -1,13 +1,23 @@
 """Tests for cache functionality."""
 import threading
+import time
 import pytest
 from pathlib import Path
 from pypipackagestats.core.cache import (
     get_cache_dir,
     get_cache,
+    get_memory_cache,
+    cache_get,
+    cache_set,
     clear_cache,
     get_cache_info,
+    MemoryCache,
+    configure_cache,
+    CacheEntry,
+    cache_get_entry,
+    cache_set_entry,
 )
+from pypipackagestats.core.codecs import Codec, CodecDisk, RawJSON, get_codec
 
 
 class TestCacheDirectory:
@@ -156,3 +166,182 @@ class TestCacheThreadSafety:
         
         assert len(results) == 10
         assert all(f"value_{i}" in results for i in range(10))
+
+
+class TestMemoryCache:
+    """Test the in-process L1 LRU cache."""
+
+    def test_get_and_set(self):
+        """Test stored values are returned."""
+        cache = MemoryCache(1024)
+        cache.set("key", {"a": 1})
+        assert cache.get("key") == {"a": 1}
+        assert cache.get("missing") is None
+
+    def test_expired_entries_removed(self):
+        """Test entries past their expiry time are dropped."""
+        cache = MemoryCache(1024)
+        cache.set("key", "value", expire_time=time.time() - 1)
+        assert cache.get("key") is None
+        assert cache.current_bytes == 0
+
+    def test_lru_eviction_by_bytes(self):
+        """Test least recently used entries are evicted to respect max_bytes."""
+        cache = MemoryCache(250)
+        cache.set("a", b"x" * 100)
+        cache.set("b", b"x" * 100)
+        cache.get("a")  # "b" is now least recently used
+        cache.set("c", b"x" * 100)
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.current_bytes == 200
+
+    def test_oversized_entry_not_stored(self):
+        """Test a value larger than the whole cache is skipped."""
+        cache = MemoryCache(10)
+        cache.set("big", b"x" * 100)
+        assert len(cache) == 0
+
+
+class TestTieredCache:
+    """Test cache_get/cache_set over L1 and L2."""
+
+    def test_hit_counts_in_cache_info(self):
+        """Test L1 and L2 hits and misses are reported."""
+        cache_set("key", {"a": 1}, expire=60)
+        assert cache_get("key") == {"a": 1}  # L1 hit
+        get_memory_cache().clear()
+        assert cache_get("key") == {"a": 1}  # L2 hit, promoted
+        assert cache_get("key") == {"a": 1}  # L1 hit
+        assert cache_get("missing") is None
+
+        info = get_cache_info()
+        assert info["l1_hits"] == 2
+        assert info["l2_hits"] == 1
+        assert info["misses"] == 1
+        assert info["memory_entries"] == 1
+        assert info["memory_bytes"] > 0
+
+    def test_promoted_entry_keeps_disk_expiry(self):
+        """Test an L2 hit promoted to L1 expires with the disk entry."""
+        cache_set("key", "value", expire=1)
+        get_memory_cache().clear()
+        assert cache_get("key") == "value"
+        time.sleep(1.1)
+        assert cache_get("key") is None
+
+    def test_read_disk_false_skips_l2(self):
+        """Test read_disk=False only consults L1."""
+        get_cache().set("key", "value")
+        assert cache_get("key", read_disk=False) is None
+        assert cache_get("key") == "value"
+
+    def test_clear_cache_clears_memory(self):
+        """Test clear_cache empties L1 as well as L2."""
+        cache_set("key", "value", expire=60)
+        clear_cache()
+        assert len(get_memory_cache()) == 0
+        assert cache_get("key") is None
+
+
+class TestCacheEntries:
+    """Test response entries with logical expiry and validators."""
+
+    def test_expired_entry_kept_for_revalidation(self):
+        """Test an entry past its TTL is still returned, marked stale."""
+        cache_set_entry("key", CacheEntry({"a": 1}, time.time() - 1, etag='"v1"'))
+        get_memory_cache().clear()
+        entry = cache_get_entry("key")
+        assert entry.data == {"a": 1}
+        assert not entry.fresh
+        assert entry.conditional_headers() == {"If-None-Match": '"v1"'}
+
+    def test_entry_from_response_headers(self):
+        """Test validators are taken from response headers."""
+        headers = {"ETag": '"v1"', "Last-Modified": "Wed, 15 Jan 2025 00:00:00 GMT"}
+        entry = CacheEntry.from_response({"a": 1}, 60, headers)
+        assert entry.fresh
+        assert entry.conditional_headers() == {
+            "If-None-Match": '"v1"',
+            "If-Modified-Since": "Wed, 15 Jan 2025 00:00:00 GMT",
+        }
+
+    def test_revalidated_keeps_validators(self):
+        """Test a 304 without validators keeps the old ones and restarts the TTL."""
+        entry = CacheEntry({"a": 1}, time.time() - 1, etag='"v1"').revalidated(60, {})
+        assert entry.fresh
+        assert entry.etag == '"v1"'
+
+    def test_plain_values_never_stale(self):
+        """Test values stored with cache_set read back as fresh entries."""
+        cache_set("key", {"a": 1}, expire=60)
+        assert cache_get_entry("key").fresh
+
+
+class TestCacheCodecs:
+    """Test storing JSON through a compression codec instead of pickle."""
+
+    @pytest.fixture
+    def zlib_cache(self):
+        """Switch the disk cache to the zlib codec for one test."""
+        configure_cache("zlib")
+        clear_cache()
+        yield get_cache()
+        clear_cache()
+        configure_cache(None)
+
+    def test_round_trip_through_disk(self, zlib_cache):
+        """Test values written with a codec decode on read."""
+        cache_set("key", {"a": [1, 2, 3]}, expire=60)
+        get_memory_cache().clear()
+        assert cache_get("key") == {"a": [1, 2, 3]}
+        assert get_cache_info()["codec"] == "zlib"
+        assert get_cache_info()["cache_dir"].endswith("api_cache_zlib")
+
+    def test_raw_body_stored_without_reserialization(self, zlib_cache):
+        """Test a raw response body is compressed and decoded on read."""
+        body = b'{"data": {"last_day": 1}}'
+        cache_set("key", {"data": {"last_day": 1}}, expire=60, raw=body)
+        get_memory_cache().clear()
+        assert cache_get("key") == {"data": {"last_day": 1}}
+
+    def test_raw_body_spliced_into_entry(self, zlib_cache):
+        """Test a raw body stored with an entry decodes to the envelope."""
+        entry = CacheEntry({"data": {"last_day": 1}}, time.time() + 60, etag='"abc"')
+        cache_set_entry("key", entry, raw=b'{"data": {"last_day": 1}}')
+        get_memory_cache().clear()
+        assert cache_get_entry("key") == entry
+
+    def test_codec_disk_compresses(self, tmp_path):
+        """Test CodecDisk stores compressed bytes."""
+        disk = CodecDisk(str(tmp_path), codec="zlib", min_file_size=2 ** 15)
+        size, mode, filename, value = disk.store(RawJSON(b'{"x": "' + b"a" * 10000 + b'"}'), False)
+        assert len(value) < 1000
+
+    def test_unknown_codec(self):
+        """Test unknown codec names raise ValueError."""
+        with pytest.raises(ValueError):
+            get_codec("brotli-9000")
+
+    def test_custom_codec(self, tmp_path):
+        """Test a Codec subclass can be plugged in."""
+        class ReverseCodec(Codec):
+            name = "reverse"
+
+            def encode(self, data):
+                return data[::-1]
+
+            def decode(self, data):
+                return data[::-1]
+
+        get_codec(ReverseCodec())
+        cache = diskcache_with_codec(tmp_path, "reverse")
+        cache.set("key", {"a": 1})
+        assert cache.get("key") == {"a": 1}
+        cache.close()
+
+
+def diskcache_with_codec(directory, codec):
+    """Standalone diskcache.Cache using CodecDisk."""
+    import diskcache
+    return diskcache.Cache(str(directory), disk=CodecDisk, disk_codec=codec)
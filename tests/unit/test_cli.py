@@ -0,0 +1,111 @@
+"""Tests for the CLI batch command."""
+import json
+import pytest
+import responses
+
+typer_testing = pytest.importorskip("typer.testing")
+
+from pypipackagestats.cli._app import app
+from pypipackagestats.core.constants import PYPI_API
+
+
+@pytest.fixture
+def runner():
+    return typer_testing.CliRunner()
+
+
+def records(output):
+    return [json.loads(line) for line in output.splitlines()]
+
+
+class TestBatchCommand:
+    """Test the NDJSON batch command."""
+
+    @responses.activate
+    def test_one_line_per_package(self, runner, register_package, tmp_path):
+        """Test success and error records are written one per line."""
+        register_package("pkg-a")
+        responses.add(responses.GET, PYPI_API.format(pkg="missing-pkg"), status=404)
+        names = tmp_path / "names.txt"
+        names.write_text("pkg-a\nmissing-pkg\n")
+
+        result = runner.invoke(app, ["batch", str(names), "--no-cache"])
+
+        by_name = {record["package"]: record for record in records(result.stdout)}
+        assert len(result.stdout.splitlines()) == 2
+        assert by_name["pkg-a"]["stats"]["downloads"]["last_month"] > 0
+        assert by_name["missing-pkg"]["error_type"] == "PackageNotFoundError"
+        assert "not found" in by_name["missing-pkg"]["error"]
+        assert result.exit_code == 1
+
+    @responses.activate
+    def test_skips_comments_and_blank_lines(self, runner, register_package, tmp_path):
+        """Test # comments (whole-line or trailing) and blank lines are not package names."""
+        register_package("pkg-a")
+        register_package("pkg-b")
+        names = tmp_path / "names.txt"
+        names.write_text("# watchlist\n\npkg-a  # first\n   \npkg-b\n")
+
+        result = runner.invoke(app, ["batch", str(names), "--no-cache"])
+
+        assert result.exit_code == 0
+        assert sorted(record["package"] for record in records(result.stdout)) == ["pkg-a", "pkg-b"]
+
+    @pytest.mark.parametrize("args", [["batch"], ["batch", "-"]])
+    @responses.activate
+    def test_reads_stdin(self, runner, register_package, args):
+        """Test names are read from stdin without a file argument or with '-'."""
+        register_package("pkg-a")
+
+        result = runner.invoke(app, args + ["--no-cache"], input="pkg-a\n")
+
+        assert result.exit_code == 0
+        assert [record["package"] for record in records(result.stdout)] == ["pkg-a"]
+
+    @responses.activate
+    def test_fail_fast(self, runner, register_package):
+        """Test --fail-fast stops after the first failure."""
+        responses.add(responses.GET, PYPI_API.format(pkg="missing-pkg"), status=404)
+        register_package("pkg-a")
+
+        result = runner.invoke(
+            app, ["batch", "--fail-fast", "--concurrency", "1", "--no-cache"], input="missing-pkg\npkg-a\n"
+        )
+
+        assert result.exit_code == 1
+        assert [record["package"] for record in records(result.stdout)] == ["missing-pkg"]
+        assert "stopped early" in result.stderr
+        assert not [call for call in responses.calls if "pkg-a" in call.request.url]
+
+    @responses.activate
+    def test_summary_on_stderr(self, runner, register_package):
+        """Test the summary counts go to stderr, keeping stdout pure NDJSON."""
+        register_package("pkg-a")
+        register_package("pkg-b")
+        responses.add(responses.GET, PYPI_API.format(pkg="missing-pkg"), status=404)
+
+        result = runner.invoke(app, ["batch", "--no-cache"], input="pkg-a\npkg-b\nmissing-pkg\n")
+
+        assert "3 packages" in result.stderr
+        assert "2 ok" in result.stderr
+        assert "1 failed" in result.stderr
+        assert "packages in" not in result.stdout
+
+    @responses.activate
+    def test_exit_code_zero_without_failures(self, runner, register_package):
+        register_package("pkg-a")
+        result = runner.invoke(app, ["batch", "--no-cache"], input="pkg-a\n")
+        assert result.exit_code == 0
+        assert "0 failed" in result.stderr
+
+    def test_no_banner(self, runner):
+        """Test batch output is not preceded by the banner, unlike other commands."""
+        result = runner.invoke(app, ["batch"], input="")
+        assert result.stdout == ""
+
+        other = runner.invoke(app, ["cache-info"])
+        assert "Version" in other.stdout
+
+    def test_invalid_concurrency(self, runner):
+        result = runner.invoke(app, ["batch", "--concurrency", "0"], input="pkg-a\n")
+        assert result.exit_code != 0
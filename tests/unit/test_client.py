@@ -5,7 +5,7 @@ import pytest
 import responses
 from requests.exceptions import HTTPError, Timeout, ConnectionError, RetryError
 from unittest.mock import Mock, patch, MagicMock
-from pypipackagestats.core.client import PyPIClient
+from pypipackagestats.core.client import FetchCancelled, PyPIClient
 from pypipackagestats.core.constants import (
     DEFAULT_CACHE_TTL,
     PYPI_API,
@@ -163,8 +163,8 @@ class TestPyPIClientCaching:
         client = PyPIClient(cache_ttl=3600)
         url = "https://pypi.org/pypi/test/json"
         
-        # 404 response should not be cached
-        responses.add(responses.GET, url, status=404)
+        # Error responses are not cached (404s are covered by negative caching)
+        responses.add(responses.GET, url, status=403)
         with pytest.raises(HTTPError):
             client._cached_get(url)
         
@@ -174,6 +174,300 @@ class TestPyPIClientCaching:
         assert len(responses.calls) == 2
 
 
+class TestPyPIClientNegativeCaching:
+    """Test short-lived caching of 404 responses."""
+
+    @responses.activate
+    def test_404_cached(self):
+        """A repeated lookup of a missing URL raises without a request."""
+        client = PyPIClient(cache_ttl=3600)
+        url = "https://pypi.org/pypi/missing/json"
+        responses.add(responses.GET, url, status=404)
+
+        for _ in range(3):
+            with pytest.raises(HTTPError) as exc_info:
+                client._cached_get(url)
+            assert exc_info.value.response.status_code == 404
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_negative_entry_expires(self):
+        """A 404 is refetched once its negative TTL has passed."""
+        client = PyPIClient(cache_ttl=3600, negative_cache_ttl=1)
+        url = "https://pypi.org/pypi/missing/json"
+        responses.add(responses.GET, url, status=404)
+        responses.add(responses.GET, url, json={"test": "data"}, status=200)
+
+        with pytest.raises(HTTPError):
+            client._cached_get(url)
+        time.sleep(1.1)
+        assert client._cached_get(url) == {"test": "data"}
+
+    @responses.activate
+    def test_negative_caching_disabled(self):
+        """negative_cache_ttl=0 requests the URL every time."""
+        client = PyPIClient(cache_ttl=3600, negative_cache_ttl=0)
+        url = "https://pypi.org/pypi/missing/json"
+        responses.add(responses.GET, url, status=404)
+
+        for _ in range(2):
+            with pytest.raises(HTTPError):
+                client._cached_get(url)
+        assert len(responses.calls) == 2
+
+    @responses.activate
+    def test_cached_404_maps_to_package_not_found(self):
+        """The public API raises PackageNotFoundError for a cached 404."""
+        from pypipackagestats.api import _fetch_package_stats
+        from pypipackagestats.core.exceptions import PackageNotFoundError
+
+        client = PyPIClient(cache_ttl=3600)
+        responses.add(responses.GET, PYPI_API.format(pkg="missing"), status=404)
+        responses.add(responses.GET, STATS_API.format(pkg="missing") + "recent", status=404)
+
+        for _ in range(2):
+            with pytest.raises(PackageNotFoundError):
+                _fetch_package_stats(client, "missing")
+        assert len(responses.calls) <= 2
+
+
+class TestPyPIClientRevalidation:
+    """Test conditional revalidation of expired entries."""
+
+    def expire_entry(self, url):
+        """Make the cached entry for url stale without dropping it."""
+        from pypipackagestats.core.cache import cache_get_entry, cache_set_entry, get_memory_cache
+
+        key = f"url:{url}"
+        cache_set_entry(key, cache_get_entry(key)._replace(expires_at=time.time() - 1))
+        get_memory_cache().clear()
+
+    @responses.activate
+    def test_304_reuses_cached_body(self):
+        """An expired entry with an ETag is revalidated; 304 keeps the body and restarts the TTL."""
+        client = PyPIClient(cache_ttl=3600)
+        url = "https://pypi.org/pypi/test/json"
+        responses.add(responses.GET, url, json={"test": "data"}, status=200, headers={"ETag": '"v1"'})
+        responses.add(responses.GET, url, status=304)
+
+        assert client._cached_get(url) == {"test": "data"}
+        self.expire_entry(url)
+        assert client._cached_get(url) == {"test": "data"}
+        assert responses.calls[1].request.headers["If-None-Match"] == '"v1"'
+
+        # Fresh again: served from cache
+        assert client._cached_get(url) == {"test": "data"}
+        assert len(responses.calls) == 2
+
+    @responses.activate
+    def test_changed_resource_replaces_entry(self):
+        """A 200 to a conditional request replaces the body and validators."""
+        client = PyPIClient(cache_ttl=3600)
+        url = "https://pypi.org/pypi/test/json"
+        modified = "Wed, 15 Jan 2025 00:00:00 GMT"
+        responses.add(responses.GET, url, json={"v": 1}, status=200, headers={"Last-Modified": modified})
+        responses.add(responses.GET, url, json={"v": 2}, status=200, headers={"ETag": '"v2"'})
+
+        assert client._cached_get(url) == {"v": 1}
+        self.expire_entry(url)
+        assert client._cached_get(url) == {"v": 2}
+        assert responses.calls[1].request.headers["If-Modified-Since"] == modified
+
+        from pypipackagestats.core.cache import cache_get_entry
+        assert cache_get_entry(f"url:{url}").etag == '"v2"'
+
+    @responses.activate
+    def test_no_validators_no_conditional_headers(self):
+        """Entries without validators are refetched unconditionally."""
+        client = PyPIClient(cache_ttl=3600)
+        url = "https://pypi.org/pypi/test/json"
+        responses.add(responses.GET, url, json={"test": "data"}, status=200)
+
+        client._cached_get(url)
+        self.expire_entry(url)
+        client._cached_get(url)
+        assert "If-None-Match" not in responses.calls[1].request.headers
+        assert "If-Modified-Since" not in responses.calls[1].request.headers
+
+
+class TestPyPIClientStaleServing:
+    """Test stale-while-revalidate and stale-if-error."""
+
+    def make_stale(self, url, seconds):
+        """Make the cached entry for url expire `seconds` ago."""
+        from pypipackagestats.core.cache import cache_get_entry, cache_set_entry
+
+        key = f"url:{url}"
+        cache_set_entry(key, cache_get_entry(key)._replace(expires_at=time.time() - seconds))
+
+    def wait_for_refreshes(self):
+        while PyPIClient._refreshing:
+            time.sleep(0.01)
+
+    @responses.activate
+    def test_stale_while_revalidate_returns_stale_and_refreshes(self):
+        """A recently expired entry is served at once and refreshed in the background."""
+        client = PyPIClient(cache_ttl=3600, stale_while_revalidate=60)
+        url = "https://pypi.org/pypi/test/json"
+        responses.add(responses.GET, url, json={"v": 1}, status=200)
+        responses.add(responses.GET, url, json={"v": 2}, status=200)
+
+        assert client._cached_get(url) == {"v": 1}
+        self.make_stale(url, 10)
+        assert client._cached_get(url) == {"v": 1}  # stale, refresh started
+        self.wait_for_refreshes()
+        assert client._cached_get(url) == {"v": 2}
+        assert len(responses.calls) == 2
+
+    @responses.activate
+    def test_stale_while_revalidate_respects_max_staleness(self):
+        """Entries staler than the window are refetched synchronously."""
+        client = PyPIClient(cache_ttl=3600, stale_while_revalidate=60)
+        url = "https://pypi.org/pypi/test/json"
+        responses.add(responses.GET, url, json={"v": 1}, status=200)
+        responses.add(responses.GET, url, json={"v": 2}, status=200)
+
+        client._cached_get(url)
+        self.make_stale(url, 120)
+        assert client._cached_get(url) == {"v": 2}
+
+    @responses.activate
+    def test_stale_if_error_serves_stale_on_network_error(self):
+        """A failed refresh (network error) returns the stale entry."""
+        client = PyPIClient(cache_ttl=3600, stale_if_error=600)
+        url = "https://pypi.org/pypi/test/json"
+        responses.add(responses.GET, url, json={"v": 1}, status=200)
+        responses.add(responses.GET, url, body=ConnectionError("down"))
+
+        client._cached_get(url)
+        self.make_stale(url, 10)
+        assert client._cached_get(url) == {"v": 1}
+
+    @responses.activate
+    def test_stale_if_error_does_not_hide_not_found(self):
+        """A 404 is not an upstream failure, so it is raised."""
+        client = PyPIClient(cache_ttl=3600, stale_if_error=600)
+        url = "https://pypi.org/pypi/test/json"
+        responses.add(responses.GET, url, json={"v": 1}, status=200)
+        responses.add(responses.GET, url, status=404)
+
+        client._cached_get(url)
+        self.make_stale(url, 10)
+        with pytest.raises(HTTPError):
+            client._cached_get(url)
+
+    @responses.activate
+    def test_errors_raised_without_stale_modes(self):
+        """By default a failed refresh raises even if a stale entry exists."""
+        client = PyPIClient(cache_ttl=3600)
+        url = "https://pypi.org/pypi/test/json"
+        responses.add(responses.GET, url, json={"v": 1}, status=200)
+        responses.add(responses.GET, url, body=ConnectionError("down"))
+
+        client._cached_get(url)
+        self.make_stale(url, 10)
+        with pytest.raises(ConnectionError):
+            client._cached_get(url)
+
+
+class TestPyPIClientCoalescing:
+    """Test single-flight coalescing of concurrent cache misses."""
+
+    @responses.activate
+    def test_concurrent_misses_issue_one_request(self):
+        """Concurrent threads asking for the same cold URL share one request."""
+        client = PyPIClient(cache_ttl=3600)
+        url = "https://pypi.org/pypi/test/json"
+        release = threading.Event()
+
+        def slow_callback(request):
+            release.wait(timeout=5)
+            return (200, {}, '{"test": "data"}')
+
+        responses.add_callback(responses.GET, url, callback=slow_callback)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(client._cached_get(url))) for _ in range(10)]
+        for t in threads:
+            t.start()
+        while PyPIClient._single_flight.in_flight() == 0:
+            time.sleep(0.01)
+        time.sleep(0.05)
+        release.set()
+        for t in threads:
+            t.join()
+
+        assert results == [{"test": "data"}] * 10
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_followers_receive_leader_error(self):
+        """Errors from the shared fetch propagate to every waiter."""
+        client = PyPIClient(cache_ttl=3600)
+        url = "https://pypi.org/pypi/test/json"
+        release = threading.Event()
+
+        def failing_callback(request):
+            release.wait(timeout=5)
+            return (404, {}, "")
+
+        responses.add_callback(responses.GET, url, callback=failing_callback)
+        errors = []
+
+        def fetch():
+            try:
+                client._cached_get(url)
+            except HTTPError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=fetch) for _ in range(3)]
+        for t in threads:
+            t.start()
+        while PyPIClient._single_flight.in_flight() == 0:
+            time.sleep(0.01)
+        time.sleep(0.05)
+        release.set()
+        for t in threads:
+            t.join()
+
+        assert len(errors) == 3
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_process_lock_rechecks_cache(self):
+        """With process_lock, a value stored by another process is reused."""
+        from pypipackagestats.core.cache import get_cache, get_memory_cache
+
+        client = PyPIClient(cache_ttl=3600, process_lock=True)
+        url = "https://pypi.org/pypi/test/json"
+        responses.add(responses.GET, url, json={"test": "data"}, status=200)
+
+        assert client._cached_get(url) == {"test": "data"}
+        get_cache().set(f"url:{url}", {"from": "other process"})
+        get_memory_cache().clear()  # Other processes do not share our L1
+        assert client._fetch_and_store(url, f"url:{url}") == {"from": "other process"}
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_process_lock_sees_fresh_disk_entry_behind_stale_l1(self):
+        """A stale L1 entry does not hide a fresh entry another process wrote to disk."""
+        from pypipackagestats.core.cache import CacheEntry, cache_get_entry, cache_set_entry, get_cache
+
+        client = PyPIClient(cache_ttl=3600, process_lock=True)
+        url = STATS_API.format(pkg="test-package") + "recent"
+        key = f"url:{url}"
+        responses.add(responses.GET, url, json={"data": {"last_day": 1}}, status=200)
+        responses.add(responses.GET, url, json={"data": {"last_day": 3}}, status=200)
+
+        assert client.get_recent_stats("test-package") == {"last_day": 1}
+        cache_set_entry(key, cache_get_entry(key)._replace(expires_at=time.time() - 1))  # Stale in L1 and L2
+        # Another process refreshes the entry on disk only
+        fresh = CacheEntry({"data": {"last_day": 2}}, time.time() + 3600)
+        get_cache().set(key, fresh._asdict())
+
+        assert client.get_recent_stats("test-package") == {"last_day": 2}
+        assert len([call for call in responses.calls if call.request.url == url]) == 1
+
+
 class TestPyPIClientAPIMethods:
     """Test API methods."""
     
@@ -188,6 +482,21 @@ class TestPyPIClientAPIMethods:
         result = client.get_package_info(package)
         assert result == package_info_data
     
+    @responses.activate
+    def test_get_package_info_projected(self, package_info_data):
+        """Test projected metadata is cached separately from the raw document."""
+        package = "test-package"
+        url = PYPI_API.format(pkg=package)
+        responses.add(responses.GET, url, json=dict(package_info_data, urls=[{"url": "x"}]), status=200)
+
+        projected = PyPIClient(project_package_info=True).get_package_info(package)
+        assert "urls" not in projected
+        assert projected["info"]["name"] == package_info_data["info"]["name"]
+
+        raw = PyPIClient().get_package_info(package)
+        assert "urls" in raw
+        assert len(responses.calls) == 2
+
     @responses.activate
     def test_get_package_info_with_invalid_package(self):
         """Test get_package_info with invalid package (404)."""
@@ -412,14 +721,27 @@ class TestPyPIClientRateLimiting:
         client = PyPIClient()
         url = "https://pypistats.org/api/packages/test/recent"
         client._throttle(url)
-        # Simulate enough time passing
-        PyPIClient._host_last_request_time["pypistats.org"] = (
-            time.monotonic() - RATE_LIMIT_MIN_INTERVAL - 0.01
-        )
+        # Let enough time pass
+        time.sleep(RATE_LIMIT_MIN_INTERVAL + 0.01)
         with patch("pypipackagestats.core.client.time.sleep") as mock_sleep:
             client._throttle(url)
             mock_sleep.assert_not_called()
 
+    @responses.activate
+    def test_cancelled_request_not_sent(self):
+        """A request is not sent once the thread's cancel event is set."""
+        client = PyPIClient(cache_ttl=0)
+        url = "https://pypistats.org/api/packages/test/recent"
+        responses.add(responses.GET, url, json={"data": {}}, status=200)
+        cancel = threading.Event()
+        with client.cancel_on(cancel):
+            client.get_recent_stats("test")
+            cancel.set()
+            with pytest.raises(FetchCancelled):
+                client.get_recent_stats("test")
+        client.get_recent_stats("test")
+        assert len(responses.calls) == 2
+
     @responses.activate
     def test_throttle_skipped_for_cache_hits(self):
         """Cache hits bypass throttle entirely."""
@@ -0,0 +1,92 @@
+"""Tests for the local download history store."""
+from datetime import date
+import pytest
+import responses
+from pypipackagestats.core.client import PyPIClient
+from pypipackagestats.core.constants import STATS_API
+from pypipackagestats.core.history import HistoryStore
+
+
+def rows_for(*days, category="without_mirrors", downloads=10):
+    return [{"date": day, "category": category, "downloads": downloads} for day in days]
+
+
+@pytest.fixture
+def store(tmp_path):
+    with HistoryStore(tmp_path / "history", client=PyPIClient(cache_ttl=0)) as history:
+        yield history
+
+
+class TestHistoryStoreMerge:
+    """Test appending rows to the history."""
+
+    def test_merge_appends_only_new_days(self, store):
+        assert store.merge("pkg", "overall", rows_for("2025-01-01", "2025-01-02")) == 2
+        assert store.merge("pkg", "overall", rows_for("2025-01-02", "2025-01-03", "2025-01-04")) == 2
+        assert store.merge("pkg", "overall", rows_for("2025-01-03")) == 0
+
+        assert [row["date"] for row in store.rows("pkg")] == ["2025-01-01", "2025-01-02", "2025-01-03", "2025-01-04"]
+        assert store.last_synced("pkg") == date(2025, 1, 4)
+        assert store.series("pkg").total() == 40
+
+    def test_history_grows_past_upstream_window(self, store):
+        """Days that fall out of later responses stay stored."""
+        store.merge("pkg", "overall", rows_for("2024-06-01"))
+        store.merge("pkg", "overall", rows_for("2025-01-01"))
+        assert store.series("pkg").total(start=date(2024, 1, 1), end=date(2024, 12, 31)) == 10
+
+    def test_rollup(self, store):
+        store.merge("pkg", "overall", rows_for("2025-01-01", "2025-01-03"))
+        index = store.rollup("pkg")
+        assert index.range_sum(date(2025, 1, 1), date(2025, 1, 2)) == 10
+        assert index.monthly == [(date(2025, 1, 1), 20)]
+
+    def test_category_series(self, store):
+        rows = rows_for("2025-01-01", category="3.12", downloads=5) + rows_for("2025-01-01", category="3.11", downloads=2)
+        assert store.merge("pkg", "python_minor", rows) == 2
+        assert store.series("pkg", "python_minor").category_totals() == {"3.12": 5, "3.11": 2}
+
+    def test_rows_without_valid_date_dropped(self, store):
+        rows = rows_for("2025-01-01") + [{"date": "invalid", "downloads": 1}, {"downloads": 1}]
+        assert store.merge("pkg", "overall", rows) == 1
+
+    def test_names_are_normalized(self, store):
+        store.merge("Django_Rest.Framework", "overall", rows_for("2025-01-01"))
+        assert store.last_synced("django-rest-framework") == date(2025, 1, 1)
+        assert store.packages() == ["django-rest-framework"]
+
+    def test_unknown_endpoint(self, store):
+        with pytest.raises(ValueError, match="Unknown endpoint"):
+            store.merge("pkg", "recent", [])
+
+    def test_never_synced(self, store):
+        assert store.rows("pkg") == []
+        assert store.last_synced("pkg") is None
+        assert len(store.series("pkg")) == 0
+
+    def test_persists_across_instances(self, tmp_path):
+        with HistoryStore(tmp_path) as first:
+            first.merge("pkg", "overall", rows_for("2025-01-01"))
+        with HistoryStore(tmp_path) as second:
+            assert second.last_synced("pkg") == date(2025, 1, 1)
+
+    def test_clear(self, store):
+        store.merge("pkg", "overall", rows_for("2025-01-01"))
+        store.clear()
+        assert store.packages() == []
+
+
+class TestHistoryStoreSync:
+    """Test syncing from the pypistats.org endpoints."""
+
+    @responses.activate
+    def test_sync_merges_new_days(self, store):
+        stats_url = STATS_API.format(pkg="test-package")
+        for days in (("2025-01-01", "2025-01-02"), ("2025-01-02", "2025-01-03")):
+            responses.add(responses.GET, stats_url + "overall?mirrors=false", json={"data": rows_for(*days)})
+            responses.add(responses.GET, stats_url + "python_minor", json={"data": rows_for(*days, category="3.12")})
+            responses.add(responses.GET, stats_url + "system", json={"data": rows_for(*days, category="Linux")})
+
+        assert store.sync("Test_Package") == {"overall": 2, "python_minor": 2, "system": 2}
+        assert store.sync("test-package") == {"overall": 1, "python_minor": 1, "system": 1}
+        assert store.series("test-package", "system").category_totals() == {"Linux": 30}
@@ -0,0 +1,97 @@
+"""Tests for the memory-mapped download matrix."""
+from datetime import date
+import multiprocessing
+import pytest
+import responses
+from pypipackagestats.core.client import PyPIClient
+from pypipackagestats.core.constants import STATS_API
+from pypipackagestats.core.matrix import DownloadMatrix
+
+
+def overall_rows(start_day, *downloads):
+    return [
+        {"date": date(2025, 1, start_day + i).isoformat(), "category": "without_mirrors", "downloads": n}
+        for i, n in enumerate(downloads)
+    ]
+
+
+@pytest.fixture
+def matrix(tmp_path):
+    with DownloadMatrix(tmp_path, epoch=date(2025, 1, 1), days=64, client=PyPIClient(cache_ttl=0)) as m:
+        yield m
+
+
+def read_range_sum(directory, package, queue):
+    with DownloadMatrix(directory, readonly=True) as reader:
+        queue.put(reader.range_sum(package))
+
+
+class TestDownloadMatrix:
+    """Test writing and querying the matrix."""
+
+    def test_update_and_query(self, matrix):
+        assert matrix.update("pkg-a", overall_rows(1, 10, 20, 30)) == 3
+        matrix.update("pkg-b", overall_rows(2, 5, 5))
+
+        assert matrix.packages() == ["pkg-a", "pkg-b"]
+        assert list(matrix.series("pkg-a", date(2025, 1, 1), date(2025, 1, 4))) == [10, 20, 30, 0]
+        assert matrix.range_sum("pkg-a", date(2025, 1, 2), date(2025, 1, 3)) == 50
+        assert matrix.totals() == {"pkg-a": 60, "pkg-b": 10}
+        assert list(matrix.daily_totals(date(2025, 1, 1), date(2025, 1, 3))) == [10, 25, 35]
+        assert matrix.top(1) == [("pkg-a", 60)]
+
+    def test_update_overwrites_days(self, matrix):
+        matrix.update("pkg", overall_rows(1, 10, 20))
+        matrix.update("pkg", overall_rows(2, 25, 30))
+        assert list(matrix.series("pkg", date(2025, 1, 1), date(2025, 1, 3))) == [10, 25, 30]
+
+    def test_days_outside_axis_skipped(self, matrix):
+        rows = [{"date": "2024-12-31", "downloads": 1}, {"date": "2025-03-06", "downloads": 1}, {"date": "2025-03-05", "downloads": 7}]
+        assert matrix.update("pkg", rows) == 1
+        assert matrix.range_sum("pkg") == 7
+
+    def test_unknown_package(self, matrix):
+        assert matrix.range_sum("missing") == 0
+        assert list(matrix.series("missing", date(2025, 1, 1), date(2025, 1, 2))) == [0, 0]
+        assert matrix.totals() == {}
+
+    def test_names_are_normalized(self, matrix):
+        matrix.update("Django_Rest.Framework", overall_rows(1, 1))
+        assert matrix.range_sum("django-rest-framework") == 1
+
+    def test_layout_fixed_at_creation(self, matrix, tmp_path):
+        with DownloadMatrix(tmp_path, epoch=date(2020, 1, 1), days=10) as reopened:
+            assert reopened.epoch == date(2025, 1, 1)
+            assert reopened.days == 64
+
+    def test_readonly(self, matrix, tmp_path):
+        matrix.update("pkg", overall_rows(1, 3))
+        matrix.flush()
+        with DownloadMatrix(tmp_path, readonly=True) as reader:
+            assert reader.range_sum("pkg") == 3
+            with pytest.raises(PermissionError):
+                reader.update("pkg", overall_rows(1, 1))
+
+    def test_reader_sees_rows_added_later(self, matrix, tmp_path):
+        """Test a reader remaps when another writer adds rows."""
+        matrix.update("pkg-a", overall_rows(1, 1))
+        with DownloadMatrix(tmp_path, readonly=True) as reader:
+            assert reader.range_sum("pkg-a") == 1
+            matrix.update("pkg-b", overall_rows(1, 2))
+            matrix.flush()
+            assert reader.range_sum("pkg-b") == 2
+
+    def test_readable_from_another_process(self, matrix, tmp_path):
+        matrix.update("pkg", overall_rows(1, 4, 5))
+        matrix.flush()
+        queue = multiprocessing.get_context("spawn").Queue()
+        process = multiprocessing.get_context("spawn").Process(target=read_range_sum, args=(tmp_path, "pkg", queue))
+        process.start()
+        process.join(30)
+        assert queue.get(timeout=5) == 9
+
+    @responses.activate
+    def test_sync_uses_overall_stats(self, matrix):
+        responses.add(responses.GET, STATS_API.format(pkg="test-package") + "overall?mirrors=false", json={"data": overall_rows(1, 7, 8)})
+        assert matrix.sync("Test_Package") == 2
+        assert matrix.range_sum("test-package") == 15
@@ -2,13 +2,67 @@
 import pytest
 from datetime import date, timedelta
 from pypipackagestats.core.processing import (
+    canonicalize_name,
+    project_package_info,
     process_package_info,
     process_download_stats,
     process_category_breakdown,
+    process_window_stats,
 )
+from pypipackagestats.core.timeseries import CategorySeries, resolve_window
 from pypipackagestats.core.models import PackageInfo, DownloadStats, CategoryBreakdown
 
 
+class TestCanonicalizeName:
+    """Test canonicalize_name function."""
+
+    @pytest.mark.parametrize("name", [
+        "Django_Rest_Framework",
+        "django-rest-framework",
+        "django.rest.framework",
+        "DJANGO__REST--FRAMEWORK",
+        "django-_.rest-framework",
+    ])
+    def test_separator_runs_and_case(self, name):
+        """Test runs of -, _ and . become one dash and case is folded."""
+        assert canonicalize_name(name) == "django-rest-framework"
+
+    def test_already_canonical(self):
+        """Test canonical names are unchanged."""
+        assert canonicalize_name("requests") == "requests"
+
+
+class TestProjectPackageInfo:
+    """Test project_package_info function."""
+
+    def test_projection_preserves_processed_result(self, package_info_data):
+        """Test processing the projected document gives the same PackageInfo."""
+        assert process_package_info(project_package_info(package_info_data)) == process_package_info(package_info_data)
+
+    def test_drops_other_releases_and_unused_fields(self):
+        """Test only used info fields and the current release's first file are kept."""
+        data = {
+            "info": {"name": "pkg", "version": "2.0", "description": "long README" * 1000},
+            "releases": {
+                "1.0": [{"upload_time": "2023-01-01T00:00:00"}],
+                "2.0": [
+                    {"upload_time": "2024-01-01T00:00:00", "digests": {"sha256": "abc"}},
+                    {"upload_time": "2024-01-02T00:00:00"},
+                ],
+            },
+            "urls": [{"url": "https://files.example/pkg.whl"}],
+        }
+        assert project_package_info(data) == {
+            "info": {"name": "pkg", "version": "2.0"},
+            "releases": {"2.0": [{"upload_time": "2024-01-01T00:00:00"}]},
+        }
+
+    def test_missing_release(self):
+        """Test documents without files for the current version."""
+        data = {"info": {"name": "pkg", "version": "2.0"}, "releases": {}}
+        assert project_package_info(data) == {"info": {"name": "pkg", "version": "2.0"}}
+
+
 class TestProcessPackageInfo:
     """Test process_package_info function."""
     
@@ -390,3 +444,29 @@ class TestProcessCategoryBreakdown:
         result = process_category_breakdown(data)
         assert len(result) == 1
         assert result[0].percentage == 100.0
+
+
+class TestProcessWindowStats:
+    """Test totals and breakdowns per analysis window."""
+
+    def test_windows_share_series(self):
+        today = date.today()
+        day = lambda n: (today - timedelta(days=n)).isoformat()
+        overall = CategorySeries.from_rows([
+            {"date": day(1), "category": "without_mirrors", "downloads": 10},
+            {"date": day(20), "category": "without_mirrors", "downloads": 100},
+        ])
+        python = CategorySeries.from_rows([
+            {"date": day(1), "category": "3.12", "downloads": 3},
+            {"date": day(20), "category": "null", "downloads": 9},
+        ])
+        system = CategorySeries.from_rows([{"date": day(1), "category": "Linux", "downloads": 10}])
+
+        windows = process_window_stats([resolve_window(7), resolve_window(30)], overall, python, system)
+
+        assert windows["7d"].downloads == 10
+        assert windows["7d"].python_versions == [CategoryBreakdown("3.12", 3, 100.0)]
+        assert windows["30d"].downloads == 110
+        assert windows["30d"].python_versions == [CategoryBreakdown("Unknown", 9, 75.0), CategoryBreakdown("3.12", 3, 25.0)]
+        assert windows["30d"].operating_systems == [CategoryBreakdown("Linux", 10, 100.0)]
+        assert windows["30d"].start == today - timedelta(days=30)
@@ -0,0 +1,247 @@
+"""Tests for the token-bucket rate limiter."""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import pytest
+from pypipackagestats.core.client import PyPIClient
+from pypipackagestats.core.rate_limit import (
+    TokenBucket,
+    RateLimiter,
+    AdaptiveRateLimiter,
+    SharedRateLimiter,
+    get_rate_limiter,
+    set_rate_limiter,
+    parse_retry_after,
+)
+
+STATS_URL = "https://pypistats.org/api/packages/test/recent"
+PYPI_URL = "https://pypi.org/pypi/test/json"
+
+
+class TestTokenBucket:
+    """Test TokenBucket reservations."""
+
+    def test_burst_requests_not_delayed(self):
+        """Test the first `burst` reservations are immediate."""
+        bucket = TokenBucket(rate=4, burst=3)
+        assert [bucket.reserve(100.0) for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert bucket.reserve(100.0) == pytest.approx(0.25)
+        assert bucket.reserve(100.0) == pytest.approx(0.5)
+
+    def test_tokens_refill_over_time(self):
+        """Test an idle bucket refills up to burst."""
+        bucket = TokenBucket(rate=4, burst=2)
+        bucket.reserve(100.0)
+        bucket.reserve(100.0)
+        assert bucket.reserve(101.0) == 0.0
+
+    def test_invalid_configuration(self):
+        """Test non-positive rate or burst raise ValueError."""
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+        with pytest.raises(ValueError):
+            TokenBucket(rate=1, burst=0)
+
+
+class TestRateLimiter:
+    """Test RateLimiter."""
+
+    def test_unlimited_host_never_delayed(self):
+        """Test hosts without a bucket are not throttled or counted."""
+        limiter = RateLimiter(rate=1, burst=1)
+        assert all(limiter.reserve(PYPI_URL) == 0.0 for _ in range(10))
+        assert limiter.get_stats() == {}
+
+    def test_wait_metrics(self):
+        """Test per-host wait-time metrics are recorded."""
+        limiter = RateLimiter(rate=4, burst=1)
+        for _ in range(3):
+            limiter.reserve(STATS_URL)
+        stats = limiter.get_stats()["pypistats.org"]
+        assert stats["requests"] == 3
+        assert stats["delayed"] == 2
+        assert stats["max_wait"] == pytest.approx(0.5, abs=0.01)
+        assert stats["total_wait"] == pytest.approx(0.75, abs=0.02)
+
+    def test_configure_host(self):
+        """Test configure() adds a limited host."""
+        limiter = RateLimiter(rate=4, burst=1)
+        limiter.configure("pypi.org", rate=2, burst=1)
+        limiter.reserve(PYPI_URL)
+        assert limiter.reserve(PYPI_URL) == pytest.approx(0.5, abs=0.01)
+
+    def test_reservations_do_not_block_other_threads(self):
+        """Test a thread waiting for a slot does not hold the limiter lock."""
+        limiter = RateLimiter(rate=1, burst=1)
+        limiter.reserve(STATS_URL)
+        delay = limiter.reserve(STATS_URL)
+        waiter = threading.Thread(target=time.sleep, args=(delay,))
+        waiter.start()
+
+        start = time.monotonic()
+        assert limiter.reserve(PYPI_URL) == 0.0
+        limiter.reserve(STATS_URL)
+        assert time.monotonic() - start < 0.1
+        waiter.join()
+
+    def test_shared_singleton(self):
+        """Test get_rate_limiter returns one process-wide instance."""
+        assert get_rate_limiter() is get_rate_limiter()
+
+
+class TestParseRetryAfter:
+    """Test Retry-After parsing."""
+
+    def test_seconds(self):
+        assert parse_retry_after("12") == 12.0
+
+    def test_http_date_in_past(self):
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+    def test_missing_or_invalid(self):
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
+
+
+class TestAdaptiveRateLimiter:
+    """Test AIMD behaviour of AdaptiveRateLimiter."""
+
+    def test_429_decreases_rate_once_per_interval(self):
+        """Test a burst of 429s halves the rate only once."""
+        limiter = AdaptiveRateLimiter(rate=4, min_rate=1)
+        limiter.reserve(STATS_URL)
+        limiter.feedback(STATS_URL, 429)
+        limiter.feedback(STATS_URL, 429)
+        stats = limiter.get_stats()["pypistats.org"]
+        assert stats["rate"] == 2
+        assert stats["rate_limited"] == 2
+
+    def test_rate_never_below_minimum(self):
+        """Test the rate is floored at min_rate."""
+        limiter = AdaptiveRateLimiter(rate=4, min_rate=3)
+        limiter.reserve(STATS_URL)
+        limiter.feedback(STATS_URL, 429)
+        assert limiter.get_stats()["pypistats.org"]["rate"] == 3
+
+    def test_successes_probe_back_up_to_max(self):
+        """Test a run of successes raises the rate, capped at the configured rate."""
+        limiter = AdaptiveRateLimiter(rate=4, increase_step=1, success_threshold=2)
+        limiter.reserve(STATS_URL)
+        limiter.feedback(STATS_URL, 429)
+        for _ in range(2):
+            limiter.feedback(STATS_URL, 200)
+        assert limiter.get_stats()["pypistats.org"]["rate"] == 3
+        for _ in range(10):
+            limiter.feedback(STATS_URL, 200)
+        assert limiter.get_stats()["pypistats.org"]["rate"] == 4
+
+    def test_retry_after_pauses_host(self):
+        """Test Retry-After pushes the next slot past the pause."""
+        limiter = AdaptiveRateLimiter(rate=100)
+        limiter.feedback(STATS_URL, 429, retry_after="2")
+        assert limiter.reserve(STATS_URL) == pytest.approx(2.0, abs=0.1)
+
+    def test_reset_restores_rate(self):
+        """Test reset() forgets the learned rate."""
+        limiter = AdaptiveRateLimiter(rate=4)
+        limiter.feedback(STATS_URL, 429)
+        limiter.reset()
+        limiter.reserve(STATS_URL)
+        assert limiter.get_stats()["pypistats.org"]["rate"] == 4
+
+    def test_default_limiter_is_adaptive(self):
+        """Test the process-wide limiter adapts."""
+        assert isinstance(get_rate_limiter(), AdaptiveRateLimiter)
+
+
+class TestSharedRateLimiter:
+    """Test SharedRateLimiter (one budget per host across processes)."""
+
+    def test_instances_share_budget(self, tmp_path):
+        """Test two limiters on the same directory draw from one bucket."""
+        worker_a = SharedRateLimiter(tmp_path, rate=4)
+        worker_b = SharedRateLimiter(tmp_path, rate=4)
+        assert worker_a.reserve(STATS_URL) == 0.0
+        assert worker_b.reserve(STATS_URL) == pytest.approx(0.25, abs=0.05)
+        assert worker_a.reserve(STATS_URL) == pytest.approx(0.5, abs=0.05)
+
+    def test_rate_decrease_is_shared(self, tmp_path):
+        """Test a 429 seen by one process slows down the others."""
+        worker_a = SharedRateLimiter(tmp_path, rate=4)
+        worker_b = SharedRateLimiter(tmp_path, rate=4)
+        worker_a.feedback(STATS_URL, 429, retry_after="1")
+        assert worker_b.reserve(STATS_URL) == pytest.approx(1.0, abs=0.1)
+        assert worker_b.get_stats()["pypistats.org"]["rate"] == 2
+
+    def test_reset_clears_shared_state(self, tmp_path):
+        """Test reset() clears the shared schedule."""
+        worker_a = SharedRateLimiter(tmp_path, rate=4)
+        worker_b = SharedRateLimiter(tmp_path, rate=4)
+        worker_a.reserve(STATS_URL)
+        worker_a.reset()
+        assert worker_b.reserve(STATS_URL) == 0.0
+
+    def test_set_rate_limiter_replaces_default(self, tmp_path):
+        """Test set_rate_limiter swaps the limiter used by new clients."""
+        original = get_rate_limiter()
+        shared = SharedRateLimiter(tmp_path)
+        try:
+            set_rate_limiter(shared)
+            assert PyPIClient().rate_limiter is shared
+        finally:
+            set_rate_limiter(original)
+
+
+class TestAdaptiveRateLimiterAgainstServer:
+    """Drive PyPIClient against a local server that returns 429s on a schedule."""
+
+    @pytest.fixture
+    def server(self):
+        """Local HTTP server answering 429 (Retry-After: 0) on the scheduled request numbers."""
+        state = {"count": 0, "schedule": set()}
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                state["count"] += 1
+                if state["count"] in state["schedule"]:
+                    self.send_response(429)
+                    self.send_header("Retry-After", "0")
+                    self.end_headers()
+                    return
+                body = json.dumps({"data": {}}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        httpd = HTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+        thread.start()
+        yield httpd, state
+        httpd.shutdown()
+        httpd.server_close()
+
+    def test_rate_adapts_to_scheduled_429s(self, server):
+        """Test retried 429s lower the rate and later successes raise it."""
+        httpd, state = server
+        state["schedule"] = {2}
+        url = f"http://127.0.0.1:{httpd.server_address[1]}/api"
+        limiter = AdaptiveRateLimiter(
+            rate=50, hosts=["127.0.0.1"], min_rate=1, increase_step=10, success_threshold=3
+        )
+        client = PyPIClient(cache_ttl=0, rate_limiter=limiter)
+
+        client._cached_get(url)  # request 1: 200
+        client._cached_get(url)  # request 2: 429 (retried internally), request 3: 200
+        stats = limiter.get_stats()["127.0.0.1"]
+        assert stats["rate_limited"] == 1
+        assert stats["rate"] == 25
+
+        for _ in range(2):  # requests 4-5 complete a run of 3 successes
+            client._cached_get(url)
+        assert limiter.get_stats()["127.0.0.1"]["rate"] == 35
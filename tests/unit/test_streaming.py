@@ -0,0 +1,106 @@
+"""Tests for incremental parsing of PyPI metadata."""
+import io
+import json
+import tracemalloc
+from unittest.mock import patch
+import pytest
+import responses
+
+pytest.importorskip("ijson")
+
+from pypipackagestats.core.client import PyPIClient
+from pypipackagestats.core.constants import PYPI_API
+from pypipackagestats.core.processing import process_package_info, project_package_info
+from pypipackagestats.core.streaming import stream_package_info
+
+
+def make_document(release_count: int) -> dict:
+    """PyPI-shaped document with many releases, the current one last."""
+    files = [
+        {
+            "filename": f"pkg-{i}.whl",
+            "digests": {"md5": "0" * 32, "sha256": "0" * 64},
+            "upload_time": "2024-01-01T00:00:00",
+            "url": "https://files.example/" + "x" * 80,
+        }
+        for i in range(3)
+    ]
+    releases = {f"0.{i}": files for i in range(release_count)}
+    current = f"0.{release_count - 1}"
+    return {
+        "info": {"name": "pkg", "version": current, "summary": "s", "description": "d" * 2000},
+        "last_serial": 1,
+        "releases": releases,
+        "urls": files,
+    }
+
+
+def peak_memory(fn) -> int:
+    """Peak traced allocation (bytes) while running fn."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+class TestStreamPackageInfo:
+    """Test stream_package_info."""
+
+    def test_matches_full_parse(self, package_info_data):
+        """Test processing the streamed subset equals processing the full document."""
+        streamed = stream_package_info(io.BytesIO(json.dumps(package_info_data).encode()))
+        assert process_package_info(streamed) == process_package_info(package_info_data)
+
+    def test_keeps_only_current_release(self):
+        """Test other releases and top-level keys are skipped."""
+        document = make_document(50)
+        streamed = stream_package_info(io.BytesIO(json.dumps(document).encode()))
+        assert set(streamed) == {"info", "releases"}
+        assert list(streamed["releases"]) == ["0.49"]
+
+    def test_releases_before_info(self):
+        """Test documents where releases precede info are still handled."""
+        document = {"releases": {"1.0": [{"upload_time": "t"}], "2.0": []}, "info": {"name": "pkg", "version": "1.0"}}
+        streamed = stream_package_info(io.BytesIO(json.dumps(document).encode()))
+        assert streamed["releases"] == {"1.0": [{"upload_time": "t"}]}
+
+    def test_stops_reading_after_current_release(self):
+        """Test the stream is not consumed past the current release."""
+        document = {
+            "info": {"name": "pkg", "version": "1.0"},
+            "releases": {"1.0": [{"upload_time": "t"}], "2.0": []},
+            "urls": ["x" * 500_000],
+        }
+        body = io.BytesIO(json.dumps(document).encode())
+        stream_package_info(body)
+        assert body.tell() < len(body.getvalue())
+
+    def test_peak_memory_bounded(self):
+        """Test peak memory stays flat as the document grows, unlike a full parse."""
+        small = json.dumps(make_document(500)).encode()
+        large = json.dumps(make_document(4000)).encode()
+
+        streamed_small = peak_memory(lambda: stream_package_info(io.BytesIO(small)))
+        streamed_large = peak_memory(lambda: stream_package_info(io.BytesIO(large)))
+        full_large = peak_memory(lambda: json.loads(large))
+
+        assert streamed_large < full_large / 10
+        assert streamed_large < streamed_small * 1.5 + 64 * 1024
+
+
+class TestClientStreaming:
+    """Test PyPIClient streams projected metadata."""
+
+    @responses.activate
+    def test_projected_package_info_is_streamed(self):
+        """Test projected metadata from a streamed body matches the projection."""
+        document = make_document(20)
+        url = PYPI_API.format(pkg="pkg")
+        responses.add(responses.GET, url, body=json.dumps(document), status=200, content_type="application/json")
+
+        client = PyPIClient(cache_ttl=0, project_package_info=True)
+        with patch("pypipackagestats.core.client.stream_package_info", wraps=stream_package_info) as spy:
+            assert client.get_package_info("pkg") == project_package_info(document)
+            spy.assert_called_once()
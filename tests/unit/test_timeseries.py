@@ -0,0 +1,137 @@
+"""Tests for the columnar time-series representation."""
+from datetime import date, timedelta
+import pytest
+from pypipackagestats.core.timeseries import AnalysisWindow, CategorySeries, RollupIndex, resolve_window
+
+
+def rows_for(*entries):
+    return [{"date": d, "category": c, "downloads": n} for d, c, n in entries]
+
+
+class TestCategorySeries:
+    """Test building and querying CategorySeries."""
+
+    def test_pivots_rows_onto_sorted_day_axis(self):
+        series = CategorySeries.from_rows(rows_for(
+            ("2025-01-03", "3.12", 5),
+            ("2025-01-01", "3.11", 10),
+            ("2025-01-01", "3.12", 20),
+        ))
+        assert list(series.days) == [date(2025, 1, 1).toordinal(), date(2025, 1, 3).toordinal()]
+        assert series.categories == ["3.12", "3.11"]
+        assert list(series.columns[0]) == [20, 5]
+        assert list(series.columns[1]) == [10, 0]
+        assert len(series) == 2
+
+    def test_duplicate_rows_are_summed(self):
+        series = CategorySeries.from_rows(rows_for(("2025-01-01", "a", 1), ("2025-01-01", "a", 2)))
+        assert list(series.columns[0]) == [3]
+
+    def test_window_totals_are_inclusive(self):
+        series = CategorySeries.from_rows(rows_for(
+            ("2025-01-01", "a", 1),
+            ("2025-01-02", "a", 2),
+            ("2025-01-03", "b", 4),
+            ("2025-01-04", "a", 8),
+        ))
+        assert series.total() == 15
+        assert series.total(date(2025, 1, 2), date(2025, 1, 3)) == 6
+        assert series.total(start=date(2025, 1, 4)) == 8
+        assert series.total(end=date(2025, 1, 1).toordinal()) == 1
+        assert series.total(date(2025, 2, 1)) == 0
+        assert series.total(date(2025, 1, 3), date(2025, 1, 2)) == 0
+
+    def test_category_totals_only_include_categories_with_rows_in_window(self):
+        series = CategorySeries.from_rows(rows_for(
+            ("2025-01-01", "old", 100),
+            ("2025-01-10", "a", 0),
+            ("2025-01-11", "b", 7),
+        ))
+        assert series.category_totals(start=date(2025, 1, 10)) == {"a": 0, "b": 7}
+        assert series.category_totals() == {"old": 100, "a": 0, "b": 7}
+
+    def test_undated_rows_kept_off_the_day_axis(self):
+        series = CategorySeries.from_rows([
+            {"date": "invalid", "category": "a", "downloads": 3},
+            {"category": "a", "downloads": 4},
+            {"date": "2025-01-01", "category": "a", "downloads": 5},
+        ])
+        assert len(series) == 1
+        assert series.total() == 5
+        assert series.total(include_undated=True) == 12
+        assert series.category_totals() == {"a": 5}
+
+    def test_missing_fields_default(self):
+        series = CategorySeries.from_rows([{"date": "2025-01-01"}, {"date": "2025-01-01", "downloads": None}])
+        assert series.category_totals() == {"unknown": 0}
+
+    def test_empty(self):
+        series = CategorySeries.from_rows([])
+        assert len(series) == 0
+        assert series.total() == 0
+        assert series.category_totals(start=date.today() - timedelta(days=30)) == {}
+
+
+class TestResolveWindow:
+    """Test turning window specs into date ranges."""
+
+    def test_days_end_today(self):
+        window = resolve_window(7, today=date(2025, 1, 31))
+        assert window == AnalysisWindow("7d", date(2025, 1, 24), date(2025, 1, 31))
+
+    def test_date_range(self):
+        window = resolve_window((date(2025, 1, 1), "2025-01-31"))
+        assert window == AnalysisWindow("2025-01-01..2025-01-31", date(2025, 1, 1), date(2025, 1, 31))
+
+    @pytest.mark.parametrize("spec", [0, -1, True, "30", ("2025-01-02", "2025-01-01"), ("2025-01-01",), ("x", "2025-01-01")])
+    def test_invalid(self, spec):
+        with pytest.raises(ValueError):
+            resolve_window(spec)
+
+
+class TestRollupIndex:
+    """Test the dense cumulative index."""
+
+    @pytest.fixture
+    def index(self):
+        # Mon 2024-12-30 .. Sun 2025-01-12, with 2025-01-05 missing
+        rows = [
+            {"date": (date(2024, 12, 30) + timedelta(days=i)).isoformat(), "downloads": i + 1}
+            for i in range(14) if i != 6
+        ]
+        return RollupIndex.from_rows(rows)
+
+    def test_dense_axis(self, index):
+        assert (index.start, index.end, len(index)) == (date(2024, 12, 30), date(2025, 1, 12), 14)
+        assert index.day(date(2025, 1, 5)) == 0
+        assert index.day(date(2025, 1, 6)) == 8
+
+    def test_range_sum(self, index):
+        assert index.range_sum() == sum(range(1, 15)) - 7
+        assert index.range_sum(date(2024, 12, 30), date(2024, 12, 31)) == 3
+        assert index.range_sum(date(2025, 1, 11)) == 13 + 14
+        assert index.range_sum(end=date(2024, 1, 1)) == 0
+        assert index.range_sum(date(2020, 1, 1), date(2030, 1, 1)) == index.range_sum()
+        assert index.range_sum(date(2025, 1, 2), date(2025, 1, 1)) == 0
+
+    def test_rolling(self, index):
+        sums = dict(index.rolling_sum(3))
+        assert sums[date(2024, 12, 30)] == 1
+        assert sums[date(2025, 1, 1)] == 1 + 2 + 3
+        assert sums[date(2025, 1, 6)] == 6 + 0 + 8
+        means = dict(index.rolling_mean(7))
+        assert means[date(2024, 12, 31)] == 1.5
+        assert means[date(2025, 1, 12)] == (8 + 9 + 10 + 11 + 12 + 13 + 14) / 7
+        with pytest.raises(ValueError):
+            index.rolling_sum(0)
+
+    def test_weekly_and_monthly(self, index):
+        assert index.weekly == [(date(2024, 12, 30), 1 + 2 + 3 + 4 + 5 + 6), (date(2025, 1, 6), sum(range(8, 15)))]
+        assert index.monthly == [(date(2024, 12, 1), 3), (date(2025, 1, 1), index.range_sum() - 3)]
+
+    def test_empty(self):
+        index = RollupIndex.from_rows([])
+        assert len(index) == 0
+        assert index.range_sum() == 0
+        assert index.weekly == [] and index.monthly == []
+        assert index.rolling_mean() == []
@@ -0,0 +1,103 @@
+"""Tests for cache TTL policies."""
+from datetime import datetime, timezone
+import time
+import pytest
+import responses
+from pypipackagestats.core.cache import cache_get_entry
+from pypipackagestats.core.client import PyPIClient
+from pypipackagestats.core.constants import PYPI_API, STATS_API
+from pypipackagestats.core.ttl import (
+    TTLPolicy,
+    FixedTTL,
+    DailyRolloverTTL,
+    DEFAULT_TTL_POLICIES,
+    resolve_ttl_policies,
+)
+from pypipackagestats.api import _effective_ttl_policies
+
+
+def utc_timestamp(hour, minute=0):
+    return datetime(2025, 1, 15, hour, minute, tzinfo=timezone.utc).timestamp()
+
+
+class TestTTLPolicies:
+    """Test TTL policy computation."""
+
+    def test_fixed_ttl(self):
+        assert FixedTTL(300).ttl() == 300
+
+    def test_daily_rollover_before_rollover(self):
+        """Fetched at 00:30 UTC, expires at 01:00 UTC the same day."""
+        assert DailyRolloverTTL(hour=1).ttl(utc_timestamp(0, 30)) == 30 * 60
+
+    def test_daily_rollover_after_rollover(self):
+        """Fetched at 13:00 UTC, expires at 01:00 UTC the next day."""
+        assert DailyRolloverTTL(hour=1).ttl(utc_timestamp(13)) == 12 * 3600
+
+    def test_daily_rollover_at_rollover(self):
+        """Fetched exactly at the rollover, cached for a full day."""
+        assert DailyRolloverTTL(hour=1).ttl(utc_timestamp(1)) == 24 * 3600
+
+    def test_jitter_only_extends_ttl(self):
+        policy = FixedTTL(100, jitter=10)
+        ttls = [policy.ttl() for _ in range(200)]
+        assert all(100 <= ttl <= 110 for ttl in ttls)
+        assert len(set(ttls)) > 1
+
+    def test_policies_compare_by_value(self):
+        assert DailyRolloverTTL(jitter=5) == DailyRolloverTTL(jitter=5)
+        assert FixedTTL(5) != FixedTTL(6)
+
+    def test_policy_without_base_ttl_cannot_be_instantiated(self):
+        class Incomplete(TTLPolicy):
+            pass
+
+        with pytest.raises(TypeError):
+            Incomplete()
+
+    def test_custom_policy(self):
+        class Hourly(TTLPolicy):
+            def base_ttl(self, now):
+                return 3600 - now % 3600
+
+        assert Hourly().ttl(utc_timestamp(13, 45)) == 15 * 60
+
+
+class TestResolveTTLPolicies:
+    """Test merging per-endpoint policies with cache_ttl."""
+
+    def test_cache_ttl_applies_to_unlisted_endpoints(self):
+        policies = resolve_ttl_policies(600, {"recent": DailyRolloverTTL()})
+        assert policies["recent"] == DailyRolloverTTL()
+        assert policies["package_info"] == FixedTTL(600)
+        assert policies["system"] == FixedTTL(600)
+
+    def test_seconds_become_fixed_ttl(self):
+        assert resolve_ttl_policies(600, {"overall": 60})["overall"] == FixedTTL(60)
+
+    def test_unknown_endpoint(self):
+        with pytest.raises(ValueError, match="Unknown endpoint"):
+            resolve_ttl_policies(600, {"downloads": 60})
+
+    def test_defaults_only_without_explicit_ttl(self):
+        assert _effective_ttl_policies(None, None) is DEFAULT_TTL_POLICIES
+        assert _effective_ttl_policies(300, None) is None
+        assert _effective_ttl_policies(None, {"recent": 60}) == {"recent": 60}
+
+
+class TestClientTTLPolicies:
+    """Test the client stores entries with the endpoint's TTL."""
+
+    @responses.activate
+    def test_endpoint_ttl_passed_to_cache(self):
+        client = PyPIClient(cache_ttl=3600, ttl_policies={"recent": 120})
+        responses.add(responses.GET, STATS_API.format(pkg="test") + "recent", json={"data": {}}, status=200)
+        responses.add(responses.GET, PYPI_API.format(pkg="test"), json={"info": {}}, status=200)
+
+        client.get_recent_stats("test")
+        client.get_package_info("test")
+
+        recent = cache_get_entry(f"url:{STATS_API.format(pkg='test')}recent")
+        package = cache_get_entry(f"url:{PYPI_API.format(pkg='test')}")
+        assert recent.expires_at - time.time() == pytest.approx(120, abs=5)
+        assert package.expires_at - time.time() == pytest.approx(3600, abs=5)